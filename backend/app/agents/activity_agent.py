@@ -3,8 +3,9 @@
 from google.adk import Agent
 from google.adk.tools import FunctionTool
 from app.agents.tools import get_day_activity
-from app.agents.adk_utils import get_model, run_adk_agent
-import json
+from app.agents.adk_utils import get_model, run_adk_agent, stream_adk_agent
+from app.agents.encoding import encode_workouts
+from typing import AsyncIterator
 
 # Define the Tool
 activity_tool = FunctionTool(func=get_day_activity)
@@ -22,10 +23,12 @@ def get_activity_agent():
         """
     )
 
-async def review_activity(user_id: str, date: str) -> str:
+NO_WORKOUTS_MESSAGE = "You didn't log any workouts today. Rest day? If not, get moving!"
+
+async def _build_activity_review(user_id: str, date: str):
     """
-    Agent: Activity Reviewer
-    Objective: Review the user's activity for the day and provide feedback.
+    Fetches the day's workouts and builds the summarizer agent + prompt.
+    Returns None when there is nothing to review.
     """
     
     # We can rely on the Agent to call the tool, or fetch data manually and pass to prompt.
@@ -41,14 +44,15 @@ async def review_activity(user_id: str, date: str) -> str:
     workouts = await get_day_activity(user_id, date)
     
     if not workouts:
-        return "You didn't log any workouts today. Rest day? If not, get moving!"
+        return None
         
     instruction = "You are an enthusiastic Fitness Coach. Review workout data and provide a brief, encouraging, but critical summary of the performance. Highlight PRs or good volume if visible. If cardio was done, mention it. Keep it under 3 sentences."
     
     prompt = f"""
-    Review the following workout data for today ({date}):
+    Review the following workout data for today ({date}).
+    Sets are written as count x reps @ weight (kg).
     
-    {json.dumps(workouts, indent=2)}
+    {encode_workouts(workouts)}
     """
     
     # We use a simple agent instance for this generation
@@ -58,5 +62,25 @@ async def review_activity(user_id: str, date: str) -> str:
         instruction=instruction,
         description="Agent that summarizes daily workout activities."
     )
+    return agent, prompt
+
+async def review_activity(user_id: str, date: str) -> str:
+    """
+    Agent: Activity Reviewer
+    Objective: Review the user's activity for the day and provide feedback.
+    """
+    review = await _build_activity_review(user_id, date)
+    if review is None:
+        return NO_WORKOUTS_MESSAGE
+    agent, prompt = review
     return await run_adk_agent(agent, prompt, user_id)
 
+async def stream_activity_review(user_id: str, date: str) -> AsyncIterator[str]:
+    """Streaming variant of review_activity: yields the review text as it is generated."""
+    review = await _build_activity_review(user_id, date)
+    if review is None:
+        yield NO_WORKOUTS_MESSAGE
+        return
+    agent, prompt = review
+    async for chunk in stream_adk_agent(agent, prompt, user_id):
+        yield chunk
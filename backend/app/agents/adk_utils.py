@@ -3,15 +3,24 @@ import sys
 import os
 import logging
 import uuid
+import asyncio
+from contextlib import aclosing
+from typing import AsyncIterator
 from google.adk import Agent
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.models import Gemini
 from google.adk.tools import FunctionTool
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
+from app.core.metrics import timed
 
 logger = logging.getLogger(__name__)
 
+# Global cap on in-flight model calls (HTTP requests, background jobs and batch runs alike)
+MAX_CONCURRENT_MODEL_CALLS = int(os.getenv("MAX_CONCURRENT_MODEL_CALLS", "4"))
+model_slots = asyncio.Semaphore(MAX_CONCURRENT_MODEL_CALLS)
+
 # Initialize Model
 # We reuse the same model instance typically
 _model = "gemini-2.5-flash-lite"
@@ -64,17 +73,19 @@ async def run_adk_agent(agent: Agent, prompt: str, user_id: str = "default_user"
     response_text = ""
     
     try:
-        # Run the agent using simpler string message
-        for event in runner.run(
-            session_id=session_id,
-            new_message=message,
-            user_id=user_id
-        ):
-            # Inspect event structure based on ADK patterns
-            if event.content and event.content.parts:
-                for part in event.content.parts:
-                    if part.text:
-                        response_text += part.text
+        # Run the agent asynchronously so a slow generation doesn't block the event loop
+        async with model_slots:
+            with timed("model"):
+                async for event in runner.run_async(
+                    session_id=session_id,
+                    new_message=message,
+                    user_id=user_id
+                ):
+                    # Inspect event structure based on ADK patterns
+                    if event.content and event.content.parts:
+                        for part in event.content.parts:
+                            if part.text:
+                                response_text += part.text
         
         print(response_text)
         
@@ -85,6 +96,44 @@ async def run_adk_agent(agent: Agent, prompt: str, user_id: str = "default_user"
     logger.info(f"ADK Agent Raw Response: {response_text[:500]}..." if len(response_text) > 500 else f"ADK Agent Raw Response: {response_text}")
     return response_text.strip()
 
+async def stream_adk_agent(agent: Agent, prompt: str, user_id: str = "default_user") -> AsyncIterator[str]:
+    """
+    Runs an ADK Agent in SSE streaming mode and yields text chunks as the model produces them.
+    If the consumer stops iterating (e.g. the HTTP client disconnected), the underlying
+    ADK run is closed, which cancels the in-flight model request.
+    """
+    session_id = str(uuid.uuid4())
+    message = types.Content(
+        role="user",
+        parts=[types.Part(text=prompt)]
+    )
+
+    runner, session = await create_session(agent, user_id, session_id)
+    run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+
+    # In SSE mode ADK emits partial events followed by one aggregated final event that
+    # repeats the whole text; only forward the final event if nothing was streamed.
+    streamed = False
+    async with model_slots:
+        with timed("model"):
+            events = runner.run_async(
+                user_id=user_id,
+                session_id=session_id,
+                new_message=message,
+                run_config=run_config
+            )
+            async with aclosing(events):
+                async for event in events:
+                    if not (event.content and event.content.parts):
+                        continue
+                    if not event.partial and streamed:
+                        continue
+                    for part in event.content.parts:
+                        if part.text:
+                            if event.partial:
+                                streamed = True
+                            yield part.text
+
 def clean_json_response(response_text: str) -> str:
     """
     Cleans markdown formatting from JSON response.
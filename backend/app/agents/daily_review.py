@@ -0,0 +1,39 @@
+from typing import Dict, Iterable
+from app.agents.activity_agent import review_activity
+from app.agents.diet_agent import review_diet, REVIEW_UNAVAILABLE_MESSAGE
+from app.services.review_service import ReviewService, SECTIONS
+
+_REVIEWERS = {
+    "activity": review_activity,
+    "diet": review_diet,
+}
+
+def _is_cacheable(review: str) -> bool:
+    # Don't pin failures in the cache; the next request or batch run retries them.
+    return bool(review) and not review.startswith("Error running agent") and review != REVIEW_UNAVAILABLE_MESSAGE
+
+async def generate_section_review(user_id: str, date: str, section: str, source_marker: str) -> str:
+    """Runs one section's reviewer and stores the result against the data marker it was built from."""
+    review = await _REVIEWERS[section](user_id, date)
+    if source_marker and _is_cacheable(review):
+        await ReviewService.save_review(user_id, date, section, review, source_marker)
+    return review
+
+async def get_day_review(user_id: str, date: str, sections: Iterable[str] = SECTIONS) -> Dict[str, str]:
+    """
+    Returns the day's reviews, served from the daily_reviews cache when it is still
+    current for the logged data and generated (then cached) otherwise.
+    """
+    sections = [s for s in SECTIONS if s in sections]
+    markers = await ReviewService.get_source_markers(user_id, date)
+    cached = await ReviewService.get_reviews(user_id, date)
+
+    results = {}
+    for section in sections:
+        marker = markers.get(section)
+        entry = cached.get(section)
+        if marker and entry and entry["source_marker"] == marker:
+            results[section] = entry["review"]
+        else:
+            results[section] = await generate_section_review(user_id, date, section, marker)
+    return results
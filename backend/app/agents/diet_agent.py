@@ -1,48 +1,79 @@
 
 from google.adk import Agent
 from google.genai import types
-from app.agents.tools import get_day_diet, get_db_food_item
-from app.agents.adk_utils import get_model, run_adk_agent, clean_json_response
-import json
+from pydantic import BaseModel, ValidationError
+from app.agents.tools import get_day_diet, get_db_food_item, get_db_food_items
+from app.agents.adk_utils import get_model, run_adk_agent, stream_adk_agent, clean_json_response
+from app.agents.encoding import encode_meals
+from app.core.cache import TTLCache
+from fractions import Fraction
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import os
+import re
 
-async def review_diet(user_id: str, date: str) -> str:
+# Macros per serving retrieved by the model, keyed by normalized food name
+FOOD_CACHE_SIZE = int(os.getenv("FOOD_CACHE_SIZE", "5000"))
+FOOD_CACHE_TTL_SECONDS = float(os.getenv("FOOD_CACHE_TTL_SECONDS", "86400"))
+# Items accepted by one /agents/food/parse call
+FOOD_PARSE_MAX_ITEMS = int(os.getenv("FOOD_PARSE_MAX_ITEMS", "20"))
+
+NO_MEALS_MESSAGE = "No meals logged today. Don't forget to track!"
+REVIEW_UNAVAILABLE_MESSAGE = "Good logging today! (AI Review unavailable)"
+
+async def _build_diet_review(user_id: str, date: str):
     """
-    Agent: Calorie Reviewer
-    Objective: Review caloric intake vs goal.
+    Fetches the day's meals and builds the reviewer agent + prompt.
+    Returns None when there is nothing to review.
     """
     
     # 1. Fetch Data
     meals = await get_day_diet(user_id, date)
     
     if not meals:
-        return "No meals logged today. Don't forget to track!"
+        return None
         
-    # Calculate totals
-    total_cals = sum(m['total_calories'] for m in meals)
-    total_protein = sum(m['total_protein'] for m in meals)
-    
     instruction = "You are a Nutritionist. Provide specific feedback on food choices and macro balance. Keep it concise."
     
     prompt = f"""
     Review the user's diet for today ({date}).
-    
-    Total Calories: {total_cals}
-    Total Protein: {total_protein}g
+    Macros are P/C/F in grams.
     
     Meals:
-    {json.dumps(meals, indent=2)}
+    {encode_meals(meals)}
     """
     
+    agent = Agent(
+        name="diet_reviewer", 
+        model=get_model(),
+        instruction=instruction,
+        description="Agent that reviews daily caloric intake vs goal."
+    )
+    return agent, prompt
+
+async def review_diet(user_id: str, date: str) -> str:
+    """
+    Agent: Calorie Reviewer
+    Objective: Review caloric intake vs goal.
+    """
+    review = await _build_diet_review(user_id, date)
+    if review is None:
+        return NO_MEALS_MESSAGE
+        
     try:
-        agent = Agent(
-            name="diet_reviewer", 
-            model=get_model(),
-            instruction=instruction,
-            description="Agent that reviews daily caloric intake vs goal."
-        )
+        agent, prompt = review
         return await run_adk_agent(agent, prompt, user_id)
     except Exception as e:
-        return "Good logging today! (AI Review unavailable)"
+        return REVIEW_UNAVAILABLE_MESSAGE
+
+async def stream_diet_review(user_id: str, date: str) -> AsyncIterator[str]:
+    """Streaming variant of review_diet: yields the review text as it is generated."""
+    review = await _build_diet_review(user_id, date)
+    if review is None:
+        yield NO_MEALS_MESSAGE
+        return
+    agent, prompt = review
+    async for chunk in stream_adk_agent(agent, prompt, user_id):
+        yield chunk
 
 async def search_and_retrieve_food(query: str) -> dict:
     """
@@ -59,6 +90,10 @@ async def search_and_retrieve_food(query: str) -> dict:
         db_item["source"] = "database"
         return db_item
         
+    cached = food_cache.get(_normalize(query))
+    if cached:
+        return {**cached, "source": "cache"}
+
     # 2. AI Retrieval (Fallback)
     # We ask Gemini to estimate/retrieve the macros effectively acting as the search.
     
@@ -82,9 +117,197 @@ async def search_and_retrieve_food(query: str) -> dict:
         
         response_text = await run_adk_agent(agent, prompt)
         
-        # Parse JSON
-        data = json.loads(clean_json_response(response_text))
-        data["source"] = "ai_retrieval"
-        return data # We do not save automatically here, UI should confirm first.
+        # Parse JSON; only validated macros go into the cache parse_food_text reads from
+        data = FoodMacros.model_validate_json(clean_json_response(response_text)).model_dump()
+        food_cache.set(_normalize(query), data)
+        return {**data, "source": "ai_retrieval"} # We do not save automatically here, UI should confirm first.
     except Exception as e:
         return {"error": "Could not retrieve food info", "details": str(e)}
+
+# --- Free-text meal parsing ---------------------------------------------------
+# "2 eggs, toast with butter, black coffee" -> one bulk DB query for all items,
+# the food cache, then a single structured-output model call for what is left.
+
+_SEPARATORS = re.compile(r"[,;\n+&]")
+# "and"/"with" only separate items when both sides have a quantity: "2 eggs and 1 toast"
+# is two items, "mac and cheese" and "toast with butter" are one
+_CONJUNCTIONS = re.compile(r"\s+(and|with)\s+", re.IGNORECASE)
+_QUANTITY = re.compile(r"^(?P<q>\d+(?:\.\d+)?|\d+/\d+|a|an|one|two|three|four|half)(?:\s*x)?\s+(?P<name>.+)$", re.IGNORECASE)
+_WORD_QUANTITIES = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "half": 0.5}
+
+class FoodMacros(BaseModel):
+    """Macros for 1 serving; the shape of every food_cache entry."""
+    name: str
+    calories: int
+    protein: float
+    carbs: float
+    fats: float
+
+class FoodEstimate(FoodMacros):
+    query: str
+
+class FoodEstimates(BaseModel):
+    items: List[FoodEstimate]
+
+def _normalize(name: str) -> str:
+    return " ".join(name.lower().split())
+
+def _db_pattern(name: str) -> str:
+    """ilike pattern for a food name: letters/digits only, last word singularized (eggs -> egg)."""
+    pattern = re.sub(r"[^a-z0-9 ]", "", _normalize(name)).strip()
+    if len(pattern) > 3 and pattern.endswith("s") and not pattern.endswith("ss"):
+        pattern = pattern[:-1]
+    return pattern
+
+def _quantity(q: str) -> Optional[float]:
+    """"2", "1.5", "1/2", "two" -> a number; None for a malformed quantity like "1/0"."""
+    q = q.lower()
+    if q in _WORD_QUANTITIES:
+        return float(_WORD_QUANTITIES[q])
+    try:
+        return float(Fraction(q))
+    except ZeroDivisionError:
+        return None
+
+def _has_quantity(part: str) -> bool:
+    match = _QUANTITY.match(part)
+    return bool(match) and _quantity(match["q"]) is not None
+
+def _split_conjunctions(part: str) -> List[str]:
+    pieces = _CONJUNCTIONS.split(part)
+    parts = [pieces[0]]
+    for conjunction, piece in zip(pieces[1::2], pieces[2::2]):
+        if _has_quantity(parts[-1]) and _has_quantity(piece):
+            parts.append(piece)
+        else:
+            parts[-1] = f"{parts[-1]} {conjunction} {piece}"
+    return parts
+
+def split_food_text(text: str) -> List[Tuple[str, float]]:
+    """Splits free text into (food, quantity) pairs: "2 eggs and 1 toast" -> [("eggs", 2), ("toast", 1)]."""
+    items = []
+    for part in (p for chunk in _SEPARATORS.split(text) for p in _split_conjunctions(chunk.strip())):
+        part = " ".join(part.split()).strip(" .")
+        if not part:
+            continue
+        match = _QUANTITY.match(part)
+        quantity = _quantity(match["q"]) if match else None
+        if quantity is None:
+            # No quantity, or an invalid one ("1/0") that is left in the text like any other word
+            quantity = 1.0
+        else:
+            part = match["name"]
+        items.append((part, quantity))
+    return items
+
+def _per_serving(row: dict) -> dict:
+    servings = float(row.get("quantity") or 1) or 1.0
+    return {
+        "name": row["name"],
+        "calories": float(row["calories"]) / servings,
+        "protein": float(row["protein"]) / servings,
+        "carbs": float(row["carbs"]) / servings,
+        "fats": float(row["fats"]) / servings,
+    }
+
+def _match_db_rows(queries: List[str], rows: List[dict]) -> Dict[str, dict]:
+    """Best stored row per query: an exact name match, else the newest row containing the pattern."""
+    matches = {}
+    for query in queries:
+        pattern = _db_pattern(query)
+        if not pattern:
+            continue
+        candidates = [r for r in rows if pattern in _normalize(r["name"])]
+        exact = [r for r in candidates if _normalize(r["name"]) in (_normalize(query), pattern)]
+        if exact or candidates:
+            matches[query] = _per_serving((exact or candidates)[0])
+    return matches
+
+async def _estimate_foods(queries: List[str]) -> Dict[str, dict]:
+    """One structured-output model call for every food the DB and cache don't know."""
+    agent = Agent(
+        name="diet_batch_retriever",
+        model=get_model(),
+        instruction="""
+        You are a Nutrition Assistant.
+        For every food in the list return the nutritional info for 1 serving of it.
+        Copy each food into `query` exactly as written and keep the order of the list.
+        """,
+        description="Find macros for several food items at once and return JSON.",
+        output_schema=FoodEstimates,
+        disallow_transfer_to_parent=True,
+        disallow_transfer_to_peers=True
+    )
+    prompt = "Foods:\n" + "\n".join(f"- {q}" for q in queries)
+
+    response_text = await run_adk_agent(agent, prompt)
+    try:
+        estimates = FoodEstimates.model_validate_json(clean_json_response(response_text)).items
+    except ValidationError:
+        return {}
+
+    by_query = {_normalize(e.query): e for e in estimates}
+    results = {}
+    for i, query in enumerate(queries):
+        estimate = by_query.get(_normalize(query))
+        if estimate is None and len(estimates) == len(queries):
+            estimate = estimates[i]
+        if estimate is not None:
+            results[query] = estimate.model_dump(exclude={"query"})
+    return results
+
+async def parse_food_text(text: str) -> dict:
+    """
+    Agent: Meal Parser
+    Objective: Turn a free-text meal into food items with macros, using at most one DB
+    query and one model call however many items the text lists.
+    """
+    parsed = split_food_text(text)[:FOOD_PARSE_MAX_ITEMS]
+    queries = list(dict.fromkeys(q for q, _ in parsed))
+
+    # 1. Bulk DB lookup
+    patterns = list(dict.fromkeys(p for p in map(_db_pattern, queries) if p))
+    resolved = {q: {**m, "source": "database"} for q, m in _match_db_rows(queries, await get_db_food_items(patterns)).items()}
+
+    # 2. Food cache
+    for query in queries:
+        if query not in resolved:
+            cached = food_cache.get(_normalize(query))
+            if cached:
+                resolved[query] = {**cached, "source": "cache"}
+
+    # 3. One batched model call for the misses
+    misses = [q for q in queries if q not in resolved]
+    if misses:
+        for query, estimate in (await _estimate_foods(misses)).items():
+            food_cache.set(_normalize(query), estimate)
+            resolved[query] = {**estimate, "source": "ai_retrieval"}
+
+    items, unresolved = [], []
+    for query, quantity in parsed:
+        food = resolved.get(query)
+        if food is None:
+            unresolved.append(query)
+            continue
+        items.append({
+            "query": query,
+            "name": food["name"],
+            "quantity": quantity,
+            "calories": round(food["calories"] * quantity),
+            "protein": round(food["protein"] * quantity, 1),
+            "carbs": round(food["carbs"] * quantity, 1),
+            "fats": round(food["fats"] * quantity, 1),
+            "source": food["source"],
+        })
+    return {
+        "items": items,
+        "unresolved": unresolved,
+        "calories": sum(i["calories"] for i in items),
+        "protein": round(sum(i["protein"] for i in items), 1),
+        "carbs": round(sum(i["carbs"] for i in items), 1),
+        "fats": round(sum(i["fats"] for i in items), 1),
+    }
+
+
+# Global Instance
+food_cache = TTLCache(maxsize=FOOD_CACHE_SIZE, ttl=FOOD_CACHE_TTL_SECONDS)
@@ -0,0 +1,121 @@
+from typing import List
+from app.schemas.workout import is_cardio_set
+
+# Compact, prompt-oriented text encodings of a day's data.
+# The agents used to send json.dumps(rows, indent=2) of raw PostgREST rows: UUIDs,
+# timestamps, join ids, null cardio fields and indentation made up most of the input
+# tokens. These encoders keep only what the model needs to review the day.
+
+def _num(value) -> str:
+    """Formats a number without trailing zeros (22.50 -> 22.5, 10.0 -> 10)."""
+    if value is None:
+        return "0"
+    value = float(value)
+    return str(int(value)) if value.is_integer() else f"{value:.2f}".rstrip("0").rstrip(".")
+
+def _cardio_set(s: dict) -> str:
+    parts = []
+    if s.get("time_seconds"):
+        parts.append(f"{_num(s['time_seconds'] / 60)}min")
+    if s.get("speed"):
+        parts.append(f"{_num(s['speed'])}km/h")
+    if s.get("incline"):
+        parts.append(f"incl {_num(s['incline'])}")
+    if s.get("steps"):
+        parts.append(f"{s['steps']} steps")
+    if s.get("calories_burnt"):
+        parts.append(f"{_num(s['calories_burnt'])}kcal")
+    return " ".join(parts) or "logged"
+
+def _strength_sets(sets: List[dict]) -> str:
+    """Run-length encodes identical consecutive sets: 3x10@50, 1x8@55."""
+    groups = []
+    for s in sets:
+        key = (s.get("reps") or 0, _num(s.get("weight")))
+        if groups and groups[-1][0] == key:
+            groups[-1][1] += 1
+        else:
+            groups.append([key, 1])
+    return ", ".join(f"{count}x{reps}@{weight}" for (reps, weight), count in groups)
+
+def encode_workouts(workouts: List[dict]) -> str:
+    """
+    Encodes workouts as returned by `get_day_activity` (workout_exercises -> exercises, sets):
+
+        Push (45min)
+        - Incline DB Press [Chest]: 3x10@22.5, 1x8@25
+        - Treadmill [Cardio]: 20min 5.5km/h incl 2 1800 steps 150kcal
+        Totals: 4 sets, volume 875kg, cardio 20min 150kcal
+    """
+    lines = []
+    total_sets = 0
+    total_volume = 0.0
+    cardio_seconds = 0
+    cardio_kcal = 0.0
+
+    for workout in workouts:
+        header = workout.get("name") or "Workout"
+        if workout.get("duration_minutes"):
+            header += f" ({workout['duration_minutes']}min)"
+        lines.append(header)
+        if workout.get("notes"):
+            lines.append(f"Notes: {workout['notes']}")
+
+        for we in workout.get("workout_exercises") or []:
+            exercise = we.get("exercises") or {}
+            name = exercise.get("name", "Unknown")
+            muscle_group = exercise.get("muscle_group")
+            sets = sorted(we.get("sets") or [], key=lambda s: s.get("set_order") or 0)
+            total_sets += len(sets)
+
+            cardio = [s for s in sets if is_cardio_set(muscle_group, s.get("reps"), s.get("time_seconds"))]
+            strength = [s for s in sets if not is_cardio_set(muscle_group, s.get("reps"), s.get("time_seconds"))]
+            described = []
+            if strength:
+                described.append(_strength_sets(strength))
+                total_volume += sum((s.get("reps") or 0) * float(s.get("weight") or 0) for s in strength)
+            for s in cardio:
+                described.append(_cardio_set(s))
+                cardio_seconds += s.get("time_seconds") or 0
+                cardio_kcal += float(s.get("calories_burnt") or 0)
+
+            label = f"{name} [{muscle_group}]" if muscle_group else name
+            lines.append(f"- {label}: {'; '.join(described) or 'no sets'}")
+
+    totals = f"Totals: {total_sets} sets, volume {_num(total_volume)}kg"
+    if cardio_seconds or cardio_kcal:
+        totals += f", cardio {_num(cardio_seconds / 60)}min {_num(cardio_kcal)}kcal"
+    lines.append(totals)
+    return "\n".join(lines)
+
+def _macros(calories, protein, carbs, fats) -> str:
+    return f"{_num(calories)}kcal P{_num(protein)} C{_num(carbs)} F{_num(fats)}"
+
+def encode_meals(meals: List[dict]) -> str:
+    """
+    Encodes meals as returned by `get_day_diet` (items aliased from food_items):
+
+        Breakfast "Oats bowl": 450kcal P30 C60 F10
+          Oats x1: 300kcal P10 C50 F5
+        Total: 450kcal P30 C60 F10
+    """
+    lines = []
+    totals = [0.0, 0.0, 0.0, 0.0]
+
+    for meal in meals:
+        macros = (meal.get("total_calories"), meal.get("total_protein"), meal.get("total_carbs"), meal.get("total_fats"))
+        for i, value in enumerate(macros):
+            totals[i] += float(value or 0)
+
+        label = meal.get("type") or "Meal"
+        if meal.get("name") and meal["name"] != label:
+            label += f' "{meal["name"]}"'
+        lines.append(f"{label}: {_macros(*macros)}")
+
+        for item in meal.get("items") or meal.get("food_items") or []:
+            quantity = item.get("quantity")
+            qty = f" x{_num(quantity)}" if quantity not in (None, 1) else ""
+            lines.append(f"  {item.get('name')}{qty}: {_macros(item.get('calories'), item.get('protein'), item.get('carbs'), item.get('fats'))}")
+
+    lines.append(f"Total: {_macros(*totals)}")
+    return "\n".join(lines)
@@ -1,10 +1,25 @@
-
 from app.schemas.goal import GoalCreate
 from google.adk import Agent
-from google.genai import types
-from app.agents.adk_utils import get_model, run_adk_agent, clean_json_response
-import json
+from app.agents.adk_utils import get_model, run_adk_agent, stream_adk_agent
+from app.core.metabolism import compute_energy_plan
+from collections import OrderedDict
+from typing import AsyncIterator, Dict
 from datetime import datetime
+import asyncio
+import hashlib
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# How long /goals/analyze waits for the model's prose before answering with the numbers alone.
+GOAL_PROSE_TIMEOUT = float(os.getenv("GOAL_PROSE_TIMEOUT", "8"))
+ANALYSIS_CACHE_SIZE = 512
+
+# goal hash -> generated markdown. Same input (on the same day) -> same advice.
+_analysis_cache: "OrderedDict[str, str]" = OrderedDict()
+# goal hash -> in-flight prose generation, so concurrent/retried requests share one model call
+_pending: Dict[str, asyncio.Task] = {}
 
 def _calculate_timeline(target_datetime):
     current_date = datetime.now().date()
@@ -15,33 +30,43 @@ def _calculate_timeline(target_datetime):
         days_remaining = (target_datetime.date() - current_date).days
     return current_date, target_date_str, days_remaining
 
-async def analyze_goal(goal: GoalCreate) -> dict:
-    """
-    Uses Gemini (via ADK Agent) to analyze the user's stats and goal.
-    Returns a dictionary with advised deficits and analysis.
-    """
+def goal_cache_key(goal: GoalCreate) -> str:
+    # Include the day: days remaining (and thus the plan) change daily.
+    payload = f"{datetime.now().date().isoformat()}|{goal.model_dump_json()}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def _cache_analysis(key: str, analysis: str):
+    _analysis_cache[key] = analysis
+    _analysis_cache.move_to_end(key)
+    while len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+        _analysis_cache.popitem(last=False)
+
+def _build_goal_analysis(goal: GoalCreate, plan: dict):
+    """Builds the goal coach agent and a prompt with the user's stats and the pre-computed plan."""
     current_date, target_date_str, days_remaining = _calculate_timeline(goal.target_date)
-    
+
     # 1. Construct Prompt
     instruction = """
-    You are 'TheCutRoute' AI Coach, an elite level fitness and nutrition strategist. 
+    You are 'TheCutRoute' AI Coach, an elite level fitness and nutrition strategist.
     Your goal is to provide a highly professional, encouraging, and science-based analysis of the user's stats and goals.
-    
+    The metabolic numbers are already calculated for you; use them as given and do not recalculate them.
+
     ### FORMATTING RULES:
-    - Use Markdown for the "analysis" field.
+    - Respond with Markdown only (no JSON, no code fences).
     - Use H3 (###) for section headers.
     - Use Bullet points for readability.
     - **Bold** key metrics.
     - DO NOT include a title like "Fitness Plan Analysis" at the top; start directly with the analysis.
     - Keep the tone elite, direct, and motivating.
-    
-    Return the response in JSON format with strictly these keys:
-    - "daily_caloric_deficit": (int) recommended deficit
-    - "daily_calories": (int) recommended total daily intake
-    - "analysis": (string) The formatted markdown content.
-    Return ONLY valid JSON.
     """
 
+    capped_note = ""
+    if plan["capped"]:
+        capped_note = (
+            f"- NOTE: reaching the goal by the target date would need a {plan['required_daily_deficit']} kcal/day deficit, "
+            f"which is unsafe. The plan is capped; at this pace the goal is reached around {plan['projected_date']}."
+        )
+
     prompt = f"""
     ### USER PROFILE:
     - Height: {goal.current_height} cm
@@ -50,38 +75,124 @@ async def analyze_goal(goal: GoalCreate) -> dict:
     - Body Fat: {goal.current_body_fat}%
     - Gender: {goal.gender}
     - Lifestyle: {goal.lifestyle}
-    
+
     ### TARGETS:
     - Goal Weight: {goal.goal_weight} kg
     - Goal Body Fat: {goal.goal_body_fat}%
     - Current Date: {current_date}
     - Target Date: {target_date_str}
     - Days Remaining: {days_remaining}
-    
+
+    ### CALCULATED PLAN:
+    - BMR ({plan['bmr_formula']}): {plan['bmr']} kcal
+    - TDEE (x{plan['activity_multiplier']}): {plan['tdee']} kcal
+    - Daily Caloric Deficit: {plan['daily_caloric_deficit']} kcal
+    - Daily Calories: {plan['daily_calories']} kcal
+    - Expected Weekly Change: {plan['weekly_change_kg']} kg
+    {capped_note}
+
     ### YOUR TASK:
-    1. **Metabolic Analysis**: Calculate BMR and TDEE (Sedentary baseline).
-    2. **Strategic Plan**: Determine a sustainable caloric deficit to reach the goal by {target_date_str}.
+    1. **Metabolic Analysis**: Explain what the BMR/TDEE numbers above mean for this user.
+    2. **Strategic Plan**: Explain how to sustain the calculated deficit until {target_date_str}.
     3. **Professional Advice**: Provide specific advice on protein intake, training focus, and mindset.
     """
-    
+
+    agent = Agent(
+        name="goal_analyzer",
+        model=get_model(),
+        instruction=instruction,
+        description="Agent that writes coaching advice for a pre-computed fitness plan."
+    )
+    return agent, prompt
+
+def _result(plan: dict, analysis: str, status: str) -> dict:
+    return {
+        "daily_caloric_deficit": plan["daily_caloric_deficit"],
+        "daily_calories": plan["daily_calories"],
+        "analysis": analysis,
+        "analysis_status": status,
+        "metrics": plan,
+    }
+
+def fallback_analysis(plan: dict, reason: str) -> str:
+    if plan["tdee"] is None:
+        return f"{reason} Add your height, weight and age to get a calculated plan."
+    return (
+        f"{reason} Your calculated plan: **{plan['daily_calories']} kcal/day** "
+        f"({plan['daily_caloric_deficit']} kcal below your TDEE of {plan['tdee']} kcal)."
+    )
+
+async def _generate_prose(key: str, goal: GoalCreate, plan: dict) -> str:
+    agent, prompt = _build_goal_analysis(goal, plan)
+    analysis = await run_adk_agent(agent, prompt)
+    if analysis.startswith("Error running agent"):
+        raise RuntimeError(analysis)
+    _cache_analysis(key, analysis)
+    return analysis
+
+def _prose_done(key: str, task: asyncio.Task):
+    _pending.pop(key, None)
+    # A generation that outlived its request has nobody awaiting it, so its failure is consumed (and logged) here
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Goal analysis failed: {task.exception()}")
+
+def _start_prose(key: str, goal: GoalCreate, plan: dict) -> asyncio.Task:
+    """The in-flight generation for this goal, started if there is none."""
+    task = _pending.get(key)
+    if task is None:
+        task = asyncio.create_task(_generate_prose(key, goal, plan))
+        _pending[key] = task
+        task.add_done_callback(lambda t: _prose_done(key, t))
+    return task
+
+async def analyze_goal(goal: GoalCreate) -> dict:
+    """
+    Computes the energy plan locally and asks Gemini (via ADK Agent) only for the coaching prose.
+    The numbers are always returned; the prose comes from the cache, the model (if it answers
+    within GOAL_PROSE_TIMEOUT), or a short fallback while generation continues in the background.
+    """
+    plan = compute_energy_plan(goal)
+    key = goal_cache_key(goal)
+
+    if key in _analysis_cache:
+        _analysis_cache.move_to_end(key)
+        return _result(plan, _analysis_cache[key], "cached")
+
+    task = _start_prose(key, goal, plan)
     try:
-        # Configure ADK Agent with JSON instruction
-        agent = Agent(
-            name="goal_analyzer",
-            model=get_model(),
-            instruction=instruction,
-            description="Agent that analyzes user health targets to produce a customized fitness plan."
-        )
-        
-        response_text = await run_adk_agent(agent, prompt)
-        
-        result = json.loads(clean_json_response(response_text))
-        return result
-        
-    except Exception as e:
-        # Fallback or Error
-        return {
-            "daily_caloric_deficit": 500,
-            "daily_calories": 2000,
-            "analysis": f"AI Analysis failed: {str(e)}. Defaulting to standard 500kcal deficit." 
-        }
+        # shield: a timeout here must not cancel the generation; it fills the cache for the retry
+        analysis = await asyncio.wait_for(asyncio.shield(task), timeout=GOAL_PROSE_TIMEOUT)
+        return _result(plan, analysis, "generated")
+    except asyncio.TimeoutError:
+        return _result(plan, fallback_analysis(plan, "The AI coach is still writing your analysis; check back in a moment."), "pending")
+    except Exception:
+        # Already logged by _prose_done
+        return _result(plan, fallback_analysis(plan, "AI analysis is unavailable right now."), "failed")
+
+async def stream_goal_analysis(goal: GoalCreate) -> AsyncIterator[dict]:
+    """
+    Streaming variant of analyze_goal. Yields {"plan": ...} with the numbers first,
+    then {"text": ...} chunks of the coaching prose (from cache or the model).
+    """
+    plan = compute_energy_plan(goal)
+    yield {"plan": plan}
+
+    key = goal_cache_key(goal)
+    if key in _analysis_cache:
+        yield {"text": _analysis_cache[key]}
+        return
+
+    # /goals/analyze already started the generation: wait for it instead of a second model call
+    task = _pending.get(key)
+    if task is not None:
+        yield {"text": await asyncio.shield(task)}
+        return
+
+    agent, prompt = _build_goal_analysis(goal, plan)
+    analysis = ""
+    async for chunk in stream_adk_agent(agent, prompt):
+        analysis += chunk
+        yield {"text": chunk}
+    # An empty stream (e.g. the model returned nothing) must not be served from the cache
+    if analysis.strip():
+        _cache_analysis(key, analysis.strip())
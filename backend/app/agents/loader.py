@@ -0,0 +1,49 @@
+import asyncio
+import importlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Importing any of these pulls in google.adk + google.genai (several seconds of
+# import time), so routers only load them on first use of an agent route.
+AGENT_MODULES = (
+    "app.agents.adk_utils",
+    "app.agents.activity_agent",
+    "app.agents.diet_agent",
+    "app.agents.goal_agent",
+    "app.agents.daily_review",
+    "app.agents.period_review",
+)
+
+_load_lock = threading.Lock()
+_loaded = False
+
+
+def load_agents():
+    """Imports the ADK/GenAI agent stack. Safe to call repeatedly and from any thread."""
+    global _loaded
+    if _loaded:
+        return
+    with _load_lock:
+        if _loaded:
+            return
+        started = time.perf_counter()
+        for module in AGENT_MODULES:
+            importlib.import_module(module)
+        _loaded = True
+        logger.info(f"Agent stack loaded in {time.perf_counter() - started:.2f}s")
+
+
+async def ensure_agents_loaded():
+    """Loads the agent stack off the event loop so other requests keep being served."""
+    if not _loaded:
+        await asyncio.to_thread(load_agents)
+
+
+def preload_agents_in_background() -> threading.Thread:
+    """Warms the agent stack after startup so the first /agents request doesn't pay for it."""
+    thread = threading.Thread(target=load_agents, name="agent-preload", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,194 @@
+import os
+import math
+import hashlib
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+from google.adk import Agent
+from app.agents.adk_utils import get_model, run_adk_agent
+from app.agents.encoding import _num
+from app.agents.daily_review import _is_cacheable
+from app.core.cache import TTLCache
+from app.services.review_service import ReviewService
+from app.services.goal_service import GoalService
+
+# Weekly / monthly review, map-reduce style.
+# Map: every day is reduced locally to one compact line built from the stored workout
+# and meal totals, plus an excerpt of the cached daily review when it is still current.
+# Reduce: one generation over those lines. Long ranges are grouped into weekly or
+# 30-day lines, so the prompt never grows past PERIOD_REVIEW_MAX_LINES lines.
+PERIOD_REVIEW_MAX_LINES = int(os.getenv("PERIOD_REVIEW_MAX_LINES", "31"))
+PERIOD_REVIEW_EXCERPT_CHARS = int(os.getenv("PERIOD_REVIEW_EXCERPT_CHARS", "160"))
+PERIOD_REVIEW_CACHE_TTL_SECONDS = float(os.getenv("PERIOD_REVIEW_CACHE_TTL_SECONDS", "3600"))
+MAX_WORKOUT_NAMES = 3
+
+NOTHING_LOGGED_MESSAGE = "Nothing logged in this period. Log workouts and meals to get a review."
+
+REVIEW_LABELS = {"activity": "coach", "diet": "nutrition"}
+
+def bucket_days(n_days: int) -> int:
+    """Days per summary line: daily, then weekly, then multiples of 30 days."""
+    if n_days <= PERIOD_REVIEW_MAX_LINES:
+        return 1
+    if math.ceil(n_days / 7) <= PERIOD_REVIEW_MAX_LINES:
+        return 7
+    return 30 * math.ceil(n_days / (30 * PERIOD_REVIEW_MAX_LINES))
+
+def _excerpt(text: str) -> str:
+    text = " ".join(text.split())
+    if len(text) <= PERIOD_REVIEW_EXCERPT_CHARS:
+        return text
+    return text[:PERIOD_REVIEW_EXCERPT_CHARS - 1].rstrip() + "…"
+
+def _empty_day() -> dict:
+    return {
+        "workouts": [], "sets": 0, "volume": 0.0, "cardio_kcal": 0.0,
+        "meals": 0, "calories": 0.0, "protein": 0.0, "carbs": 0.0, "fats": 0.0,
+        "notes": {},
+    }
+
+def summarize_days(data: Dict[str, List[dict]], start: date, end: date) -> Dict[str, dict]:
+    """Map step: totals per day of the range (days without data included)."""
+    days = {(start + timedelta(days=i)).isoformat(): _empty_day() for i in range((end - start).days + 1)}
+    rows = {"activity": {}, "diet": {}}
+
+    for w in data["workouts"]:
+        key = str(w["date"])[:10]
+        if key not in days:
+            continue
+        day = days[key]
+        rows["activity"].setdefault(key, []).append(w)
+        day["workouts"].append(w.get("name") or "Workout")
+        day["sets"] += w.get("set_count") or 0
+        day["volume"] += float(w.get("total_volume") or 0)
+        day["cardio_kcal"] += float(w.get("cardio_calories") or 0)
+
+    for m in data["meals"]:
+        key = str(m["date"])[:10]
+        if key not in days:
+            continue
+        day = days[key]
+        rows["diet"].setdefault(key, []).append(m)
+        day["meals"] += 1
+        day["calories"] += float(m.get("total_calories") or 0)
+        day["protein"] += float(m.get("total_protein") or 0)
+        day["carbs"] += float(m.get("total_carbs") or 0)
+        day["fats"] += float(m.get("total_fats") or 0)
+
+    # Cached daily reviews are only reused while they still match the logged data
+    for r in data["reviews"]:
+        key = str(r["date"])[:10]
+        section_rows = rows.get(r["section"], {}).get(key)
+        if key in days and section_rows and ReviewService._marker(section_rows) == r["source_marker"]:
+            days[key]["notes"][r["section"]] = _excerpt(r["review"])
+    return days
+
+def _macros(day: dict, divisor: int = 1) -> str:
+    return (f"{_num(round(day['calories'] / divisor))}kcal P{_num(round(day['protein'] / divisor))} "
+            f"C{_num(round(day['carbs'] / divisor))} F{_num(round(day['fats'] / divisor))}")
+
+def _training(day: dict) -> str:
+    text = f"{day['sets']} sets, {_num(round(day['volume']))}kg"
+    if day["cardio_kcal"]:
+        text += f", cardio {_num(round(day['cardio_kcal']))}kcal"
+    return text
+
+def _day_lines(key: str, day: dict) -> List[str]:
+    label = date.fromisoformat(key).strftime("%a %m-%d")
+    if not day["workouts"] and not day["meals"]:
+        return [f"{label}: nothing logged"]
+
+    parts = []
+    if day["workouts"]:
+        names = day["workouts"][:MAX_WORKOUT_NAMES]
+        more = len(day["workouts"]) - len(names)
+        parts.append(", ".join(names) + (f" +{more}" if more else "") + f" ({_training(day)})")
+    else:
+        parts.append("rest")
+    parts.append(f"{_macros(day)} ({day['meals']} meals)" if day["meals"] else "no meals logged")
+
+    lines = [f"{label}: {' | '.join(parts)}"]
+    for section, note in day["notes"].items():
+        lines.append(f"  {REVIEW_LABELS.get(section, section)}: {note}")
+    return lines
+
+def _merge(days: List[dict]) -> dict:
+    merged = _empty_day()
+    merged["training_days"] = sum(1 for d in days if d["workouts"])
+    merged["logged_days"] = sum(1 for d in days if d["meals"])
+    for d in days:
+        for field in ("sets", "volume", "cardio_kcal", "meals", "calories", "protein", "carbs", "fats"):
+            merged[field] += d[field]
+    return merged
+
+def _bucket_line(first: str, last: str, merged: dict) -> str:
+    span = f"{first[5:]}..{last[5:]}"
+    intake = (f"avg {_macros(merged, merged['logged_days'])} on {merged['logged_days']} logged days"
+              if merged["logged_days"] else "no meals logged")
+    return f"{span}: {merged['training_days']} training days ({_training(merged)}) | {intake}"
+
+def encode_period(days: Dict[str, dict], per_line: int) -> List[str]:
+    """Reduce input: one line per day (plus review excerpts) or per group of days."""
+    keys = list(days)
+    if per_line == 1:
+        return [line for key in keys for line in _day_lines(key, days[key])]
+    lines = []
+    for i in range(0, len(keys), per_line):
+        chunk = keys[i:i + per_line]
+        lines.append(_bucket_line(chunk[0], chunk[-1], _merge([days[k] for k in chunk])))
+    return lines
+
+# Keyed by the prompt itself: new data changes the prompt, so stale reviews are never served
+_review_cache = TTLCache(maxsize=1024, ttl=PERIOD_REVIEW_CACHE_TTL_SECONDS)
+
+async def review_period(user_id: str, start: date, end: date) -> dict:
+    """
+    Agent: Period Reviewer
+    Objective: Review training and diet trends over a week, a month or any longer range
+    with a single model call whose prompt size does not depend on the range length.
+    """
+    data = await ReviewService.get_period_data(user_id, start.isoformat(), end.isoformat())
+    n_days = (end - start).days + 1
+    per_line = bucket_days(n_days)
+    result = {"from": start.isoformat(), "to": end.isoformat(), "days": n_days, "days_per_line": per_line}
+
+    if not data["workouts"] and not data["meals"]:
+        return {**result, "review": NOTHING_LOGGED_MESSAGE}
+
+    days = summarize_days(data, start, end)
+    total = _merge(list(days.values()))
+    goal = await GoalService.get_goal(user_id)
+    target = goal.get("daily_calories") if goal else None
+
+    header = [
+        f"Period {start.isoformat()}..{end.isoformat()} ({n_days} days)",
+        f"Training: {total['training_days']} days, {_training(total)}",
+        (f"Intake: avg {_macros(total, total['logged_days'])} over {total['logged_days']} logged days"
+         if total["logged_days"] else "Intake: no meals logged"),
+    ]
+    if target:
+        header.append(f"Target intake: {target}kcal/day")
+
+    prompt = f"""
+    Review the user's training and diet over this period.
+    Macros are P/C/F in grams; volume is reps x weight. Lines starting with coach/nutrition are excerpts of earlier daily reviews.
+
+    {chr(10).join(header)}
+
+    {chr(10).join(encode_period(days, per_line))}
+    """
+
+    key = (str(user_id), hashlib.sha256(prompt.encode()).hexdigest())
+    cached = _review_cache.get(key)
+    if cached:
+        return {**result, "review": cached}
+
+    agent = Agent(
+        name="period_reviewer",
+        model=get_model(),
+        instruction="You are a Fitness Coach and Nutritionist. Review trends across the period rather than single days: training consistency, volume progression, intake versus target and protein. Name the strongest and weakest stretch and give 2-3 concrete focus points for the next period. Keep it under 150 words.",
+        description="Agent that reviews training and diet trends over a week or month."
+    )
+    review = await run_adk_agent(agent, prompt, user_id)
+    if _is_cacheable(review):
+        _review_cache.set(key, review)
+    return {**result, "review": review}
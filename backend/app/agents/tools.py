@@ -1,5 +1,5 @@
 
-from app.db.client import supabase
+from app.db.client import get_supabase
 from datetime import datetime
 
 # Tool definitions for ADK Agents
@@ -12,14 +12,27 @@ from datetime import datetime
 
 async def get_db_food_item(name: str):
     """Searches the local Supabase DB for a food item."""
+    supabase = get_supabase()
     # Simple fuzzy search
     response = supabase.table("food_items").select("*").ilike("name", f"%{name}%").limit(1).execute()
     if response.data:
         return response.data[0]
     return None
 
+async def get_db_food_items(patterns: list, limit: int = 20):
+    """
+    Food items whose name contains each pattern, at most `limit` per pattern (exact names
+    first, then newest). One call for all of them: search_food_items() in migrations/food_lookup.sql.
+    """
+    if not patterns:
+        return []
+    supabase = get_supabase()
+    response = supabase.rpc("search_food_items", {"p_patterns": list(patterns), "p_limit": limit}).execute()
+    return response.data
+
 async def save_food_item_to_db(meal_id: str, name: str, calories: int, protein: float, carbs: float, fats: float):
     """Saves a new food item to the database."""
+    supabase = get_supabase()
     data = {
         "meal_id": meal_id,
         "name": name,
@@ -34,6 +47,7 @@ async def save_food_item_to_db(meal_id: str, name: str, calories: int, protein:
 
 async def get_day_activity(user_id: str, date: str):
     """Fetches workouts for a specific user and date."""
+    supabase = get_supabase()
     start = f"{date}T00:00:00"
     end = f"{date}T23:59:59"
     response = supabase.table("workouts").select("*, workout_exercises(*, exercises(*), sets(*))").eq("user_id", user_id).gte("date", start).lte("date", end).execute()
@@ -41,5 +55,6 @@ async def get_day_activity(user_id: str, date: str):
 
 async def get_day_diet(user_id: str, date: str):
     """Fetches meals for a specific user and date."""
+    supabase = get_supabase()
     response = supabase.table("meals").select("*, items:food_items(*)").eq("user_id", user_id).eq("date", date).execute()
     return response.data
@@ -1,5 +1,6 @@
 from fastapi import Header, HTTPException, Depends
 from app.db.client import get_supabase
+from app.core.metrics import timed
 from typing import Optional
 
 async def get_current_user(authorization: Optional[str] = Header(None)):
@@ -19,7 +20,8 @@ async def get_current_user(authorization: Optional[str] = Header(None)):
     try:
         # Verify the token with Supabase Auth
         # Note: This checks if the user exists and the token is valid
-        res = supabase.auth.get_user(token)
+        with timed("auth"):
+            res = supabase.auth.get_user(token)
         if not res.user:
             raise HTTPException(status_code=401, detail="Invalid authentication token")
             
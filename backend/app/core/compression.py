@@ -0,0 +1,161 @@
+import os
+import zlib
+from typing import Dict
+from starlette.datastructures import Headers, MutableHeaders
+
+# Negotiated response compression (brotli, then gzip).
+# Workout/template lists repeat the same keys and null set fields thousands of
+# times and shrink ~10x. Bodies under the threshold and text/event-stream
+# responses are sent as-is (the latter so SSE events are not held back).
+
+COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.environ.get("GZIP_LEVEL", "6"))
+# Low brotli qualities are faster than gzip -6 and still compress better
+BROTLI_QUALITY = int(os.environ.get("BROTLI_QUALITY", "4"))
+
+
+def _brotli_available() -> bool:
+    try:
+        import brotli  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class CompressionResponder:
+    """
+    Wraps one response: decides on its first body message whether to compress it,
+    then runs every body chunk through `compress`. Implemented here rather than on
+    Starlette's GZip responder classes, which are internal and change between releases.
+    """
+    content_encoding = ""
+
+    def __init__(self, app, minimum_size: int):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    def compress(self, body: bytes, *, more_body: bool) -> bytes:
+        raise NotImplementedError
+
+    async def __call__(self, scope, receive, send):
+        start = None
+        compressing = False
+
+        async def send_compressed(message):
+            nonlocal start, compressing
+            if message["type"] == "http.response.start":
+                # Held back until the first body message shows how big the response is
+                start = message
+                return
+
+            if start is None:
+                if compressing and message["type"] == "http.response.body":
+                    more_body = message.get("more_body", False)
+                    message = {**message, "body": self.compress(message.get("body", b""), more_body=more_body)}
+                await send(message)
+                return
+
+            headers = MutableHeaders(scope=start)
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            compressing = (
+                message["type"] == "http.response.body"
+                and "content-encoding" not in headers
+                and not headers.get("content-type", "").startswith("text/event-stream")
+                and (more_body or len(body) >= self.minimum_size)
+            )
+            if compressing:
+                body = self.compress(body, more_body=more_body)
+                headers["Content-Encoding"] = self.content_encoding
+                headers.add_vary_header("Accept-Encoding")
+                if more_body:
+                    # Streamed: the compressed length is not known up front
+                    if "content-length" in headers:
+                        del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(body))
+                message = {**message, "body": body}
+
+            await send(start)
+            start = None
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+
+class BrotliResponder(CompressionResponder):
+    content_encoding = "br"
+
+    def __init__(self, app, minimum_size: int, quality: int = BROTLI_QUALITY):
+        super().__init__(app, minimum_size)
+        import brotli
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, body: bytes, *, more_body: bool) -> bytes:
+        data = self.compressor.process(body)
+        # Flush every chunk so streamed bodies reach the client without waiting for the end
+        return data + (self.compressor.flush() if more_body else self.compressor.finish())
+
+
+class GZipResponder(CompressionResponder):
+    content_encoding = "gzip"
+
+    def __init__(self, app, minimum_size: int, compresslevel: int = GZIP_LEVEL):
+        super().__init__(app, minimum_size)
+        # wbits 16 + MAX_WBITS: gzip header and trailer
+        self.compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, body: bytes, *, more_body: bool) -> bytes:
+        data = self.compressor.compress(body)
+        return data + self.compressor.flush(zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH)
+
+
+def parse_accept_encoding(value: str) -> Dict[str, float]:
+    """'br;q=1.0, gzip;q=0.8, *;q=0' -> {'br': 1.0, 'gzip': 0.8, '*': 0.0}"""
+    accepted = {}
+    for part in value.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware choosing br or gzip from Accept-Encoding (client q-values first, br on ties)."""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = ("br", "gzip") if _brotli_available() else ("gzip",)
+
+    def negotiate(self, accept_encoding: str):
+        accepted = parse_accept_encoding(accept_encoding)
+        best, best_q = None, 0.0
+        for encoding in self.encodings:
+            q = accepted.get(encoding, accepted.get("*", 0.0))
+            if q > best_q:
+                best, best_q = encoding, q
+        return best
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding == "br":
+            responder = BrotliResponder(self.app, self.minimum_size)
+        elif encoding == "gzip":
+            responder = GZipResponder(self.app, self.minimum_size)
+        else:
+            await self.app(scope, receive, send)
+            return
+        await responder(scope, receive, send)
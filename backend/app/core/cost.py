@@ -48,6 +48,20 @@ class CostController:
             
         return True, "OK"
 
+    def reserve(self) -> Tuple[bool, str]:
+        """
+        can_proceed() that also counts the request up front, so concurrent callers cannot
+        all pass the check before any of them is tracked. Refund a failed call with release().
+        """
+        allowed, reason = self.can_proceed()
+        if allowed:
+            self._request_count += 1
+        return allowed, reason
+
+    def release(self):
+        """Gives back a request counted by reserve() that did not succeed."""
+        self._request_count = max(0, self._request_count - 1)
+
     def track_request(self, input_tokens: int = 0, output_tokens: int = 0):
         """
         Increments usage counters. Call this AFTER a successful API call.
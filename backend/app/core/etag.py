@@ -0,0 +1,131 @@
+import os
+import time
+import uuid
+import asyncio
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Tuple
+from email.utils import formatdate
+from fastapi import Depends, HTTPException, Request, Response
+from app.auth import get_current_user
+from app.db.client import get_supabase
+
+logger = logging.getLogger(__name__)
+
+# Conditional GET for per-user resources.
+# GET endpoints tag their response with an ETag built from the user's last write to
+# each resource, and answer a matching If-None-Match with 304 before the handler
+# (and its queries) runs.
+#
+# ETAG_SOURCE=database (default): the last writes come from get_resource_versions()
+# (migrations/sync.sql), one small query shared by every worker.
+# ETAG_SOURCE=memory: every service write bumps a (user, resource) counter in process
+# memory and no query is made. Writes on one worker are not seen by the others, so
+# only use it with a single worker (or sticky sessions). The boot id in every tag
+# makes a restarted process miss all old tags instead of reusing counters that restarted at 0.
+
+ETAG_ENABLED = os.environ.get("ETAG_ENABLED", "True").lower() == "true"
+ETAG_SOURCE = os.environ.get("ETAG_SOURCE", "database")
+
+BOOT_ID = uuid.uuid4().hex[:8]
+BOOT_TIME = time.time()
+
+WORKOUTS = "workouts"
+MEALS = "meals"
+TEMPLATES = "templates"
+GOALS = "goals"
+
+
+class ResourceVersions:
+    """Per-user, per-resource write counters with the time of the last write."""
+
+    def __init__(self):
+        self._versions: Dict[Tuple[str, str], Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, user_id: Any, *resources: str):
+        now = time.time()
+        with self._lock:
+            for resource in resources:
+                key = (str(user_id), resource)
+                version, _ = self._versions.get(key, (0, BOOT_TIME))
+                self._versions[key] = (version + 1, now)
+
+    def get(self, user_id: Any, resource: str) -> Tuple[int, float]:
+        with self._lock:
+            return self._versions.get((str(user_id), resource), (0, BOOT_TIME))
+
+
+def _reset_boot_id():
+    # A forked worker must not share tags with its parent or siblings
+    global BOOT_ID
+    BOOT_ID = uuid.uuid4().hex[:8]
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_boot_id)
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: proxies may add or strip the W/ prefix
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return etag.removeprefix("W/") in tags
+
+
+def _database_versions(user_id: Any) -> Dict[str, Any]:
+    # Blocking PostgREST call; run through asyncio.to_thread
+    response = get_supabase().rpc("get_resource_versions", {"p_user_id": str(user_id)}).execute()
+    return response.data or {}
+
+
+async def _state(user_id: Any, resources: Tuple[str, ...]) -> Tuple[str, float]:
+    """The version part of the tag and the time of the last write to `resources`."""
+    if ETAG_SOURCE == "memory":
+        versions = [resource_versions.get(user_id, r) for r in resources]
+        return f"{BOOT_ID}-" + ":".join(str(v) for v, _ in versions), max(m for _, m in versions)
+
+    stamps = await asyncio.to_thread(_database_versions, user_id)
+    written = [stamps.get(r) for r in resources]
+    state = hashlib.blake2b("|".join(str(w) for w in written).encode(), digest_size=6).hexdigest()
+    modified = max((datetime.fromisoformat(w).timestamp() for w in written if w), default=BOOT_TIME)
+    return state, modified
+
+
+def conditional(*resources: str):
+    """
+    Dependency for GET endpoints whose response only changes when one of `resources`
+    is written for the current user. Query parameters are part of the tag, so
+    /meals/?date=... gets a distinct tag per date.
+    """
+    async def dependency(request: Request, response: Response, user: Any = Depends(get_current_user)):
+        if not ETAG_ENABLED:
+            return
+
+        try:
+            state, modified = await _state(user.id, resources)
+        except Exception as e:
+            # No tag is better than a wrong one: serve the request normally
+            logger.warning(f"ETag versions unavailable: {e}")
+            return
+
+        digest = hashlib.blake2b(f"{user.id}|{request.url.query}".encode(), digest_size=6).hexdigest()
+        etag = f'W/"{digest}-{state}"'
+        headers = {
+            "ETag": etag,
+            "Last-Modified": formatdate(modified, usegmt=True),
+            "Cache-Control": "private, no-cache",
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return dependency
+
+
+# Global Instance
+resource_versions = ResourceVersions()
@@ -0,0 +1,149 @@
+import re
+import time
+import heapq
+import difflib
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# In-memory autocomplete index over the `exercises` master table.
+# Every token of an exercise name is inserted into a character trie whose nodes hold
+# the ids of all exercises with a token starting there, so a prefix lookup is one walk
+# down the trie and a multi-word query is a set intersection. Muscle groups ("chest")
+# are matched too, through a small group -> ids map.
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class _Node:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.ids: Set[str] = set()
+
+
+class ExerciseIndex:
+    def __init__(self):
+        self._root = _Node()
+        self._entries: Dict[str, dict] = {}
+        self._by_name: Dict[str, str] = {}
+        self._normalized: Dict[str, str] = {}
+        self._groups: Dict[str, Set[str]] = {}
+        self._tokens: Set[str] = set()
+        self._lock = threading.Lock()
+        self.loaded_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _insert(self, entry: dict):
+        exercise_id = str(entry["id"])
+        if exercise_id in self._entries:
+            return
+        self._entries[exercise_id] = entry
+        self._by_name[entry["name"]] = exercise_id
+        tokens = tokenize(entry["name"])
+        self._normalized[exercise_id] = " ".join(tokens)
+        group = entry["muscle_group"].lower()
+        self._groups.setdefault(group, set()).add(exercise_id)
+        self._tokens.add(group)
+        for token in set(tokens):
+            self._tokens.add(token)
+            node = self._root
+            for char in token:
+                node = node.children.setdefault(char, _Node())
+                node.ids.add(exercise_id)
+
+    @staticmethod
+    def _entry(row: dict) -> dict:
+        return {"id": str(row["id"]), "name": row["name"], "muscle_group": row.get("muscle_group") or "Other"}
+
+    def rebuild(self, rows: Iterable[dict]):
+        """Replaces the whole index (initial load and periodic refresh)."""
+        fresh = ExerciseIndex()
+        for row in rows:
+            fresh._insert(self._entry(row))
+        with self._lock:
+            self.__dict__.update({k: v for k, v in fresh.__dict__.items() if k != "_lock"})
+            self.loaded_at = time.monotonic()
+
+    def add(self, row: dict):
+        """Incremental update after an insert into `exercises`."""
+        with self._lock:
+            self._insert(self._entry(row))
+
+    def get(self, exercise_id: str) -> Optional[dict]:
+        return self._entries.get(str(exercise_id))
+
+    def get_id(self, name: str) -> Optional[str]:
+        """Exact (case-sensitive, like the DB lookup) name -> id."""
+        return self._by_name.get(name)
+
+    def _prefix_ids(self, prefix: str) -> Set[str]:
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return set()
+        return node.ids
+
+    def search(self, query: str, muscle_group: Optional[str] = None, limit: int = 10) -> List[dict]:
+        """
+        Exercises having a token starting with every query token ("inc db" -> "Incline DB Press").
+        When nothing matches, each unknown token is replaced by its closest known token,
+        so "benhc" still finds "Bench Press".
+        """
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        ids, name_ids = self._match(tokens)
+        if not ids:
+            corrected = []
+            for token in tokens:
+                if self._match([token])[0]:
+                    corrected.append(token)
+                    continue
+                close = difflib.get_close_matches(token, self._tokens, n=1, cutoff=0.75)
+                if not close:
+                    return []
+                corrected.append(close[0])
+            ids, name_ids = self._match(corrected)
+            tokens = corrected
+
+        if muscle_group:
+            ids = ids & self._groups.get(muscle_group.lower(), set())
+
+        # Names starting with the query first, then name matches before muscle-group
+        # matches, then shorter (more generic) names
+        q = " ".join(tokens)
+        normalized = self._normalized
+        best = heapq.nsmallest(limit, ids, key=lambda i: (
+            not normalized[i].startswith(q), i not in name_ids, len(normalized[i]), normalized[i]
+        ))
+        return [self._entries[i] for i in best]
+
+    def _match(self, tokens: List[str]) -> Tuple[Set[str], Set[str]]:
+        """(ids matching every token by name or muscle group, ids matching every token by name)."""
+        by_name, by_any = [], []
+        for token in tokens:
+            name_ids = self._prefix_ids(token)
+            group_ids = [ids for group, ids in self._groups.items() if group.startswith(token)]
+            by_name.append(name_ids)
+            by_any.append(name_ids.union(*group_ids) if group_ids else name_ids)
+        return self._intersect(by_any), self._intersect(by_name)
+
+    @staticmethod
+    def _intersect(sets: List[Set[str]]) -> Set[str]:
+        sets = sorted(sets, key=len)
+        if not sets[0]:
+            return set()
+        return set(sets[0]).intersection(*sets[1:])
+
+
+# Global Instance
+exercise_index = ExerciseIndex()
@@ -0,0 +1,83 @@
+import os
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from fastapi import Header, HTTPException, Response
+from pydantic import BaseModel
+from app.core.cache import TTLCache
+
+# Idempotency-Key support for write routes. Mobile clients retry POSTs on flaky
+# connections; a retry with the same key gets the stored result of the first attempt
+# (no database access), and a retry that arrives while the first attempt is still
+# running waits for it. Failed attempts are not stored, so they can be retried.
+# The store is per process: with several workers, route a user to one worker.
+IDEMPOTENCY_TTL_SECONDS = float(os.environ.get("IDEMPOTENCY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_MAX_KEYS = int(os.environ.get("IDEMPOTENCY_MAX_KEYS", "10000"))
+# How long a duplicate waits for the first attempt before giving up with 409
+IDEMPOTENCY_WAIT_SECONDS = float(os.environ.get("IDEMPOTENCY_WAIT_SECONDS", "30"))
+MAX_KEY_LENGTH = 255
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def idempotency_key(key: Optional[str] = Header(None, alias="Idempotency-Key")) -> Optional[str]:
+    """Route dependency reading the optional Idempotency-Key header."""
+    if key is not None and not 0 < len(key) <= MAX_KEY_LENGTH:
+        raise HTTPException(status_code=400, detail=f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters")
+    return key
+
+
+class IdempotencyStore:
+    def __init__(self, maxsize: int, ttl: float):
+        self._done = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._pending: Dict[Tuple[str, str, str], asyncio.Future] = {}
+
+    @staticmethod
+    def _fingerprint(payload: BaseModel) -> str:
+        return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+    async def run(
+        self,
+        response: Response,
+        user_id: str,
+        route: str,
+        key: Optional[str],
+        payload: BaseModel,
+        call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Runs `call` once per (user, route, key); repeats get the first result."""
+        if key is None:
+            return await call()
+
+        cache_key = (str(user_id), route, key)
+        fingerprint = self._fingerprint(payload)
+        while True:
+            found, entry = self._done.get_entry(cache_key)
+            if found:
+                if entry[0] != fingerprint:
+                    raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request body")
+                response.headers[REPLAYED_HEADER] = "true"
+                return entry[1]
+
+            pending = self._pending.get(cache_key)
+            if pending is None:
+                break
+            try:
+                await asyncio.wait_for(asyncio.shield(pending), IDEMPOTENCY_WAIT_SECONDS)
+            except asyncio.TimeoutError:
+                raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+            # Loop: replay the stored result, or run it ourselves if the first attempt failed
+
+        done = asyncio.get_running_loop().create_future()
+        self._pending[cache_key] = done
+        try:
+            result = await call()
+            self._done.set(cache_key, (fingerprint, result))
+            return result
+        finally:
+            del self._pending[cache_key]
+            done.set_result(None)
+
+
+# Global Instance
+idempotency_store = IdempotencyStore(maxsize=IDEMPOTENCY_MAX_KEYS, ttl=IDEMPOTENCY_TTL_SECONDS)
@@ -0,0 +1,247 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "2"))
+# Optional SQLite file; when set, queued jobs survive a restart of the API process.
+JOBS_DB_PATH = os.environ.get("JOBS_DB_PATH")
+# A job left "running" for longer than this (its process died) is picked up again on startup.
+JOB_STALE_SECONDS = int(os.environ.get("JOB_STALE_SECONDS", "600"))
+# Finished jobs are kept this long so clients can poll for the result.
+JOB_RESULT_TTL_SECONDS = int(os.environ.get("JOB_RESULT_TTL_SECONDS", "86400"))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class MemoryJobStore:
+    """Keeps jobs in process memory. Jobs are lost on restart."""
+
+    def __init__(self):
+        self._jobs: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def save(self, job: dict):
+        with self._lock:
+            self._jobs[job["id"]] = dict(job)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def claim(self, job_id: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job["status"] != QUEUED:
+                return False
+            job["status"] = RUNNING
+            job["updated_at"] = time.time()
+            return True
+
+    def pending(self, stale_before: float) -> List[dict]:
+        return []
+
+    def purge(self, finished_before: float):
+        with self._lock:
+            for job_id in [
+                j["id"] for j in self._jobs.values()
+                if j["status"] in (DONE, FAILED) and j["updated_at"] < finished_before
+            ]:
+                del self._jobs[job_id]
+
+
+class SqliteJobStore:
+    """Persists jobs in a SQLite file so that queued work survives a worker restart."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                create table if not exists jobs (
+                    id text primary key,
+                    kind text not null,
+                    user_id text,
+                    payload text not null,
+                    status text not null,
+                    result text,
+                    error text,
+                    created_at real not null,
+                    updated_at real not null
+                )
+                """
+            )
+            conn.execute("create index if not exists jobs_status_idx on jobs (status, updated_at)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:  # commits on success, rolls back on error
+                yield conn
+        finally:
+            conn.close()
+
+    def save(self, job: dict):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """
+                insert or replace into jobs (id, kind, user_id, payload, status, result, error, created_at, updated_at)
+                values (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    job["id"], job["kind"], job["user_id"], json.dumps(job["payload"]), job["status"],
+                    json.dumps(job["result"]) if job["result"] is not None else None,
+                    job["error"], job["created_at"], job["updated_at"],
+                ),
+            )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock, self._connect() as conn:
+            row = conn.execute("select * from jobs where id = ?", (job_id,)).fetchone()
+        return self._to_job(row) if row else None
+
+    def claim(self, job_id: str) -> bool:
+        # Atomic across processes sharing the file: only one worker flips queued -> running.
+        with self._lock, self._connect() as conn:
+            cur = conn.execute(
+                "update jobs set status = ?, updated_at = ? where id = ? and status = ?",
+                (RUNNING, time.time(), job_id, QUEUED),
+            )
+            return cur.rowcount == 1
+
+    def pending(self, stale_before: float) -> List[dict]:
+        """Queued jobs, plus running jobs whose process appears to have died."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "update jobs set status = ? where status = ? and updated_at < ?",
+                (QUEUED, RUNNING, stale_before),
+            )
+            rows = conn.execute("select * from jobs where status = ? order by created_at", (QUEUED,)).fetchall()
+        return [self._to_job(r) for r in rows]
+
+    def purge(self, finished_before: float):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "delete from jobs where status in (?, ?) and updated_at < ?",
+                (DONE, FAILED, finished_before),
+            )
+
+    @staticmethod
+    def _to_job(row) -> dict:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+
+class JobQueue:
+    """
+    In-process asyncio job queue. Handlers are registered per job kind and run on
+    a fixed number of worker tasks; job state lives in a MemoryJobStore or SqliteJobStore.
+    """
+
+    def __init__(self, store, workers: int = JOB_WORKERS):
+        self.store = store
+        self.workers = workers
+        self._handlers: Dict[str, JobHandler] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def register(self, kind: str, handler: JobHandler):
+        self._handlers[kind] = handler
+
+    async def submit(self, kind: str, payload: Dict[str, Any], user_id: Optional[str] = None) -> dict:
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for job kind '{kind}'")
+        if self._queue is None:
+            raise RuntimeError("Job queue is not running")
+
+        now = time.time()
+        job = {
+            "id": str(uuid.uuid4()),
+            "kind": kind,
+            "user_id": user_id,
+            "payload": payload,
+            "status": QUEUED,
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        await asyncio.to_thread(self.store.save, job)
+        await self._queue.put(job["id"])
+        return job
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        now = time.time()
+        await asyncio.to_thread(self.store.purge, now - JOB_RESULT_TTL_SECONDS)
+        for job in await asyncio.to_thread(self.store.pending, now - JOB_STALE_SECONDS):
+            await self._queue.put(job["id"])
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"Job queue started with {self.workers} workers ({self._queue.qsize()} resumed jobs)")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Jobs still queued in memory stay "queued" in the store and resume on next start.
+        self._queue = None
+
+    async def _worker(self, index: int):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            except Exception as e:
+                logger.error(f"Job worker {index} failed on {job_id}: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        if not await asyncio.to_thread(self.store.claim, job_id):
+            return  # Already taken by another process
+        job = await asyncio.to_thread(self.store.get, job_id)
+        handler = self._handlers.get(job["kind"])
+
+        try:
+            if handler is None:
+                raise ValueError(f"No handler registered for job kind '{job['kind']}'")
+            job["result"] = await handler(job["payload"])
+            job["status"] = DONE
+        except asyncio.CancelledError:
+            # Shutting down mid-job: hand it back so the next start retries it.
+            job["status"] = QUEUED
+            job["updated_at"] = time.time()
+            await asyncio.to_thread(self.store.save, job)
+            raise
+        except Exception as e:
+            logger.error(f"Job {job_id} ({job['kind']}) failed: {e}", exc_info=True)
+            job["status"] = FAILED
+            job["error"] = str(e)
+
+        job["updated_at"] = time.time()
+        await asyncio.to_thread(self.store.save, job)
+
+
+# Global Instance
+job_queue = JobQueue(SqliteJobStore(JOBS_DB_PATH) if JOBS_DB_PATH else MemoryJobStore())
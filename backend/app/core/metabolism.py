@@ -0,0 +1,112 @@
+from datetime import date, datetime
+from typing import Optional
+
+# Deterministic energy-balance maths for goal analysis.
+# These used to be computed by the model inside the prose; doing it locally makes the
+# numbers instant, reproducible and available even when Gemini is slow or down.
+
+KCAL_PER_KG = 7700  # Approximate energy content of 1 kg of body fat
+
+ACTIVITY_MULTIPLIERS = {
+    "sedentary": 1.2,
+    "lightly active": 1.375,
+    "active": 1.55,
+    "very active": 1.725,
+}
+DEFAULT_ACTIVITY = "sedentary"
+
+# Used when there is no (future) target date to derive the deficit from
+DEFAULT_DEFICIT = 500
+DEFAULT_SURPLUS = 250
+MAX_DEFICIT_FRACTION = 0.25  # Never cut more than 25% of TDEE
+MAX_SURPLUS = 500  # Cap for weight-gain goals
+MIN_CALORIES = {"male": 1500, "female": 1200}
+
+
+def bmr_mifflin_st_jeor(weight_kg: float, height_cm: float, age: int, gender: Optional[str]) -> float:
+    base = 10 * weight_kg + 6.25 * height_cm - 5 * age
+    return base - 161 if (gender or "").lower() == "female" else base + 5
+
+
+def bmr_katch_mcardle(weight_kg: float, body_fat_pct: float) -> float:
+    lean_mass = weight_kg * (1 - body_fat_pct / 100)
+    return 370 + 21.6 * lean_mass
+
+
+def activity_multiplier(lifestyle: Optional[str]) -> float:
+    return ACTIVITY_MULTIPLIERS.get((lifestyle or DEFAULT_ACTIVITY).strip().lower(), ACTIVITY_MULTIPLIERS[DEFAULT_ACTIVITY])
+
+
+def compute_energy_plan(goal, today: Optional[date] = None) -> dict:
+    """
+    Computes BMR, TDEE and the daily deficit (negative = surplus) needed to reach
+    `goal_weight` by `target_date`, clamped to safe bounds.
+
+    BMR uses Katch-McArdle when body fat is known, Mifflin-St Jeor otherwise.
+    Missing inputs yield None for the values that depend on them.
+    """
+    today = today or date.today()
+    plan = {
+        "bmr": None,
+        "bmr_formula": None,
+        "activity_multiplier": activity_multiplier(goal.lifestyle),
+        "tdee": None,
+        "days_remaining": None,
+        "weight_change_kg": None,
+        "required_daily_deficit": None,
+        "daily_caloric_deficit": None,
+        "daily_calories": None,
+        "weekly_change_kg": None,
+        "projected_date": None,
+        "capped": False,
+    }
+
+    if goal.current_weight and goal.current_body_fat:
+        plan["bmr"] = bmr_katch_mcardle(goal.current_weight, goal.current_body_fat)
+        plan["bmr_formula"] = "Katch-McArdle"
+    elif goal.current_weight and goal.current_height and goal.age:
+        plan["bmr"] = bmr_mifflin_st_jeor(goal.current_weight, goal.current_height, goal.age, goal.gender)
+        plan["bmr_formula"] = "Mifflin-St Jeor"
+    else:
+        return plan
+
+    tdee = plan["bmr"] * plan["activity_multiplier"]
+    plan["tdee"] = tdee
+
+    target = goal.target_date.date() if isinstance(goal.target_date, datetime) else goal.target_date
+    if target:
+        plan["days_remaining"] = (target - today).days
+
+    if goal.goal_weight is not None and goal.current_weight:
+        plan["weight_change_kg"] = goal.goal_weight - goal.current_weight
+
+    # Deficit needed to hit the goal on time, or a standard deficit/surplus without a deadline
+    change = plan["weight_change_kg"]
+    days = plan["days_remaining"]
+    if change is not None and days and days > 0:
+        required = -change * KCAL_PER_KG / days
+    elif change is not None and change > 0:
+        required = -DEFAULT_SURPLUS
+    elif change == 0:
+        required = 0
+    else:
+        required = DEFAULT_DEFICIT
+    plan["required_daily_deficit"] = required
+
+    min_calories = MIN_CALORIES.get((goal.gender or "").lower(), MIN_CALORIES["female"])
+    max_deficit = max(0.0, min(tdee * MAX_DEFICIT_FRACTION, tdee - min_calories))
+    deficit = max(-MAX_SURPLUS, min(required, max_deficit))
+    plan["capped"] = round(deficit) != round(required)
+    plan["daily_caloric_deficit"] = int(round(deficit))
+    plan["daily_calories"] = int(round(tdee - deficit))
+    plan["weekly_change_kg"] = round(-deficit * 7 / KCAL_PER_KG, 2)
+
+    # Date the goal is reached at this pace (later than target_date when the deficit was capped)
+    if change and deficit and (change < 0) == (deficit > 0):
+        days_needed = abs(change) * KCAL_PER_KG / abs(deficit)
+        plan["projected_date"] = date.fromordinal(today.toordinal() + int(round(days_needed))).isoformat()
+
+    plan["bmr"] = int(round(plan["bmr"]))
+    plan["tdee"] = int(round(tdee))
+    plan["required_daily_deficit"] = int(round(required))
+    return plan
@@ -0,0 +1,201 @@
+import time
+import threading
+import functools
+import inspect
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+
+# Phases we split every request into. Anything not covered by one of these
+# (routing, Python-side reshaping in the services) shows up in "total" only.
+PHASES = ("auth", "db", "model", "serialization")
+
+# Latency buckets in seconds, tuned for a mix of ~10ms PostgREST reads and multi-second Gemini calls.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class RequestTimings:
+    """Accumulates phase durations for the request currently being served."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases: Dict[str, float] = {phase: 0.0 for phase in PHASES}
+        self.handler_end: Optional[float] = None
+        self.response_start: Optional[float] = None
+
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def mark_handler_end(self):
+        self.handler_end = time.perf_counter()
+
+    def mark_response_start(self):
+        self.response_start = time.perf_counter()
+        if self.handler_end is not None:
+            self.add("serialization", self.response_start - self.handler_end)
+
+    @property
+    def total(self) -> float:
+        end = self.response_start or time.perf_counter()
+        return end - self.start
+
+    def server_timing(self) -> str:
+        """Formats the phases as a Server-Timing header value (durations in ms)."""
+        entries = [f"{phase};dur={seconds * 1000:.1f}" for phase, seconds in self.phases.items()]
+        entries.append(f"total;dur={self.total * 1000:.1f}")
+        return ", ".join(entries)
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current_timings.get()
+
+
+@contextmanager
+def timed(phase: str):
+    """
+    Attributes the wrapped block to a phase of the current request.
+    Outside of a request (scripts, background jobs) this is a no-op.
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - started)
+
+
+class Histogram:
+    """Minimal thread-safe Prometheus histogram keyed by a tuple of label values."""
+
+    def __init__(self, name: str, description: str, label_names: Tuple[str, ...], buckets=BUCKETS):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, upper in enumerate(self.buckets):
+                if value <= upper:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, (counts, total, count) in sorted(self._series.items()):
+                label_str = ",".join(f'{k}="{v}"' for k, v in zip(self.label_names, labels))
+                for upper, bucket_count in zip(self.buckets, counts):
+                    lines.append(f'{self.name}_bucket{{{label_str},le="{upper}"}} {bucket_count}')
+                lines.append(f'{self.name}_bucket{{{label_str},le="+Inf"}} {count}')
+                lines.append(f"{self.name}_sum{{{label_str}}} {total}")
+                lines.append(f"{self.name}_count{{{label_str}}} {count}")
+        return lines
+
+
+request_duration = Histogram(
+    "http_request_duration_seconds",
+    "End-to-end request latency until the response starts.",
+    ("method", "route", "status"),
+)
+phase_duration = Histogram(
+    "http_request_phase_duration_seconds",
+    "Time spent per request in auth, db, model and serialization.",
+    ("method", "route", "phase"),
+)
+
+
+def render_metrics() -> str:
+    return "\n".join(request_duration.render() + phase_duration.render()) + "\n"
+
+
+class TimingMiddleware:
+    """
+    ASGI middleware that times every HTTP request, adds a Server-Timing header
+    and feeds the /metrics histograms.
+    """
+
+    def __init__(self, app, excluded_paths: Tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.excluded_paths = excluded_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        status = {"code": 500}
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                timings.mark_response_start()
+                MutableHeaders(scope=message).append("Server-Timing", timings.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_timings.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            request_duration.observe((method, route_path, str(status["code"])), timings.total)
+            for phase, seconds in timings.phases.items():
+                phase_duration.observe((method, route_path, phase), seconds)
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute that marks when the endpoint function returns, so the middleware
+    can attribute the remaining time (response_model validation + JSON encoding)
+    to the serialization phase.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _mark_handler_end(endpoint), **kwargs)
+
+
+def _mark_handler_end(call):
+    if getattr(call, "_marks_handler_end", False):
+        return call
+
+    if inspect.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                timings = _current_timings.get()
+                if timings is not None:
+                    timings.mark_handler_end()
+    else:
+        @functools.wraps(call)
+        def wrapper(*args, **kwargs):
+            try:
+                return call(*args, **kwargs)
+            finally:
+                timings = _current_timings.get()
+                if timings is not None:
+                    timings.mark_handler_end()
+
+    wrapper._marks_handler_end = True
+    return wrapper
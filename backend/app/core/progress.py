@@ -0,0 +1,104 @@
+import math
+import numpy as np
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+from app.core.metabolism import KCAL_PER_KG, compute_energy_plan
+
+# Goal progress from actual intake/burn.
+# Input is one row per day (see migrations/daily_energy.sql), so the work here is
+# a handful of vectorized passes over a days-long array, even for multi-year ranges.
+
+# The projection extrapolates the average balance of the most recent logged days
+TREND_WINDOW_DAYS = 28
+
+
+def _to_date(value) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def project_progress(goal, rows: List[dict], start: date, end: date) -> dict:
+    """
+    Computes the daily energy balance (intake - TDEE - exercise burn) over [start, end]
+    and projects the weight trajectory towards `goal.goal_weight`.
+
+    Days without any logged meal are treated as missing rather than as zero intake.
+    `goal.current_weight` is taken as the weight at `start`.
+    """
+    plan = compute_energy_plan(goal, today=end)
+    tdee = plan["tdee"]
+    if tdee is None:
+        raise ValueError("Goal needs current weight plus height and age (or body fat) to compute progress")
+
+    n_days = (end - start).days + 1
+    intake = np.zeros(n_days)
+    burnt = np.zeros(n_days)
+    if rows:
+        idx = np.array([(_to_date(r["day"]) - start).days for r in rows])
+        keep = (idx >= 0) & (idx < n_days)
+        intake[idx[keep]] = np.array([float(r["calories_in"] or 0) for r in rows])[keep]
+        burnt[idx[keep]] = np.array([float(r["calories_burnt"] or 0) for r in rows])[keep]
+
+    logged = intake > 0
+    balance = np.where(logged, intake - tdee - burnt, 0.0)
+    weight = goal.current_weight + np.cumsum(balance) / KCAL_PER_KG
+    current_weight = float(weight[-1])
+
+    logged_days = int(logged.sum())
+    if logged_days:
+        recent = balance[logged][-TREND_WINDOW_DAYS:]
+        avg_balance = float(recent.mean())
+    else:
+        # Nothing logged yet: assume the plan is followed
+        avg_balance = -float(plan["daily_caloric_deficit"])
+    daily_change = avg_balance / KCAL_PER_KG
+
+    projected_date = None
+    remaining = None
+    if goal.goal_weight is not None:
+        remaining = goal.goal_weight - current_weight
+        if abs(remaining) < 0.05:
+            projected_date = end
+        elif daily_change and (remaining > 0) == (daily_change > 0):
+            projected_date = end + timedelta(days=math.ceil(remaining / daily_change))
+
+    target = _to_date(goal.target_date)
+    projected_weight_at_target = None
+    on_track = None
+    if target and target >= end:
+        projected_weight_at_target = round(current_weight + daily_change * (target - end).days, 2)
+        on_track = projected_date is not None and projected_date <= target
+
+    series = [
+        {
+            "date": (start + timedelta(days=int(i))).isoformat(),
+            "calories_in": int(intake[i]),
+            "calories_burnt": round(float(burnt[i]), 1),
+            "balance": round(float(balance[i]), 1) if logged[i] else None,
+            "estimated_weight": round(float(weight[i]), 2),
+        }
+        for i in np.flatnonzero(logged | (burnt > 0))
+    ]
+
+    return {
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "tdee": tdee,
+        "logged_days": logged_days,
+        "total_balance": int(round(float(balance.sum()))),
+        "avg_daily_balance": int(round(avg_balance)),
+        "start_weight": goal.current_weight,
+        "estimated_weight": round(current_weight, 2),
+        "goal_weight": goal.goal_weight,
+        "remaining_kg": round(remaining, 2) if remaining is not None else None,
+        "target_date": target.isoformat() if target else None,
+        "projected_date": projected_date.isoformat() if projected_date else None,
+        "projected_weight_at_target": projected_weight_at_target,
+        "on_track": on_track,
+        "series": series,
+    }
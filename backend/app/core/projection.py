@@ -0,0 +1,36 @@
+from typing import List, Optional, Sequence, Type
+from fastapi import HTTPException, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# Sparse field projection for list endpoints (?fields=id,name,date&view=summary).
+# The services turn the requested fields into the PostgREST select, so unrequested
+# columns and nested rows are never read from the database.
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> Optional[List[str]]:
+    """Validates a comma-separated `fields` parameter. "id" is always included."""
+    if fields is None:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+    return ["id"] + [f for f in dict.fromkeys(requested) if f != "id"]
+
+
+def projected_response(rows: List[dict], model: Type[BaseModel], response: Response) -> JSONResponse:
+    """
+    Serializes projected rows with only the fields that were selected. `response` is the
+    route's injected Response: headers set on it by dependencies (ETag, Last-Modified,
+    Cache-Control from conditional()) are carried over, since FastAPI drops them when a
+    route returns its own Response.
+    """
+    projected = JSONResponse([
+        model.model_validate(row).model_dump(mode="json", by_alias=True, exclude_unset=True)
+        for row in rows
+    ])
+    projected.raw_headers.extend(h for h in response.raw_headers if h[0] != b"content-length")
+    return projected
@@ -0,0 +1,26 @@
+import json
+from typing import Any, AsyncIterator
+
+from fastapi.responses import StreamingResponse
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Encodes one Server-Sent Event. `data` is JSON-encoded so multi-line text stays on one line."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """
+    Wraps an async generator of formatted events in a streaming response.
+    When the client disconnects, Starlette cancels the generator, which closes
+    any ADK run it is iterating over.
+    """
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop reverse proxies (nginx) from buffering the stream
+            "X-Accel-Buffering": "no",
+        },
+    )
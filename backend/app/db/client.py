@@ -1,6 +1,12 @@
 import os
-from supabase import create_client, Client
+import threading
+import logging
+import httpx
+from typing import Callable, List
+from supabase import create_client, Client, ClientOptions
 from dotenv import load_dotenv
+from app.core.metrics import timed
+from app.db.query_log import timed_query
 
 load_dotenv()
 
@@ -11,7 +17,140 @@ key: str = os.environ.get("SUPABASE_SERVICE_ROLE_KEY") or os.environ.get("SUPABA
 if not url or not key:
     print("Warning: Missing SUPABASE_URL or SUPABASE_KEY/SERVICE_ROLE_KEY env vars")
 
-supabase: Client = create_client(url, key)
+logger = logging.getLogger(__name__)
+
+# HTTP transport tuning (per worker process)
+HTTP2_ENABLED = os.environ.get("SUPABASE_HTTP2", "True").lower() == "true"
+POOL_MAX_CONNECTIONS = int(os.environ.get("SUPABASE_POOL_MAX_CONNECTIONS", "20"))
+# Keep every pooled connection alive: a keep-alive cap below the concurrency level
+# makes the pool close and reopen connections under load (see benchmarks/connection_reuse.py).
+POOL_MAX_KEEPALIVE = int(os.environ.get("SUPABASE_POOL_MAX_KEEPALIVE", str(POOL_MAX_CONNECTIONS)))
+KEEPALIVE_EXPIRY = float(os.environ.get("SUPABASE_KEEPALIVE_EXPIRY", "30"))
+CONNECT_TIMEOUT = float(os.environ.get("SUPABASE_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.environ.get("SUPABASE_READ_TIMEOUT", "10"))
+WRITE_TIMEOUT = float(os.environ.get("SUPABASE_WRITE_TIMEOUT", "10"))
+POOL_TIMEOUT = float(os.environ.get("SUPABASE_POOL_TIMEOUT", "5"))
+# PostgREST truncates every response at max-rows (1000 on Supabase by default) without
+# an error. Keep this at or below max-rows: a shorter page is read as the last one.
+PAGE_SIZE = int(os.environ.get("SUPABASE_PAGE_SIZE", "1000"))
+
+
+class TimedQuery:
+    """
+    Wraps a PostgREST request builder so that `.execute()` is attributed to the
+    "db" phase of the current request and recorded in its query log.
+    Every builder returned by a chained call (`.select()`, `.eq()`, `.single()`, ...)
+    is wrapped again.
+    """
+
+    def __init__(self, builder, table: str):
+        self._builder = builder
+        self._table = table
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if not callable(attr):
+            return self._wrap(attr)
+
+        def call(*args, **kwargs):
+            return self._wrap(attr(*args, **kwargs))
+        return call
+
+    def _wrap(self, result):
+        if hasattr(result, "execute") and hasattr(result, "request"):
+            return TimedQuery(result, self._table)
+        return result
+
+    def execute(self):
+        with timed("db"), timed_query(self._table, self._builder.request):
+            return self._builder.execute()
+
+
+class TimedClient:
+    """Thin proxy over the Supabase client that times and logs every table query."""
+
+    def __init__(self, client: Client):
+        self._client = client
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def table(self, table_name: str) -> TimedQuery:
+        return TimedQuery(self._client.table(table_name), table_name)
+
+    def rpc(self, fn: str, *args, **kwargs) -> TimedQuery:
+        return TimedQuery(self._client.rpc(fn, *args, **kwargs), f"rpc:{fn}")
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def build_http_client(http2: bool = HTTP2_ENABLED) -> httpx.Client:
+    """
+    Pooled transport shared by PostgREST and Auth calls.
+    HTTP/2 lets concurrent queries multiplex over one TLS connection to Supabase.
+    """
+    if http2 and not _http2_available():
+        logger.warning("SUPABASE_HTTP2 is enabled but the 'h2' package is missing; falling back to HTTP/1.1")
+        http2 = False
+
+    return httpx.Client(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=POOL_MAX_KEEPALIVE,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            connect=CONNECT_TIMEOUT,
+            read=READ_TIMEOUT,
+            write=WRITE_TIMEOUT,
+            pool=POOL_TIMEOUT,
+        ),
+    )
+
+
+# One client per worker process. It is built lazily so that uvicorn/gunicorn
+# workers forked from a preloaded parent never share the parent's sockets.
+_client: TimedClient = None
+_client_lock = threading.Lock()
+
+
+def _reset_after_fork():
+    global _client, _client_lock
+    _client = None
+    _client_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
 
 def get_supabase() -> Client:
-    return supabase
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                options = ClientOptions(httpx_client=build_http_client())
+                _client = TimedClient(create_client(url, key, options=options))
+    return _client
+
+
+def select_all(build_query: Callable, page_size: int = None) -> List[dict]:
+    """
+    Every row of a select that may be longer than max-rows, read in pages.
+    `build_query` returns a fresh builder ordered on a unique column, so pages do not overlap.
+    """
+    page_size = page_size or PAGE_SIZE
+    rows, start = [], 0
+    while True:
+        page = build_query().range(start, start + page_size - 1).execute().data
+        rows.extend(page)
+        if len(page) < page_size:
+            return rows
+        start += page_size
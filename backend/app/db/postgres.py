@@ -0,0 +1,222 @@
+import os
+import json
+import uuid
+import asyncio
+import logging
+from datetime import date as date_type
+from decimal import Decimal
+from typing import List, Optional
+
+from app.core.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+# Hot reads can bypass PostgREST and go straight to Postgres over an asyncpg pool.
+# DB_BACKEND=postgres enables it; writes always go through Supabase.
+DB_BACKEND = os.environ.get("DB_BACKEND", "supabase").lower()
+DATABASE_URL = os.environ.get("DATABASE_URL")
+PG_POOL_MIN_SIZE = int(os.environ.get("PG_POOL_MIN_SIZE", "1"))
+PG_POOL_MAX_SIZE = int(os.environ.get("PG_POOL_MAX_SIZE", "10"))
+PG_COMMAND_TIMEOUT = float(os.environ.get("PG_COMMAND_TIMEOUT", "10"))
+
+
+def postgres_enabled() -> bool:
+    return DB_BACKEND == "postgres"
+
+
+# --- Queries ---
+# Each query builds the response shape in SQL (json_build_object/json_agg), so rows
+# come back ready for the Pydantic response models without Python-side remapping.
+# asyncpg prepares every statement on first use and caches it per connection.
+
+_EXERCISES_JSON = """
+    coalesce((
+        select json_agg(json_build_object(
+            'id', e.id,
+            'name', e.name,
+            'muscleGroup', e.muscle_group,
+            'workout_exercise_id', we.id,
+            'sets', coalesce((
+                select json_agg(to_json(s) order by s.set_order)
+                from public.sets s
+                where s.workout_exercise_id = we.id
+            ), '[]'::json)
+        ) order by we.order_index)
+        from public.workout_exercises we
+        join public.exercises e on e.id = we.exercise_id
+        where we.workout_id = w.id
+    ), '[]'::json) as exercises
+"""
+
+WORKOUT_LIST_SQL = f"""
+    select w.*, {_EXERCISES_JSON}
+    from public.workouts w
+    where w.user_id = $1
+    order by w.date desc
+"""
+
+WORKOUT_COMPACT_LIST_SQL = """
+    select w.id, w.name, w.date, w.duration_minutes,
+           w.exercise_count, w.set_count, w.total_volume, w.cardio_calories
+    from public.workouts w
+    where w.user_id = $1
+    order by w.date desc
+"""
+
+WORKOUT_BY_ID_SQL = f"""
+    select w.*, {_EXERCISES_JSON}
+    from public.workouts w
+    where w.id = $1
+"""
+
+LAST_PERFORMANCE_SQL = """
+    select names.name as exercise_name, latest.date, latest.sets
+    from unnest($2::text[]) with ordinality as names(name, position)
+    left join lateral (
+        select w.date,
+               coalesce((
+                   select json_agg(json_build_object(
+                       'weight', s.weight, 'reps', s.reps, 'speed', s.speed,
+                       'incline', s.incline, 'time_seconds', s.time_seconds,
+                       'calories_burnt', s.calories_burnt, 'steps', s.steps,
+                       'set_order', s.set_order
+                   ) order by s.set_order)
+                   from public.sets s
+                   where s.workout_exercise_id = we.id
+               ), '[]'::json) as sets
+        from public.workouts w
+        join public.workout_exercises we on we.workout_id = w.id
+        join public.exercises e on e.id = we.exercise_id
+        where w.user_id = $1 and e.name = names.name
+        order by w.date desc
+        limit 1
+    ) latest on true
+    order by names.position
+"""
+
+MEALS_BY_DATE_SQL = """
+    select m.*,
+           coalesce((
+               select json_agg(to_json(f) order by f.created_at)
+               from public.food_items f
+               where f.meal_id = m.id
+           ), '[]'::json) as items
+    from public.meals m
+    where m.user_id = $1 and m.date = $2::date
+    order by m.created_at
+"""
+
+MEALS_BY_RANGE_SQL = """
+    select m.*,
+           coalesce((
+               select json_agg(to_json(f) order by f.created_at)
+               from public.food_items f
+               where f.meal_id = m.id
+           ), '[]'::json) as items
+    from public.meals m
+    where m.user_id = $1 and m.date between $2::date and $3::date
+    order by m.date, m.created_at
+"""
+
+MEALS_BY_RANGE_NO_ITEMS_SQL = """
+    select m.*
+    from public.meals m
+    where m.user_id = $1 and m.date between $2::date and $3::date
+    order by m.date, m.created_at
+"""
+
+
+# --- Pool ---
+
+_pool = None
+_pool_lock: Optional[asyncio.Lock] = None
+
+
+async def _init_connection(conn):
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+
+async def get_pool():
+    """Creates the asyncpg pool on first use, inside the worker's event loop."""
+    global _pool, _pool_lock
+    if _pool is not None:
+        return _pool
+
+    if _pool_lock is None:
+        _pool_lock = asyncio.Lock()
+    async with _pool_lock:
+        if _pool is None:
+            try:
+                import asyncpg
+            except ImportError as e:
+                raise RuntimeError("DB_BACKEND=postgres requires the 'asyncpg' package") from e
+            if not DATABASE_URL:
+                raise RuntimeError("DB_BACKEND=postgres requires DATABASE_URL")
+
+            _pool = await asyncpg.create_pool(
+                DATABASE_URL,
+                min_size=PG_POOL_MIN_SIZE,
+                max_size=PG_POOL_MAX_SIZE,
+                command_timeout=PG_COMMAND_TIMEOUT,
+                init=_init_connection,
+            )
+            logger.info(f"Postgres pool ready (min={PG_POOL_MIN_SIZE}, max={PG_POOL_MAX_SIZE})")
+    return _pool
+
+
+async def close_pool():
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+async def _fetch(sql: str, *args) -> List[dict]:
+    pool = await get_pool()
+    with timed("db"):
+        rows = await pool.fetch(sql, *args)
+    return [dict(row) for row in rows]
+
+
+# --- Repository ---
+
+def _jsonable_row(row: dict) -> dict:
+    """Top-level columns come back as native types; match PostgREST's JSON for uuid and numeric."""
+    shaped = {}
+    for k, v in row.items():
+        if isinstance(v, uuid.UUID):
+            v = str(v)
+        elif isinstance(v, Decimal):
+            v = float(v)
+        shaped[k] = v
+    return shaped
+
+
+async def fetch_workouts(user_id: str) -> List[dict]:
+    return [_jsonable_row(r) for r in await _fetch(WORKOUT_LIST_SQL, user_id)]
+
+
+async def fetch_compact_workouts(user_id: str) -> List[dict]:
+    return [_jsonable_row(r) for r in await _fetch(WORKOUT_COMPACT_LIST_SQL, user_id)]
+
+
+async def fetch_workout_by_id(workout_id: str) -> Optional[dict]:
+    rows = await _fetch(WORKOUT_BY_ID_SQL, workout_id)
+    return _jsonable_row(rows[0]) if rows else None
+
+
+async def fetch_last_sets(user_id: str, exercise_names: List[str]) -> List[dict]:
+    """One row per requested name: {exercise_name, date (or None), sets ordered by set_order}."""
+    return await _fetch(LAST_PERFORMANCE_SQL, user_id, list(exercise_names))
+
+
+async def fetch_meals_by_date(user_id: str, date: str) -> List[dict]:
+    day = date_type.fromisoformat(date[:10])
+    return [_jsonable_row(r) for r in await _fetch(MEALS_BY_DATE_SQL, user_id, day)]
+
+
+async def fetch_meals_by_range(user_id: str, start: str, end: str, include_items: bool = True) -> List[dict]:
+    sql = MEALS_BY_RANGE_SQL if include_items else MEALS_BY_RANGE_NO_ITEMS_SQL
+    rows = await _fetch(sql, user_id, date_type.fromisoformat(start), date_type.fromisoformat(end))
+    return [_jsonable_row(r) for r in rows]
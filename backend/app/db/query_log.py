@@ -0,0 +1,132 @@
+import os
+import time
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Flag a request once it issues more queries than this.
+QUERY_COUNT_THRESHOLD = int(os.environ.get("QUERY_COUNT_THRESHOLD", "10"))
+# Flag a request once the same query shape (table + method + filter columns) repeats this often.
+REPEATED_QUERY_THRESHOLD = int(os.environ.get("REPEATED_QUERY_THRESHOLD", "3"))
+# In test mode, flagged requests raise instead of only logging.
+QUERY_ASSERT = os.environ.get("QUERY_ASSERT", "False").lower() == "true"
+
+
+class NPlusOneError(AssertionError):
+    """Raised in test mode when a request exceeds the query budget or loops over one query shape."""
+
+
+class QueryRecord:
+    def __init__(self, table: str, method: str, params, duration: float):
+        self.table = table
+        self.method = method
+        self.select = params.get("select")
+        # Keep the filters readable in logs, but strip values for the shape so
+        # `.eq("name", "Squat")` and `.eq("name", "Bench")` count as the same query.
+        self.filters = [(k, v) for k, v in params.multi_items() if k != "select"]
+        self.shape = (
+            method,
+            table,
+            self.select,
+            tuple(sorted((k, v.split(".", 1)[0]) for k, v in self.filters)),
+        )
+        self.duration = duration
+
+    def describe(self) -> str:
+        filters = "&".join(f"{k}={v}" for k, v in self.filters) or "-"
+        return f"{self.method} {self.table} [{filters}] {self.duration * 1000:.1f}ms"
+
+
+class QueryLog:
+    """Queries issued within one request (or one `track_queries` block)."""
+
+    def __init__(self, label: str, max_queries: int = QUERY_COUNT_THRESHOLD, max_repeats: int = REPEATED_QUERY_THRESHOLD):
+        self.label = label
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.records: List[QueryRecord] = []
+
+    def add(self, record: QueryRecord):
+        self.records.append(record)
+        logger.debug(f"[{self.label}] query #{len(self.records)}: {record.describe()}")
+
+    @property
+    def total_duration(self) -> float:
+        return sum(r.duration for r in self.records)
+
+    def problems(self) -> List[str]:
+        problems = []
+        if len(self.records) > self.max_queries:
+            problems.append(f"{len(self.records)} queries (threshold {self.max_queries})")
+
+        shapes = Counter(r.shape for r in self.records)
+        for shape, count in shapes.items():
+            if count >= self.max_repeats:
+                method, table, _, filters = shape
+                columns = ",".join(col for col, _ in filters) or "-"
+                problems.append(f"{method} {table} by ({columns}) repeated {count}x")
+        return problems
+
+    def check(self, strict: bool = QUERY_ASSERT):
+        problems = self.problems()
+        if not problems:
+            return
+        summary = f"[{self.label}] possible N+1: " + "; ".join(problems)
+        logger.warning(f"{summary} ({self.total_duration * 1000:.1f}ms in db)")
+        if strict:
+            raise NPlusOneError(summary)
+
+
+_current_log: ContextVar[Optional[QueryLog]] = ContextVar("query_log", default=None)
+
+
+def record_query(table: str, method: str, params, duration: float):
+    log = _current_log.get()
+    if log is not None:
+        log.add(QueryRecord(table, method, params, duration))
+
+
+@contextmanager
+def track_queries(label: str = "block", strict: bool = QUERY_ASSERT, **thresholds):
+    """
+    Collects every query issued inside the block and flags N+1 patterns on exit.
+
+        with track_queries("create_workout", strict=True, max_queries=5):
+            await WorkoutService.create_workout(user_id, payload)
+    """
+    log = QueryLog(label, **thresholds)
+    token = _current_log.set(log)
+    try:
+        yield log
+    finally:
+        _current_log.reset(token)
+    log.check(strict=strict)
+
+
+class QueryLogMiddleware:
+    """ASGI middleware that runs each HTTP request inside `track_queries`."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries(f"{scope['method']} {scope['path']}"):
+            await self.app(scope, receive, send)
+
+
+@contextmanager
+def timed_query(table: str, request):
+    """Times one `.execute()` and records it in the current query log."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_query(table, request.http_method, request.params, time.perf_counter() - started)
@@ -29,14 +29,36 @@ if os.name == 'nt':
         print(f"Warning: Failed to patch pywin32 paths: {e}")
 # ------------------------------------------------------------------------
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import workouts, diet, templates, goals, agents
+from fastapi.responses import PlainTextResponse
+from app.routers import workouts, diet, templates, goals, agents, sync, dashboard, exercises
+from app.core.metrics import TimingMiddleware, render_metrics
+from app.core.compression import CompressionMiddleware
+from app.db.query_log import QueryLogMiddleware
+from app.agents.loader import preload_agents_in_background
+from app.db import postgres
+from app.core.jobs import job_queue
+
+# The ADK/GenAI stack is imported lazily by the agent routes. Set AGENTS_PRELOAD=true
+# to warm it in a background thread right after startup instead.
+AGENTS_PRELOAD = os.environ.get("AGENTS_PRELOAD", "False").lower() == "true"
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if AGENTS_PRELOAD:
+        preload_agents_in_background()
+    await job_queue.start()
+    yield
+    await job_queue.stop()
+    await postgres.close_pool()
 
 app = FastAPI(
     title="TheCutRoute API",
     description="Backend for Fitness Tracker Application",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # CORS configuration
@@ -53,13 +75,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "ETag", "Last-Modified", "Idempotent-Replayed"],
 )
 
+# Counts and times every Supabase query per request, warns on N+1 patterns
+app.add_middleware(QueryLogMiddleware)
+
+# Negotiated brotli/gzip for responses above COMPRESSION_MIN_SIZE (SSE excluded)
+app.add_middleware(CompressionMiddleware)
+
+# Per-route latency split into auth/db/model/serialization (Server-Timing + /metrics)
+app.add_middleware(TimingMiddleware)
+
 app.include_router(workouts.router)
 app.include_router(diet.router)
 app.include_router(templates.router)
 app.include_router(goals.router)
 app.include_router(agents.router)
+app.include_router(sync.router)
+app.include_router(dashboard.router)
+app.include_router(exercises.router)
 
 @app.get("/")
 async def root():
@@ -68,3 +103,8 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition of the request timing histograms."""
+    return render_metrics()
@@ -0,0 +1,68 @@
+import asyncio
+import argparse
+import time
+from datetime import date as date_type
+from app.agents.loader import load_agents
+from app.core.cost import cost_controller
+from app.services.review_service import ReviewService
+
+# Batch pre-generation of daily reviews.
+# Run it off-peak (e.g. from cron before the evening rush) so that most
+# /agents/review/day calls become a cache read:
+#
+#   python -m app.review_scheduler --date 2026-01-31 --concurrency 4
+#
+# Only users with workouts/meals newer than their stored review are processed,
+# and the run stops once the CostController budget is exhausted.
+
+async def run_batch(day: str, concurrency: int = 4, dry_run: bool = False) -> dict:
+    load_agents()
+    from app.agents.daily_review import generate_section_review, _is_cacheable
+
+    stale = await ReviewService.find_stale(day)
+    print(f"{len(stale)} section reviews to generate for {day}")
+    if dry_run:
+        for user_id, section, _ in stale:
+            print(f"  {user_id} {section}")
+        return {"pending": len(stale), "generated": 0, "failed": 0, "skipped": 0}
+
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = {"pending": len(stale), "generated": 0, "failed": 0, "skipped": 0}
+
+    async def worker(user_id: str, section: str, marker: str):
+        async with semaphore:
+            # Reserved before the run starts, so concurrent runs cannot overshoot the budget
+            allowed, reason = cost_controller.reserve()
+            if not allowed:
+                stats["skipped"] += 1
+                return
+            try:
+                review = await generate_section_review(user_id, day, section, marker)
+                # Agents report most failures as text ("Error running agent..."), which is not cached either
+                succeeded = _is_cacheable(review)
+            except Exception as e:
+                review, succeeded = str(e), False
+            if succeeded:
+                stats["generated"] += 1
+            else:
+                cost_controller.release()
+                print(f"Failed {section} review for {user_id}: {review}")
+                stats["failed"] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(*item) for item in stale))
+    elapsed = time.perf_counter() - started
+
+    if stats["skipped"]:
+        print(f"Budget exhausted: {cost_controller.can_proceed()[1]}. {stats['skipped']} reviews left for on-demand generation.")
+    print(f"Generated {stats['generated']} reviews ({stats['failed']} failed) in {elapsed:.1f}s")
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-generate daily AI reviews for users with new data.")
+    parser.add_argument("--date", default=date_type.today().isoformat(), help="Day to review (YYYY-MM-DD), defaults to today")
+    parser.add_argument("--concurrency", type=int, default=4, help="Reviews generated in parallel")
+    parser.add_argument("--dry-run", action="store_true", help="Only list the reviews that would be generated")
+    args = parser.parse_args()
+
+    asyncio.run(run_batch(args.date, args.concurrency, args.dry_run))
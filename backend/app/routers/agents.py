@@ -1,33 +1,154 @@
 
 from fastapi import APIRouter, Depends, Query, HTTPException
 from app.auth import get_current_user
-from typing import Any, Optional
-from datetime import date
-from app.agents.activity_agent import review_activity
-from app.agents.diet_agent import review_diet, search_and_retrieve_food
+from app.core.metrics import TimedRoute
+from typing import Any, Literal, Optional
+from datetime import date, timedelta
+from app.agents.loader import ensure_agents_loaded
+from app.core.sse import format_sse, sse_response
+from app.core.jobs import job_queue
+from app.services.review_service import REVIEW_PERIOD_MAX_DAYS
+from app.schemas.diet import FoodParseRequest, ParsedMeal
+from fastapi.responses import JSONResponse
 
 router = APIRouter(
     prefix="/agents",
-    tags=["agents"]
+    tags=["agents"],
+    route_class=TimedRoute
 )
 
+async def _review_day(user_id: str, date: str, section: str) -> dict:
+    await ensure_agents_loaded()
+    from app.agents.daily_review import get_day_review
+
+    sections = ["activity", "diet"] if section == "all" else [section]
+    return await get_day_review(str(user_id), date, sections)
+
+async def _review_day_job(payload: dict) -> dict:
+    return await _review_day(payload["user_id"], payload["date"], payload["section"])
+
+job_queue.register("review_day", _review_day_job)
+
 @router.post("/review/day")
-async def review_day(date: str = Query(..., description="YYYY-MM-DD"), section: str = Query("all"), user: Any = Depends(get_current_user)):
+async def review_day(
+    date: str = Query(..., description="YYYY-MM-DD"),
+    section: str = Query("all"),
+    run_async: bool = Query(False, alias="async", description="Queue the review and return a job id"),
+    user: Any = Depends(get_current_user)
+):
     """
     Triggers the Agents to review the specific date.
     section: 'activity', 'diet', or 'all'
+    With async=true the review runs on the background job queue; poll /agents/jobs/{job_id}.
+    """
+    if run_async:
+        job = await job_queue.submit(
+            "review_day",
+            {"user_id": str(user.id), "date": date, "section": section},
+            user_id=str(user.id)
+        )
+        return JSONResponse(status_code=202, content={"job_id": job["id"], "status": job["status"]})
+
+    return await _review_day(user.id, date, section)
+
+def _period_range(period: str, day: Optional[date], start: Optional[date], end: Optional[date]):
+    if start or end:
+        if not (start and end):
+            raise HTTPException(status_code=400, detail="Pass both 'from' and 'to'")
+        if start > end:
+            raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+        if (end - start).days + 1 > REVIEW_PERIOD_MAX_DAYS:
+            raise HTTPException(status_code=400, detail=f"Date range is limited to {REVIEW_PERIOD_MAX_DAYS} days")
+        return start, end
+
+    day = day or date.today()
+    if period == "week":
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=6)
+    start = day.replace(day=1)
+    next_month = (start + timedelta(days=32)).replace(day=1)
+    return start, next_month - timedelta(days=1)
+
+async def _review_period(user_id: str, start: str, end: str) -> dict:
+    await ensure_agents_loaded()
+    from app.agents.period_review import review_period
+
+    return await review_period(str(user_id), date.fromisoformat(start), date.fromisoformat(end))
+
+async def _review_period_job(payload: dict) -> dict:
+    return await _review_period(payload["user_id"], payload["from"], payload["to"])
+
+job_queue.register("review_period", _review_period_job)
+
+@router.post("/review/period")
+async def review_period(
+    period: Literal["week", "month"] = Query("week"),
+    day: Optional[date] = Query(None, alias="date", description="YYYY-MM-DD inside the week/month, defaults to today"),
+    start: Optional[date] = Query(None, alias="from", description="YYYY-MM-DD, custom range instead of week/month"),
+    end: Optional[date] = Query(None, alias="to", description="YYYY-MM-DD"),
+    run_async: bool = Query(False, alias="async", description="Queue the review and return a job id"),
+    user: Any = Depends(get_current_user)
+):
+    """
+    Reviews a whole week (Monday to Sunday), calendar month or custom range in one model call.
+    Days are summarized locally first, so the prompt stays small however long the range is.
     """
-    results = {}
-    
+    start, end = _period_range(period, day, start, end)
+    if run_async:
+        job = await job_queue.submit(
+            "review_period",
+            {"user_id": str(user.id), "from": start.isoformat(), "to": end.isoformat()},
+            user_id=str(user.id)
+        )
+        return JSONResponse(status_code=202, content={"job_id": job["id"], "status": job["status"]})
+
+    return await _review_period(user.id, start.isoformat(), end.isoformat())
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, user: Any = Depends(get_current_user)):
+    """Returns the status of a queued agent job and, once done, its result."""
+    job = await job_queue.get(job_id)
+    if not job or job["user_id"] != str(user.id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {
+        "job_id": job["id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "result": job["result"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"]
+    }
+
+@router.post("/review/day/stream")
+async def review_day_stream(date: str = Query(..., description="YYYY-MM-DD"), section: str = Query("all"), user: Any = Depends(get_current_user)):
+    """
+    Streaming variant of /review/day over Server-Sent Events.
+    Emits `delta` events ({section, text}) as the model generates, a `section_done`
+    event per section, and a final `done` event.
+    """
+    await ensure_agents_loaded()
+    from app.agents.activity_agent import stream_activity_review
+    from app.agents.diet_agent import stream_diet_review, REVIEW_UNAVAILABLE_MESSAGE
+
+    streams = []
     if section in ["all", "activity"]:
-        activity_review = await review_activity(user.id, date)
-        results["activity"] = activity_review
-        
+        streams.append(("activity", stream_activity_review))
     if section in ["all", "diet"]:
-        diet_review = await review_diet(user.id, date)
-        results["diet"] = diet_review
-        
-    return results
+        streams.append(("diet", stream_diet_review))
+
+    async def events():
+        for name, stream in streams:
+            try:
+                async for text in stream(user.id, date):
+                    yield format_sse("delta", {"section": name, "text": text})
+            except Exception as e:
+                fallback = REVIEW_UNAVAILABLE_MESSAGE if name == "diet" else f"Error running agent: {str(e)}"
+                yield format_sse("error", {"section": name, "text": fallback})
+            yield format_sse("section_done", {"section": name})
+        yield format_sse("done", {})
+
+    return sse_response(events())
 
 @router.get("/food/search")
 async def search_food(query: str, user: Any = Depends(get_current_user)):
@@ -37,6 +158,23 @@ async def search_food(query: str, user: Any = Depends(get_current_user)):
     """
     if not query:
         raise HTTPException(status_code=400, detail="Query required")
-        
+
+    await ensure_agents_loaded()
+    from app.agents.diet_agent import search_and_retrieve_food
+
     result = await search_and_retrieve_food(query)
     return result
+
+@router.post("/food/parse", response_model=ParsedMeal)
+async def parse_food(body: FoodParseRequest, user: Any = Depends(get_current_user)):
+    """
+    Parses a free-text meal ("2 eggs, toast with butter, black coffee") into food items.
+    All items are looked up in one DB query; foods neither the DB nor the food cache
+    know are estimated together in a single model call.
+    """
+    await ensure_agents_loaded()
+    from app.agents.diet_agent import parse_food_text, split_food_text
+
+    if not split_food_text(body.text):
+        raise HTTPException(status_code=400, detail="No food items found in text")
+    return await parse_food_text(body.text)
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Query
+from app.services.dashboard_service import DashboardService
+from app.auth import get_current_user
+from app.core.metrics import TimedRoute
+from typing import Any, Optional
+from datetime import date
+
+router = APIRouter(
+    prefix="/dashboard",
+    tags=["dashboard"],
+    route_class=TimedRoute
+)
+
+@router.get("")
+async def get_dashboard(
+    day: Optional[date] = Query(None, alias="date", description="The client's local day (YYYY-MM-DD), defaults to today"),
+    user: Any = Depends(get_current_user)
+):
+    """
+    One compact payload for the dashboard: today's nutrition and training totals, goal
+    targets, recent workout summaries, week-over-week stats, weekly volume and the streak.
+    """
+    return await DashboardService.get_dashboard(str(user.id), day or date.today())
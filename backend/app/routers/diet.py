@@ -1,23 +1,51 @@
-from fastapi import APIRouter, Depends
-from app.schemas.diet import Meal, MealCreate, FoodItem
-from app.services.diet_service import DietService
-from typing import List, Any
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from app.schemas.diet import Meal, MealCreate, FoodItem, MealDay
+from app.services.diet_service import DietService, MEALS_MAX_RANGE_DAYS
+from typing import List, Any, Optional, Union
+from datetime import date as date_type
 from app.auth import get_current_user
+from app.core.metrics import TimedRoute
+from app.core.etag import conditional, MEALS
+from app.core.idempotency import idempotency_key, idempotency_store
 
 router = APIRouter(
     prefix="/meals",
-    tags=["meals"]
+    tags=["meals"],
+    route_class=TimedRoute
 )
 
-@router.get("/", response_model=List[Meal])
-async def get_meals(date: str, user: Any = Depends(get_current_user)):
-    # Date format YYYY-MM-DD
-    return await DietService.get_meals_by_date(user.id, date)
+@router.get("/", response_model=Union[List[Meal], List[MealDay]], dependencies=[Depends(conditional(MEALS))])
+async def get_meals(
+    date: Optional[str] = Query(None, description="YYYY-MM-DD; returns that day's meals"),
+    start: Optional[date_type] = Query(None, alias="from", description="YYYY-MM-DD; with `to`, returns meals grouped by day"),
+    end: Optional[date_type] = Query(None, alias="to"),
+    items: bool = Query(True, description="Include food items (range mode)"),
+    user: Any = Depends(get_current_user)
+):
+    if date:
+        # Date format YYYY-MM-DD
+        return await DietService.get_meals_by_date(user.id, date)
+
+    if not start or not end:
+        raise HTTPException(status_code=400, detail="Pass either 'date' or both 'from' and 'to'")
+    if start > end:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    if (end - start).days + 1 > MEALS_MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range is limited to {MEALS_MAX_RANGE_DAYS} days")
+    return await DietService.get_meals_by_range(user.id, start.isoformat(), end.isoformat(), items)
 
 @router.post("/", response_model=Meal)
-async def log_meal(meal: MealCreate, user: Any = Depends(get_current_user)):
-    return await DietService.create_meal(user.id, meal)
+async def log_meal(
+    meal: MealCreate,
+    response: Response,
+    key: Optional[str] = Depends(idempotency_key),
+    user: Any = Depends(get_current_user)
+):
+    return await idempotency_store.run(
+        response, user.id, "meals.create", key, meal,
+        lambda: DietService.create_meal(user.id, meal)
+    )
 
-@router.get("/recent-foods", response_model=List[FoodItem])
+@router.get("/recent-foods", response_model=List[FoodItem], dependencies=[Depends(conditional(MEALS))])
 async def get_recent_foods(user: Any = Depends(get_current_user)):
     return await DietService.get_recent_foods(user.id)
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Query
+from app.schemas.workout import Exercise, MuscleGroup
+from app.services.exercise_service import ExerciseService
+from app.auth import get_current_user
+from app.core.metrics import TimedRoute
+from typing import List, Any, Optional
+
+router = APIRouter(
+    prefix="/exercises",
+    tags=["exercises"],
+    route_class=TimedRoute
+)
+
+@router.get("/search", response_model=List[Exercise])
+async def search_exercises(
+    q: str = Query(..., min_length=1, description="Name prefix, e.g. 'inc db' or 'chest'"),
+    muscle_group: Optional[MuscleGroup] = Query(None, alias="muscleGroup"),
+    limit: int = Query(10, ge=1, le=50),
+    user: Any = Depends(get_current_user)
+):
+    """
+    Autocomplete over the exercise catalog, answered from an in-memory prefix index.
+    Pick an existing exercise instead of sending a new free-text name to POST /workouts/.
+    """
+    return await ExerciseService.search(q, muscle_group.value if muscle_group else None, limit)
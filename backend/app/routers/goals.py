@@ -1,23 +1,56 @@
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from app.schemas.goal import Goal, GoalCreate
-from app.services.goal_service import GoalService
+from app.services.goal_service import GoalService, PROGRESS_MAX_RANGE_DAYS
 from app.auth import get_current_user
-from typing import Any
-from app.agents.goal_agent import analyze_goal # Logic to be implemented
+from app.core.metrics import TimedRoute
+from app.core.etag import conditional, GOALS
+from app.core.progress import project_progress
+from typing import Any, Optional
+from datetime import date, timedelta
+from app.agents.loader import ensure_agents_loaded
+from app.core.sse import format_sse, sse_response
 
 router = APIRouter(
     prefix="/goals",
-    tags=["goals"]
+    tags=["goals"],
+    route_class=TimedRoute
 )
 
-@router.get("/", response_model=Goal)
+@router.get("/", response_model=Goal, dependencies=[Depends(conditional(GOALS))])
 async def get_goal(user: Any = Depends(get_current_user)):
     goal = await GoalService.get_goal(user.id)
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
     return goal
 
+@router.get("/progress")
+async def get_goal_progress(
+    start: Optional[date] = Query(None, alias="from", description="YYYY-MM-DD, defaults to when the goal was set"),
+    end: Optional[date] = Query(None, alias="to", description="YYYY-MM-DD, defaults to today"),
+    user: Any = Depends(get_current_user)
+):
+    """
+    Actual daily energy balance over the range and the projected date the goal weight is reached.
+    """
+    goal = await GoalService.get_goal(user.id)
+    if not goal:
+        raise HTTPException(status_code=404, detail="Goal not found")
+
+    end = end or date.today()
+    if start is None:
+        start = max(date.fromisoformat(goal["created_at"][:10]), end - timedelta(days=PROGRESS_MAX_RANGE_DAYS - 1))
+    if start > end:
+        raise HTTPException(status_code=400, detail="'from' must be before 'to'")
+    if (end - start).days + 1 > PROGRESS_MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range is limited to {PROGRESS_MAX_RANGE_DAYS} days")
+
+    rows = await GoalService.get_daily_energy(user.id, start.isoformat(), end.isoformat())
+    try:
+        return project_progress(GoalCreate(**goal), rows, start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.post("/", response_model=Goal)
 async def create_or_update_goal(goal: GoalCreate, user: Any = Depends(get_current_user)):
     return await GoalService.create_goal(user.id, goal)
@@ -25,8 +58,34 @@ async def create_or_update_goal(goal: GoalCreate, user: Any = Depends(get_curren
 @router.post("/analyze")
 async def analyze_goal_endpoint(goal_input: GoalCreate, user: Any = Depends(get_current_user)):
     """
-    Calls the ADK Agent to analyze the goal and suggest a deficit.
-    Returns the Agent's response (Markdown + Structured Deficit).
+    Computes the calorie plan locally and asks the ADK Agent for the coaching analysis.
+    Returns the plan numbers (`metrics`, deficit, calories) plus the Markdown analysis.
     """
+    await ensure_agents_loaded()
+    from app.agents.goal_agent import analyze_goal
+
     analysis = await analyze_goal(goal_input)
     return analysis
+
+@router.post("/analyze/stream")
+async def analyze_goal_stream(goal_input: GoalCreate, user: Any = Depends(get_current_user)):
+    """
+    Streaming variant of /analyze over Server-Sent Events.
+    Emits a `metrics` event with the calculated plan first, then the coaching
+    prose as `delta` events, then `done` (or `error` if the model fails).
+    """
+    await ensure_agents_loaded()
+    from app.agents.goal_agent import stream_goal_analysis
+
+    async def events():
+        try:
+            async for chunk in stream_goal_analysis(goal_input):
+                if "plan" in chunk:
+                    yield format_sse("metrics", chunk["plan"])
+                else:
+                    yield format_sse("delta", {"text": chunk["text"]})
+        except Exception:
+            yield format_sse("error", {"text": "AI analysis is unavailable right now."})
+        yield format_sse("done", {})
+
+    return sse_response(events())
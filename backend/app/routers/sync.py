@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.schemas.sync import SyncResponse
+from app.services.sync_service import SyncService
+from app.auth import get_current_user
+from app.core.metrics import TimedRoute
+from app.core.etag import conditional, WORKOUTS, MEALS, TEMPLATES, GOALS
+from typing import Any, Optional
+
+router = APIRouter(
+    prefix="/sync",
+    tags=["sync"],
+    route_class=TimedRoute
+)
+
+@router.get("", response_model=SyncResponse, dependencies=[Depends(conditional(WORKOUTS, MEALS, TEMPLATES, GOALS))])
+async def sync(
+    since: Optional[str] = Query(None, description="Cursor from the previous sync; omit for a full sync"),
+    user: Any = Depends(get_current_user)
+):
+    """
+    Workouts, meals, templates and goal changed since `since`, plus tombstones for
+    deleted rows. Store the returned `cursor` and send it on the next call.
+    """
+    try:
+        since_at = SyncService.decode_cursor(since) if since else None
+    except (ValueError, OverflowError):
+        raise HTTPException(status_code=400, detail="Invalid sync cursor")
+    return await SyncService.get_changes(user.id, since_at)
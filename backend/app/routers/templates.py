@@ -1,21 +1,43 @@
-from fastapi import APIRouter, HTTPException, Depends
-from app.schemas.template import Template, TemplateCreate, TemplateUpdate
-from app.services.template_service import TemplateService
-from typing import List, Any
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from app.schemas.template import Template, TemplateCreate, TemplateUpdate, TemplateSummary
+from app.services.template_service import TemplateService, TEMPLATE_COLUMNS
+from app.core.projection import parse_fields, projected_response
+from typing import List, Any, Literal, Optional
 from app.auth import get_current_user
+from app.core.metrics import TimedRoute
+from app.core.etag import conditional, TEMPLATES
+from app.core.idempotency import idempotency_key, idempotency_store
 
 router = APIRouter(
     prefix="/templates",
-    tags=["templates"]
+    tags=["templates"],
+    route_class=TimedRoute
 )
 
-@router.get("/", response_model=List[Template])
-async def get_templates(user: Any = Depends(get_current_user)):
-    return await TemplateService.get_templates(user.id)
+@router.get("/", response_model=List[Template], dependencies=[Depends(conditional(TEMPLATES))])
+async def get_templates(
+    response: Response,
+    view: Literal["full", "summary"] = Query("full", description="'summary' replaces exercises with an exercise count"),
+    fields: Optional[str] = Query(None, description="Comma-separated template fields, e.g. id,name,exercises"),
+    user: Any = Depends(get_current_user)
+):
+    columns = parse_fields(fields, TEMPLATE_COLUMNS + ("exercises",))
+    templates = await TemplateService.get_templates(user.id, view, columns)
+    if view == "full" and columns is None:
+        return templates
+    return projected_response(templates, TemplateSummary, response)
 
 @router.post("/", response_model=Template)
-async def create_template(template: TemplateCreate, user: Any = Depends(get_current_user)):
-    return await TemplateService.create_template(user.id, template)
+async def create_template(
+    template: TemplateCreate,
+    response: Response,
+    key: Optional[str] = Depends(idempotency_key),
+    user: Any = Depends(get_current_user)
+):
+    return await idempotency_store.run(
+        response, user.id, "templates.create", key, template,
+        lambda: TemplateService.create_template(user.id, template)
+    )
 
 @router.patch("/{template_id}", response_model=Template)
 async def update_template(template_id: str, template: TemplateUpdate, user: Any = Depends(get_current_user)):
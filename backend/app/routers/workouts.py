@@ -1,28 +1,138 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from app.schemas.workout import Workout, WorkoutCreate, ExercisePerformance
-from app.services.workout_service import WorkoutService
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
+from app.schemas.workout import (
+    Workout, WorkoutCreate, ExercisePerformance, WorkoutSummary, Set,
+    WorkoutStart, WorkoutFinish, SessionExercise, SessionExerciseCreate, SessionExerciseUpdate, SetAppend, SetUpdate
+)
+from app.services.workout_service import WorkoutService, WORKOUT_COLUMNS
+from app.services.workout_session_service import WorkoutSessionService
+from uuid import UUID
+from app.core.projection import parse_fields, projected_response
+from typing import Any, List, Literal, Optional
 
 from app.auth import get_current_user
-from typing import List, Any
+from app.core.metrics import TimedRoute
+from app.core.etag import conditional, WORKOUTS
+from app.core.idempotency import idempotency_key, idempotency_store
 
 router = APIRouter(
     prefix="/workouts",
-    tags=["workouts"]
+    tags=["workouts"],
+    route_class=TimedRoute
 )
 
-@router.get("/", response_model=List[Workout])
-async def get_workouts(user: Any = Depends(get_current_user)):
-    return await WorkoutService.get_all_workouts(user.id)
+@router.get("/", response_model=List[Workout], dependencies=[Depends(conditional(WORKOUTS))])
+async def get_workouts(
+    response: Response,
+    view: Literal["full", "summary", "compact"] = Query("full", description="'summary' replaces sets with a set count; 'compact' returns stored totals only, no exercises"),
+    fields: Optional[str] = Query(None, description="Comma-separated workout fields, e.g. id,name,date,exercises"),
+    user: Any = Depends(get_current_user)
+):
+    columns = parse_fields(fields, WORKOUT_COLUMNS + ("exercises",))
+    workouts = await WorkoutService.get_all_workouts(user.id, view, columns)
+    if view == "full" and columns is None:
+        return workouts
+    return projected_response(workouts, WorkoutSummary, response)
 
 @router.post("/", response_model=Workout)
-async def create_workout(workout: WorkoutCreate, user: Any = Depends(get_current_user)):
-    return await WorkoutService.create_workout(user.id, workout)
+async def create_workout(
+    workout: WorkoutCreate,
+    response: Response,
+    key: Optional[str] = Depends(idempotency_key),
+    user: Any = Depends(get_current_user)
+):
+    """Send an Idempotency-Key header so a retried request doesn't create the workout twice."""
+    return await idempotency_store.run(
+        response, user.id, "workouts.create", key, workout,
+        lambda: WorkoutService.create_workout(user.id, workout)
+    )
 
-@router.get("/last-performance", response_model=List[ExercisePerformance])
+@router.get("/last-performance", response_model=List[ExercisePerformance], dependencies=[Depends(conditional(WORKOUTS))])
 async def get_last_performance(exercise_names: List[str] = Query(None), user: Any = Depends(get_current_user)):
     return await WorkoutService.get_last_performance(user.id, exercise_names or [])
 
+# --- In-session logging: each call is a small write, nothing is lost if the app dies mid-workout ---
+SESSION_NOT_FOUND = "In-progress workout not found"
+
+@router.post("/start", response_model=Workout)
+async def start_workout(
+    data: WorkoutStart,
+    response: Response,
+    key: Optional[str] = Depends(idempotency_key),
+    user: Any = Depends(get_current_user)
+):
+    """Creates an in-progress workout, pre-filled with the template's exercises when template_id is set."""
+    workout = await idempotency_store.run(
+        response, user.id, "workouts.start", key, data,
+        lambda: WorkoutSessionService.start_workout(user.id, data)
+    )
+    if not workout:
+        raise HTTPException(status_code=404, detail="Template not found")
+    return workout
+
+@router.post("/{workout_id}/exercises", response_model=SessionExercise)
+async def add_session_exercise(
+    workout_id: UUID,
+    data: SessionExerciseCreate,
+    response: Response,
+    key: Optional[str] = Depends(idempotency_key),
+    user: Any = Depends(get_current_user)
+):
+    exercise = await idempotency_store.run(
+        response, user.id, f"workouts.{workout_id}.exercises", key, data,
+        lambda: WorkoutSessionService.add_exercise(user.id, str(workout_id), data)
+    )
+    if not exercise:
+        raise HTTPException(status_code=404, detail=SESSION_NOT_FOUND)
+    return exercise
+
+@router.patch("/{workout_id}/exercises/{workout_exercise_id}", response_model=SessionExercise)
+async def update_session_exercise(workout_id: UUID, workout_exercise_id: UUID, data: SessionExerciseUpdate, user: Any = Depends(get_current_user)):
+    exercise = await WorkoutSessionService.update_exercise(user.id, str(workout_id), str(workout_exercise_id), data)
+    if not exercise:
+        raise HTTPException(status_code=404, detail=SESSION_NOT_FOUND)
+    return exercise
+
+@router.post("/{workout_id}/exercises/{workout_exercise_id}/sets", response_model=Set)
+async def append_session_set(
+    workout_id: UUID,
+    workout_exercise_id: UUID,
+    data: SetAppend,
+    response: Response,
+    key: Optional[str] = Depends(idempotency_key),
+    user: Any = Depends(get_current_user)
+):
+    logged = await idempotency_store.run(
+        response, user.id, f"workouts.{workout_exercise_id}.sets", key, data,
+        lambda: WorkoutSessionService.append_set(user.id, str(workout_id), str(workout_exercise_id), data)
+    )
+    if not logged:
+        raise HTTPException(status_code=404, detail=SESSION_NOT_FOUND)
+    return logged
+
+@router.patch("/{workout_id}/exercises/{workout_exercise_id}/sets/{set_id}", response_model=Set)
+async def update_session_set(workout_id: UUID, workout_exercise_id: UUID, set_id: UUID, data: SetUpdate, user: Any = Depends(get_current_user)):
+    updated = await WorkoutSessionService.update_set(user.id, str(workout_id), str(workout_exercise_id), str(set_id), data)
+    if not updated:
+        raise HTTPException(status_code=404, detail="Set not found")
+    return updated
+
+@router.post("/{workout_id}/finish", response_model=Workout)
+async def finish_workout(
+    workout_id: UUID,
+    data: WorkoutFinish,
+    response: Response,
+    key: Optional[str] = Depends(idempotency_key),
+    user: Any = Depends(get_current_user)
+):
+    """Stores the workout's totals and duration and applies template progressive overload."""
+    workout = await idempotency_store.run(
+        response, user.id, f"workouts.{workout_id}.finish", key, data,
+        lambda: WorkoutSessionService.finish_workout(user.id, str(workout_id), data)
+    )
+    if not workout:
+        raise HTTPException(status_code=404, detail=SESSION_NOT_FOUND)
+    return workout
+
 @router.get("/{workout_id}", response_model=Workout)
 async def get_workout(workout_id: str):
     workout = await WorkoutService.get_workout_by_id(workout_id)
@@ -45,3 +45,28 @@ class Meal(MealBase):
     protein: float = Field(..., validation_alias="total_protein")
     carbs: float = Field(..., validation_alias="total_carbs")
     fats: float = Field(..., validation_alias="total_fats")
+
+class MealDay(BaseModel):
+    # One day of GET /meals/?from=&to=
+    date: date
+    calories: int
+    protein: float
+    carbs: float
+    fats: float
+    meals: List[Meal]
+
+class FoodParseRequest(BaseModel):
+    text: str = Field(..., min_length=1, description='Free text, e.g. "2 eggs, toast with butter, black coffee"')
+
+class ParsedFoodItem(FoodItemCreate):
+    query: str
+    source: Literal['database', 'cache', 'ai_retrieval']
+
+class ParsedMeal(BaseModel):
+    # Items are ready to be sent as MealCreate.items; macros are already multiplied by quantity
+    items: List[ParsedFoodItem]
+    unresolved: List[str] = []
+    calories: int
+    protein: float
+    carbs: float
+    fats: float
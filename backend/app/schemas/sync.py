@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+from uuid import UUID
+from app.schemas.workout import Workout
+from app.schemas.diet import Meal
+from app.schemas.template import Template
+from app.schemas.goal import Goal
+
+class Tombstone(BaseModel):
+    resource: str  # 'workouts', 'meals', 'templates' or 'goals'
+    id: UUID
+    deleted_at: datetime
+
+class SyncResponse(BaseModel):
+    cursor: str  # Pass back as ?since= on the next sync
+    reset: bool = False  # True when the client must replace its local data (full sync)
+    workouts: List[Workout] = []
+    meals: List[Meal] = []
+    templates: List[Template] = []
+    goal: Optional[Goal] = None
+    deleted: List[Tombstone] = []
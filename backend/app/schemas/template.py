@@ -15,6 +15,8 @@ class TemplateExerciseBase(BaseModel):
     default_steps: Optional[int] = Field(0, alias="defaultSteps")
     order_index: int = Field(..., alias="orderIndex")
 
+    model_config = ConfigDict(populate_by_name=True)
+
 class TemplateExerciseCreate(TemplateExerciseBase):
     pass
 
@@ -37,6 +39,18 @@ class TemplateUpdate(BaseModel):
     description: Optional[str] = None
     exercises: Optional[List[TemplateExerciseCreate]] = None
 
+class TemplateSummary(BaseModel):
+    # Projection for GET /templates/?view=summary&fields=...
+    id: Optional[UUID] = None
+    user_id: Optional[UUID] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+    created_at: Optional[datetime] = None
+    exercise_count: Optional[int] = Field(None, alias="exerciseCount")
+    exercises: Optional[List[TemplateExercise]] = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
 class Template(TemplateBase):
     id: UUID
     user_id: UUID
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional
+from typing import List, Optional, Union
 from datetime import datetime
 from uuid import UUID
 from enum import Enum
@@ -14,6 +14,10 @@ class MuscleGroup(str, Enum):
     CARDIO = 'Cardio'
     OTHER = 'Other'
 
+def is_cardio_set(muscle_group, reps, time_seconds) -> bool:
+    """Cardio exercises, and sets with time but no reps, count as cardio (same rule as migrations/workout_summary.sql)."""
+    return muscle_group == MuscleGroup.CARDIO or (not reps and bool(time_seconds))
+
 # --- Set Schemas ---
 class SetBase(BaseModel):
     reps: Optional[int] = None
@@ -75,7 +79,14 @@ class WorkoutCreate(WorkoutBase):
     # For creating a workout, we accept a list of detailed exercises (frontend style)
     exercises: List[WorkoutExerciseCreate] 
 
-class Workout(WorkoutBase):
+class WorkoutTotals(BaseModel):
+    # Stored on the workout row at insert time
+    exercise_count: Optional[int] = Field(None, alias="exerciseCount")
+    set_count: Optional[int] = Field(None, alias="setCount")
+    total_volume: Optional[float] = Field(None, alias="totalVolume")
+    cardio_calories: Optional[float] = Field(None, alias="cardioCalories")
+
+class Workout(WorkoutBase, WorkoutTotals):
     id: UUID
     user_id: UUID
     exercises: List['FrontendExercise'] 
@@ -98,6 +109,77 @@ class FrontendExercise(BaseModel):
     sets: List[Set]
     workout_exercise_id: Optional[UUID] = None # Helpful for backend reference
 
+# --- Projections (GET /workouts/?view=summary&fields=...) ---
+class ExerciseSummary(BaseModel):
+    id: UUID
+    name: str
+    muscle_group: MuscleGroup = Field(..., alias="muscleGroup")
+    set_count: int = Field(0, alias="setCount")
+    workout_exercise_id: Optional[UUID] = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
+class WorkoutSummary(WorkoutTotals):
+    # Every field is optional: only the requested columns are selected
+    id: Optional[UUID] = None
+    user_id: Optional[UUID] = None
+    name: Optional[str] = None
+    date: Optional[datetime] = None
+    duration_minutes: Optional[int] = Field(None, alias="durationMinutes")
+    notes: Optional[str] = None
+    created_at: Optional[datetime] = None
+    exercises: Optional[List[Union[FrontendExercise, ExerciseSummary]]] = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
+# --- In-session logging (POST /workouts/start, .../exercises, .../sets, .../finish) ---
+class WorkoutStart(BaseModel):
+    name: Optional[str] = None # Defaults to the template's name
+    date: Optional[datetime] = None
+    notes: Optional[str] = None
+    template_id: Optional[UUID] = None
+
+class SessionExerciseCreate(BaseModel):
+    name: str
+    muscle_group: MuscleGroup = Field(..., alias="muscleGroup")
+    order_index: Optional[int] = Field(None, alias="orderIndex") # Next position when omitted
+
+    model_config = ConfigDict(populate_by_name=True)
+
+class SessionExerciseUpdate(BaseModel):
+    name: Optional[str] = None
+    muscle_group: Optional[MuscleGroup] = Field(None, alias="muscleGroup")
+    order_index: Optional[int] = Field(None, alias="orderIndex")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+class SessionExercise(BaseModel):
+    id: UUID # Exercise ID
+    name: str
+    muscle_group: MuscleGroup = Field(..., alias="muscleGroup")
+    order_index: int = Field(..., alias="orderIndex")
+    workout_exercise_id: UUID
+
+    model_config = ConfigDict(populate_by_name=True)
+
+class SetAppend(SetCreate):
+    set_order: Optional[int] = Field(None, alias="setOrder") # Next position when omitted
+
+class SetUpdate(BaseModel):
+    # Only the fields sent are written
+    reps: Optional[int] = None
+    weight: Optional[float] = None
+    speed: Optional[float] = None
+    incline: Optional[float] = None
+    time_seconds: Optional[int] = Field(None, alias="timeSeconds")
+    calories_burnt: Optional[float] = Field(None, alias="caloriesBurnt")
+    steps: Optional[int] = None
+    completed: Optional[bool] = None
+
+class WorkoutFinish(BaseModel):
+    duration_minutes: Optional[int] = Field(None, alias="durationMinutes") # Defaults to the time since start
+    notes: Optional[str] = None
+
 class ExercisePerformance(BaseModel):
     exerciseName: str
     lastWeight: float
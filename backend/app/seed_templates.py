@@ -1,5 +1,8 @@
 import asyncio
+import argparse
 import os
+import time
+from typing import Dict, List
 from uuid import UUID
 from app.db.client import get_supabase
 from app.services.template_service import TemplateService
@@ -77,41 +80,117 @@ TEMPLATES = [
     }
 ]
 
-async def seed_user_templates(user_id: str):
+# Bulk mode: users seeded per insert round trip and chunks seeded in parallel
+SEED_CHUNK_SIZE = int(os.environ.get("SEED_CHUNK_SIZE", "100"))
+SEED_CONCURRENCY = int(os.environ.get("SEED_CONCURRENCY", "4"))
+
+def _template_exercise(catalog: Dict[str, str], i: int, name: str, muscle_group: str, sets: int, reps: int) -> TemplateExerciseCreate:
+    if muscle_group == "Cardio":
+        return TemplateExerciseCreate(
+            exercise_id=UUID(catalog[name]),
+            default_sets=sets,
+            default_speed=5.0,
+            default_incline=2.0,
+            default_time_seconds=600,
+            order_index=i
+        )
+    return TemplateExerciseCreate(
+        exercise_id=UUID(catalog[name]),
+        default_sets=sets,
+        default_reps=reps,
+        default_weight=50.0,
+        order_index=i
+    )
+
+def resolve_catalog() -> Dict[str, str]:
+    """Exercise name -> id for every exercise in TEMPLATES: one select plus one insert for the missing ones."""
+    supabase = get_supabase()
+    groups = {name: mg for t_data in TEMPLATES for name, mg, _, _ in t_data["exercises"]}
+    rows = supabase.table("exercises").select("id, name, muscle_group").in_("name", list(groups)).execute().data
+    found = {r["name"] for r in rows}
+    missing = [{"name": name, "muscle_group": mg} for name, mg in groups.items() if name not in found]
+    if missing:
+        rows = rows + supabase.table("exercises").insert(missing).execute().data
+    return {r["name"]: r["id"] for r in rows}
+
+def _seed_chunk(user_ids: List[str], catalog: Dict[str, str]) -> dict:
+    """
+    Seeds the default templates for a chunk of users in two inserts (templates, then
+    template exercises). Users that already have templates are skipped, so a rerun
+    after a partial failure only seeds what is missing.
+    """
     supabase = get_supabase()
+    seeded = {r["user_id"] for r in (supabase.table("workout_templates")
+                                     .select("user_id")
+                                     .in_("user_id", user_ids)
+                                     .execute()).data}
+    users = [u for u in user_ids if u not in seeded]
+    if not users:
+        return {"users": 0, "skipped": len(user_ids), "templates": 0, "exercises": 0}
+
+    template_rows = (supabase.table("workout_templates").insert([
+        {"user_id": user_id, "name": t_data["name"], "description": f"Default {t_data['name']} template"}
+        for user_id in users
+        for t_data in TEMPLATES
+    ]).execute()).data
+    # Matched by (user, name) rather than relying on the order of the returned rows
+    template_ids = {(r["user_id"], r["name"]): r["id"] for r in template_rows}
+
+    # Every row carries every column: a bulk insert writes NULL for columns a row leaves out,
+    # so cardio and strength rows get the same schema defaults as the single-user path
+    exercise_rows = [
+        {
+            "template_id": template_ids[(user_id, t_data["name"])],
+            **_template_exercise(catalog, i, *exercise).model_dump(mode="json")
+        }
+        for user_id in users
+        for t_data in TEMPLATES
+        for i, exercise in enumerate(t_data["exercises"])
+    ]
+    try:
+        supabase.table("workout_template_exercises").insert(exercise_rows).execute()
+    except Exception:
+        # Don't leave empty templates behind: they would make the rerun skip these users
+        supabase.table("workout_templates").delete().in_("id", list(template_ids.values())).execute()
+        raise
+    return {"users": len(users), "skipped": len(user_ids) - len(users), "templates": len(template_rows), "exercises": len(exercise_rows)}
+
+async def seed_many(user_ids: List[str], concurrency: int = SEED_CONCURRENCY, chunk_size: int = SEED_CHUNK_SIZE) -> dict:
+    """Seeds the default templates for many users: chunks of `chunk_size` users, `concurrency` chunks at a time."""
+    user_ids = list(dict.fromkeys(str(u) for u in user_ids))
+    started = time.perf_counter()
+    catalog = await asyncio.to_thread(resolve_catalog)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = {"users": 0, "skipped": 0, "failed": 0, "templates": 0, "exercises": 0}
+
+    async def worker(chunk: List[str]):
+        async with semaphore:
+            try:
+                result = await asyncio.to_thread(_seed_chunk, chunk, catalog)
+            except Exception as e:
+                print(f"Failed chunk of {len(chunk)} users starting at {chunk[0]}: {e}")
+                stats["failed"] += len(chunk)
+                return
+            for k, v in result.items():
+                stats[k] += v
+
+    chunks = [user_ids[i:i + chunk_size] for i in range(0, len(user_ids), chunk_size)]
+    await asyncio.gather(*(worker(chunk) for chunk in chunks))
+    elapsed = time.perf_counter() - started
+
+    rows = stats["templates"] + stats["exercises"]
+    print(f"Seeded {stats['users']} users ({stats['skipped']} already seeded, {stats['failed']} failed) in {elapsed:.2f}s")
+    if elapsed > 0:
+        print(f"  {stats['users'] / elapsed:.1f} users/s, {stats['templates'] / elapsed:.1f} templates/s, {rows / elapsed:.1f} rows/s")
+    return {**stats, "seconds": round(elapsed, 3)}
+
+async def seed_user_templates(user_id: str):
     print(f"Seeding templates for user: {user_id}")
-    
+    catalog = await asyncio.to_thread(resolve_catalog)
+
     for t_data in TEMPLATES:
-        exercises_list = []
-        for i, (name, mg, sets, reps) in enumerate(t_data["exercises"]):
-            # Ensure exercise exists
-            ex_res = supabase.table("exercises").select("id").eq("name", name).execute()
-            if not ex_res.data:
-                ex_res = supabase.table("exercises").insert({
-                    "name": name,
-                    "muscle_group": mg
-                }).execute()
-            
-            ex_id = ex_res.data[0]["id"]
-            
-            if mg == "Cardio":
-                exercises_list.append(TemplateExerciseCreate(
-                    exercise_id=UUID(ex_id),
-                    default_sets=sets,
-                    default_speed=5.0,
-                    default_incline=2.0,
-                    default_time_seconds=600,
-                    order_index=i
-                ))
-            else:
-                exercises_list.append(TemplateExerciseCreate(
-                    exercise_id=UUID(ex_id),
-                    default_sets=sets,
-                    default_reps=reps,
-                    default_weight=50.0,
-                    order_index=i
-                ))
-            
+        exercises_list = [_template_exercise(catalog, i, *exercise) for i, exercise in enumerate(t_data["exercises"])]
         template_create = TemplateCreate(
             name=t_data["name"],
             description=f"Default {t_data['name']} template",
@@ -121,12 +200,27 @@ async def seed_user_templates(user_id: str):
         await TemplateService.create_template(user_id, template_create)
         print(f"Created template: {t_data['name']}")
 
+def _read_users_file(path: str) -> List[str]:
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
 if __name__ == "__main__":
-    import sys
-    
+    parser = argparse.ArgumentParser(description="Seed the default workout templates.")
+    parser.add_argument("user_id", nargs="?", help="Seed a single user (defaults to the latest profile)")
+    parser.add_argument("--users", nargs="+", default=[], help="Bulk mode: user ids to seed")
+    parser.add_argument("--users-file", help="Bulk mode: file with one user id per line")
+    parser.add_argument("--concurrency", type=int, default=SEED_CONCURRENCY, help="Chunks inserted in parallel")
+    parser.add_argument("--chunk-size", type=int, default=SEED_CHUNK_SIZE, help="Users per insert")
+    args = parser.parse_args()
+
     async def run_seed():
+        bulk = args.users + (_read_users_file(args.users_file) if args.users_file else [])
+        if bulk:
+            await seed_many(bulk, args.concurrency, args.chunk_size)
+            return
+
         # 1. Try to get user_id from command line
-        user_id = sys.argv[1] if len(sys.argv) > 1 else None
+        user_id = args.user_id
         
         # 2. If not provided, try to find the latest profile
         if not user_id:
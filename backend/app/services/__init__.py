@@ -1,3 +1,8 @@
 from .workout_service import WorkoutService
 from .diet_service import DietService
 from .template_service import TemplateService
+from .review_service import ReviewService
+from .sync_service import SyncService
+from .dashboard_service import DashboardService
+from .exercise_service import ExerciseService
+from .workout_session_service import WorkoutSessionService
@@ -0,0 +1,174 @@
+import os
+import asyncio
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+from app.db.client import get_supabase, select_all
+from app.services.goal_service import GoalService
+from app.services.review_service import ReviewService, MARKER_COLUMNS
+
+# Weeks of workout/meal history the dashboard reads (weekly volume chart, week-over-week)
+DASHBOARD_WEEKS = int(os.environ.get("DASHBOARD_WEEKS", "8"))
+DASHBOARD_RECENT_WORKOUTS = int(os.environ.get("DASHBOARD_RECENT_WORKOUTS", "5"))
+# A streak longer than the history window is counted on date-only rows, up to this far back
+STREAK_MAX_DAYS = int(os.environ.get("STREAK_MAX_DAYS", "730"))
+
+WORKOUT_DASHBOARD_COLUMNS = f"id, name, date, {MARKER_COLUMNS}, duration_minutes, exercise_count, set_count, total_volume, cardio_calories"
+MEAL_DASHBOARD_COLUMNS = f"date, {MARKER_COLUMNS}, total_calories, total_protein, total_carbs, total_fats"
+GOAL_TARGET_COLUMNS = ("daily_calories", "daily_caloric_deficit", "current_weight", "goal_weight", "target_date")
+
+class DashboardService:
+    """
+    Everything Dashboard.tsx shows, computed server-side from the stored workout
+    totals (no exercises or sets are read) and meal totals (no food items).
+    """
+
+    @staticmethod
+    def _select_since(table: str, columns: str, user_id: str, since: str, until: str) -> List[dict]:
+        # Blocking PostgREST call; run through asyncio.to_thread so the reads overlap
+        supabase = get_supabase()
+        response = (supabase.table(table)
+                   .select(columns)
+                   .eq("user_id", user_id)
+                   .gte("date", since)
+                   .lte("date", until)
+                   .order("date", desc=True)
+                   .execute())
+        return response.data
+
+    @staticmethod
+    def _dates_since(table: str, user_id: str, since: str, until: str) -> List[dict]:
+        # Up to STREAK_MAX_DAYS of rows can pass PostgREST's max-rows, so they are read in pages
+        supabase = get_supabase()
+        return select_all(lambda: (supabase.table(table)
+                          .select("date")
+                          .eq("user_id", user_id)
+                          .gte("date", since)
+                          .lte("date", until)
+                          .order("date", desc=True)
+                          .order("id")))
+
+    @staticmethod
+    def _day(row: dict) -> str:
+        return str(row["date"])[:10]
+
+    @staticmethod
+    def _streak(active: set, today: date, oldest: date) -> Optional[int]:
+        """Consecutive active days ending today (or yesterday); None if it reaches `oldest`."""
+        day = today if today.isoformat() in active else today - timedelta(days=1)
+        streak = 0
+        while day.isoformat() in active:
+            streak += 1
+            day -= timedelta(days=1)
+            if day < oldest:
+                return None
+        return streak
+
+    @staticmethod
+    async def _long_streak(user_id: str, today: date) -> int:
+        """Streak that outlasted the dashboard window: re-count on date-only rows."""
+        since = (today - timedelta(days=STREAK_MAX_DAYS)).isoformat()
+        until = f"{today.isoformat()}T23:59:59"
+        workouts, meals = await asyncio.gather(
+            asyncio.to_thread(DashboardService._dates_since, "workouts", user_id, since, until),
+            asyncio.to_thread(DashboardService._dates_since, "meals", user_id, since, until),
+        )
+        active = {DashboardService._day(r) for r in workouts + meals}
+        streak = DashboardService._streak(active, today, today - timedelta(days=STREAK_MAX_DAYS))
+        return STREAK_MAX_DAYS if streak is None else streak
+
+    @staticmethod
+    def _training(workouts: List[dict]) -> dict:
+        return {
+            "sessions": len(workouts),
+            "duration_minutes": sum(w.get("duration_minutes") or 0 for w in workouts),
+            "volume": round(sum(float(w.get("total_volume") or 0) for w in workouts), 1),
+            "cardio_calories": round(sum(float(w.get("cardio_calories") or 0) for w in workouts), 1),
+        }
+
+    @staticmethod
+    def _totals(workouts: List[dict], meals: List[dict], days: int) -> dict:
+        return {
+            **DashboardService._training(workouts),
+            "avg_calories": round(sum(m.get("total_calories") or 0 for m in meals) / days),
+        }
+
+    @staticmethod
+    async def get_dashboard(user_id: str, today: date) -> dict:
+        start = today - timedelta(days=7 * DASHBOARD_WEEKS - 1)
+        since, until = start.isoformat(), f"{today.isoformat()}T23:59:59"
+
+        workouts, meals, reviews, goal = await asyncio.gather(
+            asyncio.to_thread(DashboardService._select_since, "workouts", WORKOUT_DASHBOARD_COLUMNS, user_id, since, until),
+            asyncio.to_thread(DashboardService._select_since, "meals", MEAL_DASHBOARD_COLUMNS, user_id, since, until),
+            asyncio.to_thread(DashboardService._select_since, "daily_reviews", "section, review, source_marker", user_id, today.isoformat(), until),
+            # Usually served from the goal cache
+            GoalService.get_goal(user_id),
+        )
+
+        workouts_by_day: Dict[str, List[dict]] = {}
+        meals_by_day: Dict[str, List[dict]] = {}
+        for w in workouts:
+            workouts_by_day.setdefault(DashboardService._day(w), []).append(w)
+        for m in meals:
+            meals_by_day.setdefault(DashboardService._day(m), []).append(m)
+
+        # Today
+        key = today.isoformat()
+        today_workouts = workouts_by_day.get(key, [])
+        today_meals = meals_by_day.get(key, [])
+        nutrition = {
+            "calories": sum(m.get("total_calories") or 0 for m in today_meals),
+            "protein": round(sum(float(m.get("total_protein") or 0) for m in today_meals), 1),
+            "carbs": round(sum(float(m.get("total_carbs") or 0) for m in today_meals), 1),
+            "fats": round(sum(float(m.get("total_fats") or 0) for m in today_meals), 1),
+            "meals": len(today_meals),
+        }
+
+        # Week over week (rolling 7 days, like the UI cards)
+        def window(rows_by_day, first: date, days: int):
+            return [r for i in range(days) for r in rows_by_day.get((first + timedelta(days=i)).isoformat(), [])]
+
+        week_start = today - timedelta(days=6)
+        last_week_start = week_start - timedelta(days=7)
+
+        weekly_volume = []
+        for i in range(DASHBOARD_WEEKS):
+            first = start + timedelta(days=7 * i)
+            week_workouts = window(workouts_by_day, first, 7)
+            weekly_volume.append({
+                "week_start": first.isoformat(),
+                "sessions": len(week_workouts),
+                "volume": round(sum(float(w.get("total_volume") or 0) for w in week_workouts), 1),
+            })
+
+        # Streaks
+        active = set(workouts_by_day) | set(meals_by_day)
+        streak = DashboardService._streak(active, today, start)
+        if streak is None:
+            streak = await DashboardService._long_streak(user_id, today)
+
+        # Cached reviews, only while they still cover today's data
+        markers = {"activity": ReviewService._marker(today_workouts), "diet": ReviewService._marker(today_meals)}
+        review = {
+            r["section"]: r["review"]
+            for r in reviews
+            if markers.get(r["section"]) and r["source_marker"] == markers[r["section"]]
+        }
+
+        return {
+            "date": key,
+            "today": {**nutrition, **DashboardService._training(today_workouts)},
+            "goal": {k: goal.get(k) for k in GOAL_TARGET_COLUMNS} if goal else None,
+            "recent_workouts": [
+                {k: v for k, v in w.items() if k not in ("created_at", "updated_at")}
+                for w in workouts[:DASHBOARD_RECENT_WORKOUTS]
+            ],
+            "week": DashboardService._totals(window(workouts_by_day, week_start, 7), window(meals_by_day, week_start, 7), 7),
+            "last_week": DashboardService._totals(window(workouts_by_day, last_week_start, 7), window(meals_by_day, last_week_start, 7), 7),
+            "weekly_volume": weekly_volume,
+            "streak": {
+                "current": streak,
+                "active_days_this_week": sum(1 for i in range(7) if (week_start + timedelta(days=i)).isoformat() in active),
+            },
+            "review": review or None,
+        }
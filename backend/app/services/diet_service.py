@@ -1,9 +1,18 @@
+import os
 from typing import List
 from app.db.client import get_supabase
+from app.db import postgres
+from app.core.etag import resource_versions, MEALS
+
+# Longest range GET /meals/?from=&to= accepts, in days
+MEALS_MAX_RANGE_DAYS = int(os.environ.get("MEALS_MAX_RANGE_DAYS", "93"))
 
 class DietService:
     @staticmethod
     async def get_meals_by_date(user_id: str, date: str) -> List[dict]:
+        if postgres.postgres_enabled():
+            return await postgres.fetch_meals_by_date(user_id, date)
+
         supabase = get_supabase()
         response = (supabase.table("meals")
                    .select("*, food_items(*)")
@@ -16,6 +25,48 @@ class DietService:
             m["items"] = m.pop("food_items", [])
         return meals
 
+    @staticmethod
+    async def get_meals_by_range(user_id: str, start: str, end: str, include_items: bool = True) -> List[dict]:
+        """
+        Meals between `start` and `end` (inclusive) grouped by day, oldest first, with
+        per-day macro totals. Days without meals are left out. With include_items=False
+        food items are not queried and every meal has `items: []`.
+        """
+        if postgres.postgres_enabled():
+            meals = await postgres.fetch_meals_by_range(user_id, start, end, include_items)
+        else:
+            supabase = get_supabase()
+            response = (supabase.table("meals")
+                       .select("*, food_items(*)" if include_items else "*")
+                       .eq("user_id", user_id)
+                       .gte("date", start)
+                       .lte("date", end)
+                       .order("date")
+                       .order("created_at")
+                       .execute())
+            meals = response.data
+            for m in meals:
+                m["items"] = m.pop("food_items", [])
+
+        days = {}
+        for m in meals:
+            m.setdefault("items", [])
+            key = str(m["date"])[:10]
+            day = days.setdefault(key, {
+                "date": key,
+                "calories": 0,
+                "protein": 0.0,
+                "carbs": 0.0,
+                "fats": 0.0,
+                "meals": [],
+            })
+            day["calories"] += m.get("total_calories") or 0
+            day["protein"] += float(m.get("total_protein") or 0)
+            day["carbs"] += float(m.get("total_carbs") or 0)
+            day["fats"] += float(m.get("total_fats") or 0)
+            day["meals"].append(m)
+        return list(days.values())
+
     @staticmethod
     async def create_meal(user_id: str, meal) -> dict:
         supabase = get_supabase()
@@ -62,7 +113,8 @@ class DietService:
             created_meal["items"] = items_res.data
         else:
             created_meal["items"] = []
-            
+
+        resource_versions.bump(user_id, MEALS)
         return created_meal
 
     @staticmethod
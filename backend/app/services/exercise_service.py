@@ -0,0 +1,76 @@
+import os
+import time
+import asyncio
+from typing import List, Optional
+from app.db.client import get_supabase
+from app.core.exercise_index import exercise_index
+
+# Exercises inserted by other API processes show up after at most this long
+EXERCISE_INDEX_TTL_SECONDS = float(os.environ.get("EXERCISE_INDEX_TTL_SECONDS", "600"))
+EXERCISE_PAGE_SIZE = 1000
+
+_load_lock = asyncio.Lock()
+
+class ExerciseService:
+    @staticmethod
+    def _load_rows() -> List[dict]:
+        supabase = get_supabase()
+        rows, start = [], 0
+        while True:
+            page = (supabase.table("exercises")
+                   .select("id, name, muscle_group")
+                   .order("name")
+                   .range(start, start + EXERCISE_PAGE_SIZE - 1)
+                   .execute()).data
+            rows.extend(page)
+            if len(page) < EXERCISE_PAGE_SIZE:
+                return rows
+            start += EXERCISE_PAGE_SIZE
+
+    @staticmethod
+    async def ensure_index():
+        """(Re)loads the exercise catalog into the search index when missing or older than the TTL."""
+        def stale():
+            return exercise_index.loaded_at is None or time.monotonic() - exercise_index.loaded_at > EXERCISE_INDEX_TTL_SECONDS
+
+        if not stale():
+            return
+        async with _load_lock:
+            if stale():
+                exercise_index.rebuild(await asyncio.to_thread(ExerciseService._load_rows))
+
+    @staticmethod
+    async def search(query: str, muscle_group: Optional[str] = None, limit: int = 10) -> List[dict]:
+        await ExerciseService.ensure_index()
+        return exercise_index.search(query, muscle_group, limit)
+
+    @staticmethod
+    async def get_or_create(name: str, muscle_group: Optional[str]) -> str:
+        """Exercise id for a name; known names are answered by the index without a query."""
+        exercise_id = exercise_index.get_id(name)
+        if exercise_id:
+            return exercise_id
+
+        supabase = get_supabase()
+        ex_res = supabase.table("exercises").select("id, name, muscle_group").eq("name", name).execute()
+        if not ex_res.data:
+            ex_res = supabase.table("exercises").insert({
+                "name": name,
+                "muscle_group": muscle_group
+            }).execute()
+        exercise_index.add(ex_res.data[0])
+        return ex_res.data[0]["id"]
+
+    @staticmethod
+    async def get_by_id(exercise_id: str) -> Optional[dict]:
+        await ExerciseService.ensure_index()
+        entry = exercise_index.get(exercise_id)
+        if entry:
+            return entry
+
+        supabase = get_supabase()
+        response = supabase.table("exercises").select("id, name, muscle_group").eq("id", exercise_id).execute()
+        if not response.data:
+            return None
+        exercise_index.add(response.data[0])
+        return exercise_index.get(exercise_id)
@@ -1,38 +1,85 @@
-
-from app.db.client import supabase
+import os
+from app.db.client import get_supabase
+from app.core.cache import TTLCache
+from app.core.etag import resource_versions, GOALS
 from app.schemas.goal import GoalCreate, GoalUpdate
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+
+# GET /goals/ runs on almost every screen; goals only change through this service.
+# The TTL bounds staleness when several API processes write the same user's goal.
+GOAL_CACHE_TTL_SECONDS = float(os.environ.get("GOAL_CACHE_TTL_SECONDS", "300"))
+GOAL_CACHE_SIZE = int(os.environ.get("GOAL_CACHE_SIZE", "10000"))
+# Longest range GET /goals/progress reads; a default range (since the goal was set) is clamped to it
+PROGRESS_MAX_RANGE_DAYS = int(os.environ.get("PROGRESS_MAX_RANGE_DAYS", "730"))
 
 class GoalService:
+    @staticmethod
+    def _cache_write(user_id: str, goal: Optional[Dict[str, Any]]):
+        """Write-through after a save: bump the version, then cache the returned row."""
+        resource_versions.bump(user_id, GOALS)
+        if goal is None:
+            goal_cache.invalidate(str(user_id))
+        else:
+            goal_cache.set(str(user_id), goal)
+
     @staticmethod
     async def get_goal(user_id: str) -> Optional[Dict[str, Any]]:
+        found, goal = goal_cache.get_entry(str(user_id))
+        if found:
+            return dict(goal) if goal else None
+
+        # A save that lands while we read must win: only cache if no write happened meanwhile
+        version, _ = resource_versions.get(user_id, GOALS)
+        supabase = get_supabase()
         response = supabase.table("goals").select("*").eq("user_id", user_id).limit(1).execute()
-        if response.data:
-            return response.data[0]
-        return None
+        goal = response.data[0] if response.data else None
+        if resource_versions.get(user_id, GOALS)[0] == version:
+            goal_cache.set(str(user_id), goal)
+        return dict(goal) if goal else None
 
     @staticmethod
     async def create_goal(user_id: str, goal: GoalCreate) -> Dict[str, Any]:
-        existing = await GoalService.get_goal(user_id)
-        if existing:
-            return await GoalService.update_goal(user_id, goal)
-        
-        data = goal.model_dump(mode='json')
+        """Creates or updates the user's goal in one atomic upsert (unique user_id)."""
+        supabase = get_supabase()
+        data = goal.model_dump(exclude_unset=True, mode='json')
         data["user_id"] = user_id
-        
-        response = supabase.table("goals").insert(data).execute()
-        return response.data[0] if response.data else None
+
+        # Only the sent columns are written, so an existing goal keeps the others
+        response = supabase.table("goals").upsert(data, on_conflict="user_id").execute()
+        saved = response.data[0] if response.data else None
+        GoalService._cache_write(user_id, saved)
+        return saved
 
     @staticmethod
     async def update_goal(user_id: str, goal: GoalCreate) -> Dict[str, Any]:
+        supabase = get_supabase()
         data = goal.model_dump(exclude_unset=True, mode='json')
         response = supabase.table("goals").update(data).eq("user_id", user_id).execute()
-        return response.data[0] if response.data else None
+        saved = response.data[0] if response.data else None
+        GoalService._cache_write(user_id, saved)
+        return saved
+
+    @staticmethod
+    async def get_daily_energy(user_id: str, start: str, end: str) -> List[Dict[str, Any]]:
+        """One row per day with calories eaten and burnt, aggregated by the get_daily_energy RPC."""
+        supabase = get_supabase()
+        response = supabase.rpc("get_daily_energy", {
+            "p_user_id": user_id,
+            "p_from": start,
+            "p_to": end,
+        }).execute()
+        return response.data or []
 
     @staticmethod
     async def save_ai_plan(user_id: str, deficit: int, plan_summary: str):
+        supabase = get_supabase()
         # Example of updating just the AI parts
         data = {"daily_caloric_deficit": deficit}
         # We might want to store the plan summary (text) somewhere too, maybe in 'notes' column if we add it?
         # For now, just deficit.
-        supabase.table("goals").update(data).eq("user_id", user_id).execute()
+        response = supabase.table("goals").update(data).eq("user_id", user_id).execute()
+        GoalService._cache_write(user_id, response.data[0] if response.data else None)
+
+
+# Global Instance
+goal_cache = TTLCache(maxsize=GOAL_CACHE_SIZE, ttl=GOAL_CACHE_TTL_SECONDS)
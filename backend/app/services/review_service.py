@@ -0,0 +1,132 @@
+import os
+from typing import Dict, List, Optional, Tuple
+from app.db.client import get_supabase, select_all
+
+SECTIONS = ("activity", "diet")
+# Columns the data marker is built from. updated_at (migrations/sync.sql) is touched by
+# triggers whenever a set or food item of the row changes, so a workout that grows
+# during an in-progress session gets a new marker.
+MARKER_COLUMNS = "created_at, updated_at"
+# Longest range /agents/review/period accepts; the prompt is bounded anyway, this bounds the reads
+REVIEW_PERIOD_MAX_DAYS = int(os.environ.get("REVIEW_PERIOD_MAX_DAYS", "366"))
+
+class ReviewService:
+    """
+    Stores generated daily reviews together with a marker of the data they were
+    generated from, so a review is only regenerated once new workouts/meals arrive.
+    """
+
+    @staticmethod
+    def _marker(rows: List[dict]) -> Optional[str]:
+        if not rows:
+            return None
+        latest = max(str(r.get("updated_at") or r["created_at"]) for r in rows)
+        return f"{len(rows)}:{latest}"
+
+    @staticmethod
+    def _day_window(date: str) -> Tuple[str, str]:
+        return f"{date}T00:00:00", f"{date}T23:59:59"
+
+    @staticmethod
+    async def get_source_markers(user_id: str, date: str) -> Dict[str, Optional[str]]:
+        """Current data marker per section; None when nothing was logged that day."""
+        supabase = get_supabase()
+        start, end = ReviewService._day_window(date)
+        workouts = (supabase.table("workouts")
+                   .select(MARKER_COLUMNS)
+                   .eq("user_id", user_id)
+                   .gte("date", start)
+                   .lte("date", end)
+                   .execute())
+        meals = (supabase.table("meals")
+                .select(MARKER_COLUMNS)
+                .eq("user_id", user_id)
+                .eq("date", date)
+                .execute())
+        return {
+            "activity": ReviewService._marker(workouts.data),
+            "diet": ReviewService._marker(meals.data),
+        }
+
+    @staticmethod
+    async def get_reviews(user_id: str, date: str) -> Dict[str, dict]:
+        supabase = get_supabase()
+        response = (supabase.table("daily_reviews")
+                   .select("section, review, source_marker, generated_at")
+                   .eq("user_id", user_id)
+                   .eq("date", date)
+                   .execute())
+        return {r["section"]: r for r in response.data}
+
+    @staticmethod
+    async def save_review(user_id: str, date: str, section: str, review: str, source_marker: str):
+        supabase = get_supabase()
+        supabase.table("daily_reviews").upsert({
+            "user_id": user_id,
+            "date": date,
+            "section": section,
+            "review": review,
+            "source_marker": source_marker
+        }, on_conflict="user_id,date,section").execute()
+
+    @staticmethod
+    async def get_period_data(user_id: str, start: str, end: str) -> Dict[str, List[dict]]:
+        """
+        Compact rows for a weekly/monthly review: stored workout totals (no exercises or
+        sets), meal totals (no food items) and the cached daily reviews of the range.
+        """
+        supabase = get_supabase()
+        workouts = (supabase.table("workouts")
+                   .select(f"date, name, {MARKER_COLUMNS}, duration_minutes, set_count, total_volume, cardio_calories")
+                   .eq("user_id", user_id)
+                   .gte("date", f"{start}T00:00:00")
+                   .lte("date", f"{end}T23:59:59")
+                   .order("date")
+                   .execute())
+        meals = (supabase.table("meals")
+                .select(f"date, {MARKER_COLUMNS}, total_calories, total_protein, total_carbs, total_fats")
+                .eq("user_id", user_id)
+                .gte("date", start)
+                .lte("date", end)
+                .execute())
+        reviews = (supabase.table("daily_reviews")
+                  .select("date, section, review, source_marker")
+                  .eq("user_id", user_id)
+                  .gte("date", start)
+                  .lte("date", end)
+                  .execute())
+        return {"workouts": workouts.data, "meals": meals.data, "reviews": reviews.data}
+
+    @staticmethod
+    async def find_stale(date: str) -> List[Tuple[str, str, str]]:
+        """
+        Every (user_id, section, marker) with data logged on `date` whose review is
+        missing or older than the data. Three paged selects regardless of the number of users.
+        """
+        supabase = get_supabase()
+        start, end = ReviewService._day_window(date)
+        workouts = select_all(lambda: (supabase.table("workouts")
+                   .select(f"user_id, {MARKER_COLUMNS}")
+                   .gte("date", start)
+                   .lte("date", end)
+                   .order("id")))
+        meals = select_all(lambda: (supabase.table("meals")
+                .select(f"user_id, {MARKER_COLUMNS}")
+                .eq("date", date)
+                .order("id")))
+        reviews = select_all(lambda: (supabase.table("daily_reviews")
+                  .select("user_id, section, source_marker")
+                  .eq("date", date)
+                  .order("id")))
+
+        stored = {(r["user_id"], r["section"]): r["source_marker"] for r in reviews}
+        stale = []
+        for section, rows in (("activity", workouts), ("diet", meals)):
+            by_user: Dict[str, List[dict]] = {}
+            for row in rows:
+                by_user.setdefault(row["user_id"], []).append(row)
+            for user_id, user_rows in by_user.items():
+                marker = ReviewService._marker(user_rows)
+                if stored.get((user_id, section)) != marker:
+                    stale.append((user_id, section, marker))
+        return stale
@@ -0,0 +1,49 @@
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from app.db.client import get_supabase
+from app.services.template_service import TemplateService
+
+# Tombstones are kept this long; an older cursor gets a full resync instead of a delta.
+SYNC_TOMBSTONE_DAYS = int(os.environ.get("SYNC_TOMBSTONE_DAYS", "90"))
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+class SyncService:
+    """
+    Delta sync for offline clients. Cursors are the database watermark from
+    get_sync_changes (migrations/sync.sql) as microseconds since the epoch.
+    """
+
+    @staticmethod
+    def encode_cursor(value: datetime) -> str:
+        return str((value - _EPOCH) // timedelta(microseconds=1))
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> datetime:
+        """Raises ValueError for malformed cursors."""
+        return _EPOCH + timedelta(microseconds=int(cursor))
+
+    @staticmethod
+    async def get_changes(user_id: str, since: Optional[datetime]) -> dict:
+        reset = since is None
+        if since is not None and since < datetime.now(timezone.utc) - timedelta(days=SYNC_TOMBSTONE_DAYS):
+            # Deletions before this point may have been purged
+            since, reset = None, True
+
+        supabase = get_supabase()
+        response = supabase.rpc("get_sync_changes", {
+            "p_user_id": user_id,
+            "p_since": since.isoformat() if since else None,
+        }).execute()
+        changes = response.data
+
+        return {
+            "cursor": SyncService.encode_cursor(datetime.fromisoformat(changes["cursor"])),
+            "reset": reset,
+            "workouts": changes["workouts"],
+            "meals": changes["meals"],
+            "templates": [TemplateService._format_template(t) for t in changes["templates"]],
+            "goal": changes["goal"],
+            "deleted": changes["deleted"],
+        }
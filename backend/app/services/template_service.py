@@ -1,8 +1,16 @@
 from typing import List, Optional
 from uuid import UUID
 from app.db.client import get_supabase
+from app.core.etag import resource_versions, TEMPLATES
 from app.schemas.template import TemplateCreate, TemplateUpdate, Template
 
+TEMPLATE_COLUMNS = ("id", "user_id", "name", "description", "created_at")
+
+TEMPLATE_EXERCISES_SELECT = {
+    "full": "workout_template_exercises(*, exercises(*))",
+    "summary": "workout_template_exercises(count)",
+}
+
 class TemplateService:
     @staticmethod
     def _format_template(rt: dict) -> dict:
@@ -30,13 +38,31 @@ class TemplateService:
         return template
 
     @staticmethod
-    async def get_templates(user_id: str) -> List[dict]:
+    async def get_templates(user_id: str, view: str = "full", columns: Optional[List[str]] = None) -> List[dict]:
+        """
+        Lists the user's templates. `columns` limits the top-level columns (None = all);
+        exercises are embedded when `columns` is None or contains "exercises":
+        in full (view="full") or only as an exercise count (view="summary").
+        """
         supabase = get_supabase()
+        with_exercises = columns is None or "exercises" in columns
+        select = "*" if columns is None else ", ".join(c for c in columns if c != "exercises")
+        if with_exercises:
+            nested = TEMPLATE_EXERCISES_SELECT[view]
+            select = f"{select}, {nested}" if select else nested
+
         response = (supabase.table("workout_templates")
-                   .select("*, workout_template_exercises(*, exercises(*))")
+                   .select(select)
                    .eq("user_id", user_id)
                    .execute())
-        
+
+        if not with_exercises:
+            return response.data
+        if view == "summary":
+            for rt in response.data:
+                counted = rt.pop("workout_template_exercises", None) or []
+                rt["exerciseCount"] = counted[0]["count"] if counted else 0
+            return response.data
         return [TemplateService._format_template(rt) for rt in response.data]
 
     @staticmethod
@@ -72,6 +98,7 @@ class TemplateService:
         
         if exercises_to_insert:
             supabase.table("workout_template_exercises").insert(exercises_to_insert).execute()
+        resource_versions.bump(user_id, TEMPLATES)
             
         # Refetch with exercises
         rt = (supabase.table("workout_templates")
@@ -115,6 +142,7 @@ class TemplateService:
             ]
             if exercises_to_insert:
                 supabase.table("workout_template_exercises").insert(exercises_to_insert).execute()
+        resource_versions.bump(user_id, TEMPLATES)
                 
         rt = (supabase.table("workout_templates")
                 .select("*, workout_template_exercises(*, exercises(*))")
@@ -127,4 +155,5 @@ class TemplateService:
     async def delete_template(user_id: str, template_id: str) -> bool:
         supabase = get_supabase()
         supabase.table("workout_templates").delete().eq("id", template_id).eq("user_id", user_id).execute()
+        resource_versions.bump(user_id, TEMPLATES)
         return True
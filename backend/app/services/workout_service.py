@@ -1,22 +1,56 @@
 from typing import List, Optional
 from uuid import UUID
 from app.db.client import get_supabase
-from app.schemas.workout import WorkoutCreate, Workout
+from app.db import postgres
+from app.core.etag import resource_versions, WORKOUTS, TEMPLATES
+from app.schemas.workout import WorkoutCreate, Workout, is_cardio_set
 from app.services.template_service import TemplateService
+from app.services.exercise_service import ExerciseService
 from app.schemas.template import TemplateCreate, TemplateExerciseCreate
 
+# Totals stored on each workout at insert time (migrations/workout_summary.sql)
+WORKOUT_SUMMARY_COLUMNS = ("exercise_count", "set_count", "total_volume", "cardio_calories")
+WORKOUT_COLUMNS = ("id", "user_id", "name", "date", "duration_minutes", "notes", "created_at") + WORKOUT_SUMMARY_COLUMNS
+# view=compact: no joins, just what list views and the dashboard show
+WORKOUT_COMPACT_COLUMNS = ("id", "name", "date", "duration_minutes") + WORKOUT_SUMMARY_COLUMNS
+
+# Nested selects per view. "summary" only counts sets, so set rows are never read.
+WORKOUT_EXERCISES_SELECT = {
+    "full": "workout_exercises(*, exercises(*), sets(*))",
+    "summary": "workout_exercises(id, exercises(id, name, muscle_group), sets(count))",
+}
+
 class WorkoutService:
     @staticmethod
-    async def get_all_workouts(user_id: str) -> List[dict]:
+    async def get_all_workouts(user_id: str, view: str = "full", columns: Optional[List[str]] = None) -> List[dict]:
+        """
+        Lists the user's workouts, newest first. `columns` limits the top-level workout
+        columns (None = all); exercises are embedded only when `columns` is None or
+        contains "exercises", with sets (view="full") or just a set count (view="summary").
+        view="compact" never embeds: it reads the stored totals only.
+        """
+        if view == "compact":
+            return await WorkoutService.get_compact_workouts(user_id, columns)
+        if postgres.postgres_enabled() and view == "full" and columns is None:
+            return await postgres.fetch_workouts(user_id)
+
+        with_exercises = columns is None or "exercises" in columns
+        select = "*" if columns is None else ", ".join(c for c in columns if c != "exercises")
+        if with_exercises:
+            select = f"{select}, {WORKOUT_EXERCISES_SELECT[view]}" if select else WORKOUT_EXERCISES_SELECT[view]
+
         supabase = get_supabase()
         response = (supabase.table("workouts")
-                   .select("*, workout_exercises(*, exercises(*), sets(*))")
+                   .select(select)
                    .eq("user_id", user_id)
                    .order("date", desc=True)
                    .execute())
         
         # Mapping logic for FE
         workouts_data = response.data
+        if not with_exercises:
+            return workouts_data
+
         for workout in workouts_data:
             workout["exercises"] = []
             for we in workout.get("workout_exercises", []):
@@ -24,25 +58,78 @@ class WorkoutService:
                     "id": we["exercises"]["id"],
                     "name": we["exercises"]["name"],
                     "muscleGroup": we["exercises"]["muscle_group"],
-                    "sets": we["sets"],
                     "workout_exercise_id": we["id"]
                 }
+                if view == "summary":
+                    fe_ex["setCount"] = we["sets"][0]["count"] if we["sets"] else 0
+                else:
+                    fe_ex["sets"] = we["sets"]
                 workout["exercises"].append(fe_ex)
             del workout["workout_exercises"]
             
         return workouts_data
 
+    @staticmethod
+    async def get_compact_workouts(user_id: str, columns: Optional[List[str]] = None) -> List[dict]:
+        """Workouts with their stored totals only; cost does not grow with the number of sets."""
+        columns = [c for c in (columns or WORKOUT_COMPACT_COLUMNS) if c != "exercises"]
+        if postgres.postgres_enabled() and columns == list(WORKOUT_COMPACT_COLUMNS):
+            return await postgres.fetch_compact_workouts(user_id)
+
+        supabase = get_supabase()
+        response = (supabase.table("workouts")
+                   .select(", ".join(columns))
+                   .eq("user_id", user_id)
+                   .order("date", desc=True)
+                   .execute())
+        return response.data
+
+    @staticmethod
+    def _apply_progressive_overload(template_id: str, exercise_id: str, first_set):
+        """The template's defaults for an exercise become the first set just logged."""
+        supabase = get_supabase()
+        supabase.table("workout_template_exercises").update({
+            "default_reps": first_set.reps,
+            "default_weight": first_set.weight,
+            "default_speed": first_set.speed,
+            "default_incline": first_set.incline,
+            "default_time_seconds": first_set.time_seconds,
+            "default_calories_burnt": first_set.calories_burnt,
+            "default_steps": first_set.steps
+        }).eq("template_id", template_id).eq("exercise_id", exercise_id).execute()
+
+    @staticmethod
+    def _summarize(exercises) -> dict:
+        """Totals stored on the workout row (see WORKOUT_SUMMARY_COLUMNS)."""
+        set_count = 0
+        volume = 0.0
+        cardio_calories = 0.0
+        for ex in exercises:
+            set_count += len(ex.sets)
+            for s in ex.sets:
+                if is_cardio_set(ex.muscle_group, s.reps, s.time_seconds):
+                    cardio_calories += s.calories_burnt or 0
+                else:
+                    volume += (s.reps or 0) * (s.weight or 0)
+        return {
+            "exercise_count": len(exercises),
+            "set_count": set_count,
+            "total_volume": round(volume, 2),
+            "cardio_calories": round(cardio_calories, 2),
+        }
+
     @staticmethod
     async def create_workout(user_id: str, workout_data: WorkoutCreate) -> dict:
         supabase = get_supabase()
         
-        # 1. Insert Workout
+        # 1. Insert Workout (with its totals, so list views never need the sets)
         workout_res = supabase.table("workouts").insert({
             "user_id": user_id,
             "name": workout_data.name,
             "date": workout_data.date.isoformat(),
             "duration_minutes": workout_data.duration_minutes,
-            "notes": workout_data.notes
+            "notes": workout_data.notes,
+            **WorkoutService._summarize(workout_data.exercises)
         }).execute()
         
         workout = workout_res.data[0]
@@ -50,15 +137,11 @@ class WorkoutService:
         
         # 2. Process Exercises and Sets
         for ex_data in workout_data.exercises:
-            # Get or create exercise
-            ex_res = supabase.table("exercises").select("id").eq("name", ex_data.name).execute()
-            if not ex_res.data:
-                ex_res = supabase.table("exercises").insert({
-                    "name": ex_data.name,
-                    "muscle_group": ex_data.muscle_group.value if ex_data.muscle_group else None
-                }).execute()
-            
-            exercise_id = ex_res.data[0]["id"]
+            # Get or create exercise (also keeps the search index current)
+            exercise_id = await ExerciseService.get_or_create(
+                ex_data.name,
+                ex_data.muscle_group.value if ex_data.muscle_group else None
+            )
             
             # Create WorkoutExercise
             we_res = supabase.table("workout_exercises").insert({
@@ -91,16 +174,7 @@ class WorkoutService:
             # --- Template Auto-update Logic (Progressive Overload) ---
             if workout_data.template_id:
                 if ex_data.sets:
-                    first_set = ex_data.sets[0]
-                    supabase.table("workout_template_exercises").update({
-                        "default_reps": first_set.reps,
-                        "default_weight": first_set.weight,
-                        "default_speed": first_set.speed,
-                        "default_incline": first_set.incline,
-                        "default_time_seconds": first_set.time_seconds,
-                        "default_calories_burnt": first_set.calories_burnt,
-                        "default_steps": first_set.steps
-                    }).eq("template_id", str(workout_data.template_id)).eq("exercise_id", exercise_id).execute()
+                    WorkoutService._apply_progressive_overload(str(workout_data.template_id), exercise_id, ex_data.sets[0])
 
         # 3. Save as Template if requested
         if workout_data.save_as_template:
@@ -109,7 +183,7 @@ class WorkoutService:
                 description=f"Saved from workout on {workout_data.date.strftime('%Y-%m-%d')}",
                 exercises=[
                     TemplateExerciseCreate(
-                        exercise_id=UUID(supabase.table("exercises").select("id").eq("name", ex.name).single().execute().data["id"]),
+                        exercise_id=UUID(await ExerciseService.get_or_create(ex.name, ex.muscle_group.value)),
                         default_sets=len(ex.sets),
                         default_reps=ex.sets[0].reps if ex.sets else 10,
                         default_weight=ex.sets[0].weight if ex.sets else 0,
@@ -125,10 +199,15 @@ class WorkoutService:
             )
             await TemplateService.create_template(user_id, template_create)
 
+        # Template defaults may have been updated above as well
+        resource_versions.bump(user_id, WORKOUTS, TEMPLATES)
         return await WorkoutService.get_workout_by_id(workout_id)
 
     @staticmethod
     async def get_workout_by_id(workout_id: str) -> dict:
+        if postgres.postgres_enabled():
+            return await postgres.fetch_workout_by_id(workout_id)
+
         supabase = get_supabase()
         response = (supabase.table("workouts")
                    .select("*, workout_exercises(*, exercises(*), sets(*))")
@@ -154,8 +233,44 @@ class WorkoutService:
         
         return workout
 
+    @staticmethod
+    def _format_performance(name: str, last_date, sets: List[dict]) -> dict:
+        """Builds an ExercisePerformance payload from the sets of the latest workout containing `name`."""
+        if not sets:
+            return {
+                "exerciseName": name,
+                "lastWeight": 0,
+                "lastReps": 0,
+                "lastSpeed": 0,
+                "lastIncline": 0,
+                "lastTimeSeconds": 0,
+                "lastCaloriesBurnt": 0,
+                "lastSteps": 0,
+                "lastDate": last_date,
+                "previousSets": []
+            }
+
+        # Pick last set as the baseline
+        s = sets[-1]
+        return {
+            "exerciseName": name,
+            "lastWeight": float(s["weight"]) if s["weight"] is not None else 0,
+            "lastReps": s["reps"] if s["reps"] is not None else 0,
+            "lastSpeed": float(s["speed"]) if s["speed"] is not None else 0,
+            "lastIncline": float(s["incline"]) if s["incline"] is not None else 0,
+            "lastTimeSeconds": s["time_seconds"] if s["time_seconds"] is not None else 0,
+            "lastCaloriesBurnt": float(s["calories_burnt"]) if s["calories_burnt"] is not None else 0,
+            "lastSteps": s["steps"] if s.get("steps") is not None else 0,
+            "lastDate": last_date,
+            "previousSets": [{"weight": float(st["weight"]) if st.get("weight") is not None else 0, "reps": st["reps"] if st.get("reps") is not None else 0} for st in sets]
+        }
+
     @staticmethod
     async def get_last_performance(user_id: str, exercise_names: List[str]) -> List[dict]:
+        if postgres.postgres_enabled():
+            rows = await postgres.fetch_last_sets(user_id, exercise_names)
+            return [WorkoutService._format_performance(r["exercise_name"], r["date"], r["sets"] or []) for r in rows]
+
         supabase = get_supabase()
         results = []
         
@@ -172,46 +287,8 @@ class WorkoutService:
                 workout = query.data[0]
                 we = workout["workout_exercises"][0]
                 sets = sorted(we.get("sets", []), key=lambda s: s.get("set_order", 0))
-                if sets:
-                    # Pick last set as the baseline
-                    s = sets[-1]
-                    results.append({
-                        "exerciseName": name,
-                        "lastWeight": float(s["weight"]) if s["weight"] is not None else 0,
-                        "lastReps": s["reps"] if s["reps"] is not None else 0,
-                        "lastSpeed": float(s["speed"]) if s["speed"] is not None else 0,
-                        "lastIncline": float(s["incline"]) if s["incline"] is not None else 0,
-                        "lastTimeSeconds": s["time_seconds"] if s["time_seconds"] is not None else 0,
-                        "lastCaloriesBurnt": float(s["calories_burnt"]) if s["calories_burnt"] is not None else 0,
-                        "lastSteps": s["steps"] if s.get("steps") is not None else 0,
-                        "lastDate": workout["date"],
-                        "previousSets": [{"weight": float(st["weight"]) if st.get("weight") is not None else 0, "reps": st["reps"] if st.get("reps") is not None else 0} for st in sets]
-                    })
-                else:
-                    results.append({
-                        "exerciseName": name,
-                        "lastWeight": 0,
-                        "lastReps": 0,
-                        "lastSpeed": 0,
-                        "lastIncline": 0,
-                        "lastTimeSeconds": 0,
-                        "lastCaloriesBurnt": 0,
-                        "lastSteps": 0,
-                        "lastDate": workout["date"],
-                        "previousSets": []
-                    })
+                results.append(WorkoutService._format_performance(name, workout["date"], sets))
             else:
-                results.append({
-                    "exerciseName": name,
-                    "lastWeight": 0,
-                    "lastReps": 0,
-                    "lastSpeed": 0,
-                    "lastIncline": 0,
-                    "lastTimeSeconds": 0,
-                    "lastCaloriesBurnt": 0,
-                    "lastSteps": 0,
-                    "lastDate": None,
-                    "previousSets": []
-                })
+                results.append(WorkoutService._format_performance(name, None, []))
                 
         return results
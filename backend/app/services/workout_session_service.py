@@ -0,0 +1,275 @@
+import os
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Optional
+from postgrest.exceptions import APIError
+from app.db.client import get_supabase
+from app.core.cache import TTLCache
+from app.core.etag import resource_versions, WORKOUTS, TEMPLATES
+from app.schemas.workout import (
+    WorkoutStart, SessionExerciseCreate, SessionExerciseUpdate, SetAppend, SetUpdate, WorkoutFinish, Set, MuscleGroup
+)
+from app.services.exercise_service import ExerciseService
+from app.services.workout_service import WorkoutService
+
+# In-progress workouts and their workout_exercise ids, per user. Lets every set/exercise
+# call check ownership without a read, so it is a single-row write. Whether the workout
+# is still in progress is enforced by the database on the write (migrations/workout_sessions.sql).
+WORKOUT_SESSION_TTL_SECONDS = float(os.environ.get("WORKOUT_SESSION_TTL_SECONDS", "21600"))
+WORKOUT_SESSION_CACHE_SIZE = int(os.environ.get("WORKOUT_SESSION_CACHE_SIZE", "10000"))
+
+# SQLSTATE of reject_finished_session_writes(): the workout was finished (possibly through another worker)
+WORKOUT_FINISHED_ERRCODE = "55000"
+
+SET_COLUMNS = ("reps", "weight", "speed", "incline", "time_seconds", "calories_burnt", "steps", "completed")
+
+class WorkoutSessionService:
+    """
+    Incremental logging: start a workout, then append/patch exercises and sets as they
+    are done, then finish it (stored totals and template progressive overload).
+    """
+
+    @staticmethod
+    def _session(user_id: str, workout_id: str, workout_exercise_id: Optional[str] = None) -> Optional[set]:
+        """
+        workout_exercise ids of the user's in-progress workout; None if there is no such workout.
+        The cache is per process, so an id missing from the cached set (e.g. added through
+        another worker) is re-checked against the database before it is treated as unknown.
+        """
+        key = (str(user_id), str(workout_id))
+        exercises = session_cache.get(key)
+        if exercises is not None and (workout_exercise_id is None or workout_exercise_id in exercises):
+            return exercises
+
+        supabase = get_supabase()
+        response = (supabase.table("workouts")
+                   .select("id, workout_exercises(id)")
+                   .eq("id", workout_id)
+                   .eq("user_id", user_id)
+                   .eq("in_progress", True)
+                   .execute())
+        if not response.data:
+            return None
+        exercises = {we["id"] for we in response.data[0]["workout_exercises"]}
+        session_cache.set(key, exercises)
+        return exercises
+
+    @staticmethod
+    def _write(user_id: str, workout_id: str, query):
+        """Executes a set/exercise write; None if the database rejected it because the workout is finished."""
+        try:
+            return query.execute()
+        except APIError as e:
+            if e.code != WORKOUT_FINISHED_ERRCODE:
+                raise
+            session_cache.invalidate((str(user_id), str(workout_id)))
+            return None
+
+    @staticmethod
+    def _set_row(data) -> dict:
+        row = data.model_dump(include=set(SET_COLUMNS), exclude_unset=isinstance(data, SetUpdate))
+        # reps/weight are NOT NULL; cardio sets store 0
+        for column in ("reps", "weight"):
+            if column in row and row[column] is None:
+                row[column] = 0
+        return row
+
+    @staticmethod
+    async def start_workout(user_id: str, data: WorkoutStart) -> Optional[dict]:
+        supabase = get_supabase()
+        template = None
+        if data.template_id:
+            response = (supabase.table("workout_templates")
+                       .select("id, name, workout_template_exercises(exercise_id, order_index)")
+                       .eq("id", str(data.template_id))
+                       .eq("user_id", user_id)
+                       .execute())
+            if not response.data:
+                return None
+            template = response.data[0]
+
+        workout = supabase.table("workouts").insert({
+            "user_id": user_id,
+            "name": data.name or (template["name"] if template else "Workout"),
+            "date": (data.date or datetime.now(timezone.utc)).isoformat(),
+            "duration_minutes": 0,
+            "notes": data.notes,
+            "template_id": template["id"] if template else None,
+            "in_progress": True,
+            **WorkoutService._summarize([])
+        }).execute().data[0]
+
+        # The template's exercises, in order, without sets: sets are logged as they are done
+        exercises = set()
+        template_exercises = sorted((template or {}).get("workout_template_exercises") or [], key=lambda te: te["order_index"])
+        if template_exercises:
+            rows = supabase.table("workout_exercises").insert([
+                {"workout_id": workout["id"], "exercise_id": te["exercise_id"], "order_index": te["order_index"]}
+                for te in template_exercises
+            ]).execute().data
+            exercises = {r["id"] for r in rows}
+
+        session_cache.set((str(user_id), str(workout["id"])), exercises)
+        resource_versions.bump(user_id, WORKOUTS)
+        return await WorkoutService.get_workout_by_id(workout["id"])
+
+    @staticmethod
+    async def add_exercise(user_id: str, workout_id: str, data: SessionExerciseCreate) -> Optional[dict]:
+        exercises = WorkoutSessionService._session(user_id, workout_id)
+        if exercises is None:
+            return None
+
+        exercise_id = await ExerciseService.get_or_create(data.name, data.muscle_group.value)
+        order_index = data.order_index if data.order_index is not None else len(exercises)
+        supabase = get_supabase()
+        response = WorkoutSessionService._write(user_id, workout_id, supabase.table("workout_exercises").insert({
+            "workout_id": workout_id,
+            "exercise_id": exercise_id,
+            "order_index": order_index
+        }))
+        if response is None:
+            return None
+
+        we = response.data[0]
+        exercises.add(we["id"])
+        resource_versions.bump(user_id, WORKOUTS)
+        return {
+            "id": exercise_id,
+            "name": data.name,
+            "muscle_group": data.muscle_group,
+            "order_index": order_index,
+            "workout_exercise_id": we["id"]
+        }
+
+    @staticmethod
+    async def update_exercise(user_id: str, workout_id: str, workout_exercise_id: str, data: SessionExerciseUpdate) -> Optional[dict]:
+        """Swaps the exercise (by name) and/or moves it."""
+        exercises = WorkoutSessionService._session(user_id, workout_id, workout_exercise_id)
+        if exercises is None or workout_exercise_id not in exercises:
+            return None
+
+        changes = {}
+        if data.name:
+            muscle_group = data.muscle_group or MuscleGroup.OTHER
+            changes["exercise_id"] = await ExerciseService.get_or_create(data.name, muscle_group.value)
+        if data.order_index is not None:
+            changes["order_index"] = data.order_index
+
+        supabase = get_supabase()
+        if changes:
+            response = WorkoutSessionService._write(user_id, workout_id, supabase.table("workout_exercises")
+                       .update(changes)
+                       .eq("id", workout_exercise_id))
+            resource_versions.bump(user_id, WORKOUTS)
+        else:
+            response = supabase.table("workout_exercises").select("*").eq("id", workout_exercise_id).execute()
+        if response is None or not response.data:
+            return None
+
+        we = response.data[0]
+        exercise = await ExerciseService.get_by_id(we["exercise_id"])
+        return {
+            "id": we["exercise_id"],
+            "name": exercise["name"],
+            "muscle_group": exercise["muscle_group"],
+            "order_index": we["order_index"],
+            "workout_exercise_id": we["id"]
+        }
+
+    @staticmethod
+    async def append_set(user_id: str, workout_id: str, workout_exercise_id: str, data: SetAppend) -> Optional[dict]:
+        exercises = WorkoutSessionService._session(user_id, workout_id, workout_exercise_id)
+        if exercises is None or workout_exercise_id not in exercises:
+            return None
+
+        supabase = get_supabase()
+        set_order = data.set_order
+        if set_order is None:
+            # Clients that track positions send setOrder and skip this count
+            set_order = (supabase.table("sets")
+                        .select("id", count="exact")
+                        .eq("workout_exercise_id", workout_exercise_id)
+                        .execute()).count or 0
+
+        response = WorkoutSessionService._write(user_id, workout_id, supabase.table("sets").insert({
+            "workout_exercise_id": workout_exercise_id,
+            "set_order": set_order,
+            **WorkoutSessionService._set_row(data)
+        }))
+        if response is None:
+            return None
+        resource_versions.bump(user_id, WORKOUTS)
+        return response.data[0]
+
+    @staticmethod
+    async def update_set(user_id: str, workout_id: str, workout_exercise_id: str, set_id: str, data: SetUpdate) -> Optional[dict]:
+        exercises = WorkoutSessionService._session(user_id, workout_id, workout_exercise_id)
+        if exercises is None or workout_exercise_id not in exercises:
+            return None
+
+        supabase = get_supabase()
+        changes = WorkoutSessionService._set_row(data)
+        if changes:
+            response = WorkoutSessionService._write(user_id, workout_id, supabase.table("sets")
+                       .update(changes)
+                       .eq("id", set_id)
+                       .eq("workout_exercise_id", workout_exercise_id))
+            if response is None:
+                return None
+            resource_versions.bump(user_id, WORKOUTS)
+        else:
+            response = (supabase.table("sets")
+                       .select("*")
+                       .eq("id", set_id)
+                       .eq("workout_exercise_id", workout_exercise_id)
+                       .execute())
+        return response.data[0] if response.data else None
+
+    @staticmethod
+    async def finish_workout(user_id: str, workout_id: str, data: WorkoutFinish) -> Optional[dict]:
+        """Stores the workout's totals and duration, and applies template progressive overload."""
+        if WorkoutSessionService._session(user_id, workout_id) is None:
+            return None
+
+        workout = await WorkoutService.get_workout_by_id(workout_id)
+        exercises = [
+            SimpleNamespace(
+                exercise_id=ex["id"],
+                muscle_group=ex["muscleGroup"],
+                sets=[Set.model_validate(s) for s in sorted(ex["sets"], key=lambda s: s.get("set_order") or 0)]
+            )
+            for ex in workout["exercises"]
+        ]
+
+        duration = data.duration_minutes
+        if duration is None:
+            started = datetime.fromisoformat(str(workout["created_at"]))
+            if started.tzinfo is None:
+                started = started.replace(tzinfo=timezone.utc)
+            duration = max(1, round((datetime.now(timezone.utc) - started).total_seconds() / 60))
+
+        changes = {
+            **WorkoutService._summarize(exercises),
+            "duration_minutes": duration,
+            "in_progress": False,
+            "finished_at": datetime.now(timezone.utc).isoformat()
+        }
+        if data.notes is not None:
+            changes["notes"] = data.notes
+
+        supabase = get_supabase()
+        supabase.table("workouts").update(changes).eq("id", workout_id).eq("user_id", user_id).execute()
+
+        if workout.get("template_id"):
+            for ex in exercises:
+                if ex.sets:
+                    WorkoutService._apply_progressive_overload(str(workout["template_id"]), ex.exercise_id, ex.sets[0])
+            resource_versions.bump(user_id, TEMPLATES)
+
+        session_cache.invalidate((str(user_id), str(workout_id)))
+        resource_versions.bump(user_id, WORKOUTS)
+        return {**workout, **changes}
+
+
+# Global Instance
+session_cache = TTLCache(maxsize=WORKOUT_SESSION_CACHE_SIZE, ttl=WORKOUT_SESSION_TTL_SECONDS)
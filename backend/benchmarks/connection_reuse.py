@@ -0,0 +1,125 @@
+"""
+Connection reuse benchmark for the Supabase HTTP transport.
+
+Fires concurrent requests through (a) the pooled client from app.db.client and
+(b) a fresh client per request, and reports throughput, latency and how many
+TCP connections were opened.
+
+By default it targets a local keep-alive HTTP server with a small simulated
+latency, so connection counts can be observed exactly. Point it at a real
+project with --url (e.g. "$SUPABASE_URL/rest/v1/") to measure TLS/HTTP2 effects.
+
+Usage (from backend/):
+    python -m benchmarks.connection_reuse [--workers 16] [--requests 400] [--url URL]
+"""
+import argparse
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "benchmark")
+
+from app.db.client import build_http_client  # noqa: E402
+
+
+class _CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, *args, delay: float = 0.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delay = delay
+        self.connections = 0
+        self._lock = threading.Lock()
+
+    def get_request(self):
+        conn = super().get_request()
+        with self._lock:
+            self.connections += 1
+        return conn
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(self.server.delay)
+        body = b'[{"id":"00000000-0000-0000-0000-000000000000"}]'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _run(label, fetch, workers, total):
+    latencies = []
+    lock = threading.Lock()
+
+    def one(_):
+        started = time.perf_counter()
+        fetch()
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(one, range(total)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<22} {total / wall:8.1f} req/s   p50 {statistics.median(latencies) * 1000:7.1f}ms   p95 {p95 * 1000:7.1f}ms", end="")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Target URL (default: local keep-alive server)")
+    parser.add_argument("--workers", type=int, default=16, help="Concurrent threads")
+    parser.add_argument("--requests", type=int, default=400, help="Requests per scenario")
+    parser.add_argument("--delay", type=float, default=0.005, help="Simulated server latency (local server only)")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    headers = {}
+    if url is None:
+        server = _CountingServer(("127.0.0.1", 0), _Handler, delay=args.delay)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/rest/v1/exercises"
+    else:
+        key = os.environ.get("SUPABASE_SERVICE_ROLE_KEY") or os.environ.get("SUPABASE_KEY")
+        headers = {"apikey": key, "Authorization": f"Bearer {key}"}
+
+    def connections_since(before):
+        return f"   {server.connections - before} connections" if server else ""
+
+    pooled = build_http_client()
+    before = server.connections if server else 0
+    _run("pooled (app client)", lambda: pooled.get(url, headers=headers).raise_for_status(), args.workers, args.requests)
+    print(connections_since(before))
+    pooled.close()
+
+    def fresh():
+        with httpx.Client() as client:
+            client.get(url, headers=headers).raise_for_status()
+
+    before = server.connections if server else 0
+    _run("new client per request", fresh, args.workers, args.requests)
+    print(connections_since(before))
+
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
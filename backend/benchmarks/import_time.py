@@ -0,0 +1,80 @@
+"""
+Cold-start import benchmark for the API.
+
+Runs `python -X importtime -c "import app.main"` in fresh interpreters and checks
+that importing the app stays under the target and never pulls in the ADK/GenAI stack.
+
+Usage (from backend/):
+    python -m benchmarks.import_time [--runs 5] [--target 1.5]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+# Cumulative import time of app.main, in seconds. Before lazy agent loading this was ~8s.
+DEFAULT_TARGET_SECONDS = 1.5
+HEAVY_MODULES = ("google.adk", "google.genai")
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def measure_once(module: str):
+    env = dict(os.environ)
+    # The Supabase client is built at import time; it only needs syntactically valid settings.
+    env.setdefault("SUPABASE_URL", "http://localhost:54321")
+    env.setdefault("SUPABASE_KEY", "benchmark")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), len(indent)))
+    total_us = next(cum for name, _, cum, _ in entries if name == module)
+    return total_us / 1e6, entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--target", type=float, default=DEFAULT_TARGET_SECONDS, help="Median import time budget in seconds")
+    parser.add_argument("--top", type=int, default=10, help="Show the N slowest top-level imports")
+    args = parser.parse_args()
+
+    timings = []
+    entries = []
+    for _ in range(args.runs):
+        seconds, entries = measure_once(args.module)
+        timings.append(seconds)
+
+    median = statistics.median(timings)
+    print(f"import {args.module}: median {median:.3f}s, min {min(timings):.3f}s, max {max(timings):.3f}s over {args.runs} runs")
+
+    print(f"\nSlowest direct imports of {args.module} (last run):")
+    module_depth = next(depth for name, _, _, depth in entries if name == args.module)
+    direct = sorted((e for e in entries if e[3] == module_depth + 2), key=lambda e: e[2], reverse=True)
+    for name, _, cumulative_us, _ in direct[:args.top]:
+        print(f"  {cumulative_us / 1000:9.1f}ms  {name}")
+
+    failures = []
+    heavy = sorted({name for name, *_ in entries if name.startswith(HEAVY_MODULES)})
+    if heavy:
+        failures.append(f"agent stack imported eagerly: {', '.join(heavy[:5])}")
+    if median > args.target:
+        failures.append(f"median {median:.3f}s exceeds target {args.target:.3f}s")
+
+    if failures:
+        print("\nFAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print(f"\nOK: under {args.target:.3f}s target")
+
+
+if __name__ == "__main__":
+    main()
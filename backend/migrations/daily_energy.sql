@@ -0,0 +1,37 @@
+-- Daily energy totals per user: calories eaten (meals) and burnt (workout sets).
+-- Aggregated in the database so /goals/progress receives one row per day,
+-- however many meals and sets a multi-year range contains.
+
+-- Reads meals and workouts by (user_id, date): meals_user_date_idx and
+-- workouts_user_date_idx in migrations/indexes.sql.
+
+create or replace function public.get_daily_energy(p_user_id uuid, p_from date, p_to date)
+returns table (day date, calories_in bigint, calories_burnt numeric)
+language sql
+stable
+security invoker
+as $$
+  with intake as (
+    select m.date as day, sum(m.total_calories)::bigint as calories_in
+    from public.meals m
+    where m.user_id = p_user_id
+      and m.date between p_from and p_to
+    group by m.date
+  ),
+  burn as (
+    select (w.date at time zone 'utc')::date as day, sum(s.calories_burnt) as calories_burnt
+    from public.workouts w
+    join public.workout_exercises we on we.workout_id = w.id
+    join public.sets s on s.workout_exercise_id = we.id
+    where w.user_id = p_user_id
+      and w.date >= p_from
+      and w.date < p_to + 1
+    group by 1
+  )
+  select coalesce(i.day, b.day) as day,
+         coalesce(i.calories_in, 0) as calories_in,
+         coalesce(b.calories_burnt, 0) as calories_burnt
+  from intake i
+  full outer join burn b on b.day = i.day
+  order by 1;
+$$;
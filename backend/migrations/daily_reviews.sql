@@ -0,0 +1,18 @@
+-- Cached AI daily reviews (one row per user, day and section)
+create table if not exists public.daily_reviews (
+  id uuid default gen_random_uuid() primary key,
+  user_id uuid references auth.users(id) not null,
+  date date not null,
+  section text not null, -- 'activity' or 'diet'
+  review text not null,
+  source_marker text not null, -- row count + latest created_at of the reviewed data
+  generated_at timestamp with time zone default timezone('utc'::text, now()) not null,
+  unique (user_id, date, section)
+);
+
+-- RLS Policies
+alter table public.daily_reviews enable row level security;
+
+create policy "Users can view their own reviews"
+  on public.daily_reviews for select
+  using (auth.uid() = user_id);
@@ -0,0 +1,19 @@
+-- Food lookup for POST /agents/food/parse (app/agents/tools.py get_db_food_items).
+-- One call for every food of the text, limited per pattern: with one shared limit a
+-- frequently logged food (e.g. hundreds of "egg" rows) pushed the other foods out.
+-- Exact name matches come first, then the newest rows containing the pattern.
+-- Patterns are letters, digits and spaces only (diet_agent._db_pattern), so they need no escaping.
+
+create or replace function public.search_food_items(p_patterns text[], p_limit integer default 20)
+returns table (pattern text, name text, calories integer, protein numeric, carbs numeric, fats numeric, quantity numeric)
+language sql stable as $$
+  select p.pattern, f.name, f.calories, f.protein, f.carbs, f.fats, f.quantity
+  from unnest(p_patterns) as p(pattern)
+  cross join lateral (
+    select fi.name, fi.calories, fi.protein, fi.carbs, fi.fats, fi.quantity
+    from public.food_items fi
+    where fi.name ilike '%' || p.pattern || '%'
+    order by lower(fi.name) = p.pattern desc, fi.created_at desc
+    limit p_limit
+  ) f;
+$$;
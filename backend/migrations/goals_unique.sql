@@ -0,0 +1,13 @@
+-- One goal per user, so GoalService.create_goal can upsert on user_id in a single round trip.
+
+-- Keep only the most recently updated goal of users that have several
+delete from public.goals g
+using public.goals newer
+where newer.user_id = g.user_id
+  and (newer.updated_at, newer.id) > (g.updated_at, g.id);
+
+alter table public.goals drop constraint if exists goals_user_id_key;
+alter table public.goals add constraint goals_user_id_key unique (user_id);
+
+-- The unique constraint's index replaces the plain one from indexes.sql
+drop index if exists public.goals_user_idx;
@@ -0,0 +1,35 @@
+-- Secondary indexes for the service queries (app/services, app/db/postgres.py).
+-- Postgres does not index foreign keys by itself, so every embedded select
+-- (workout -> workout_exercises -> sets, meal -> food_items) used to scan the child table.
+-- Verify with: python -m benchmarks.query_plans --dsn postgresql://...
+
+create extension if not exists pg_trgm;
+
+-- Workouts: list / by-day / last performance (user_id = ? order by date desc)
+create index if not exists workouts_user_date_idx on public.workouts (user_id, date);
+
+-- Embedded exercises and sets of a workout
+create index if not exists workout_exercises_workout_idx on public.workout_exercises (workout_id, order_index);
+-- Last performance: latest workout containing a given exercise
+create index if not exists workout_exercises_exercise_idx on public.workout_exercises (exercise_id, workout_id);
+create index if not exists sets_workout_exercise_idx on public.sets (workout_exercise_id, set_order);
+
+-- Exercise lookup by name when logging a workout and for last performance
+create index if not exists exercises_name_idx on public.exercises (name);
+
+-- Meals of a day or date range
+create index if not exists meals_user_date_idx on public.meals (user_id, date);
+
+-- Embedded items of a meal
+create index if not exists food_items_meal_idx on public.food_items (meal_id);
+-- Recent foods (order by created_at desc limit 20)
+create index if not exists food_items_created_idx on public.food_items (created_at desc);
+-- Food search (name ilike '%...%')
+create index if not exists food_items_name_trgm_idx on public.food_items using gin (name gin_trgm_ops);
+
+-- Templates of a user and their exercises; progressive-overload update by (template_id, exercise_id)
+create index if not exists workout_templates_user_idx on public.workout_templates (user_id);
+create index if not exists workout_template_exercises_template_idx on public.workout_template_exercises (template_id, exercise_id);
+
+-- One goal per user lookup
+create index if not exists goals_user_idx on public.goals (user_id);
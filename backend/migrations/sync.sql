@@ -0,0 +1,265 @@
+-- Delta sync support for GET /sync?since=<cursor>
+-- * updated_at on every synced parent row, maintained by triggers
+-- * child rows (exercises, sets, food items) touch their parent, so a changed
+--   set re-sends its workout
+-- * deletes leave a tombstone
+-- * get_sync_changes() returns everything changed since a cursor in one call
+
+-- 1. updated_at columns
+alter table public.workouts add column if not exists updated_at timestamp with time zone default clock_timestamp() not null;
+alter table public.meals add column if not exists updated_at timestamp with time zone default clock_timestamp() not null;
+alter table public.workout_templates add column if not exists updated_at timestamp with time zone default clock_timestamp() not null;
+-- goals already has updated_at (migrations/goals.sql)
+
+create or replace function public.sync_set_updated_at()
+returns trigger as $$
+begin
+  -- clock_timestamp(), not now(): the cursor logic relies on the time of the write itself
+  new.updated_at := clock_timestamp();
+  return new;
+end;
+$$ language plpgsql;
+
+drop trigger if exists sync_updated_at on public.workouts;
+create trigger sync_updated_at before insert or update on public.workouts
+  for each row execute procedure public.sync_set_updated_at();
+drop trigger if exists sync_updated_at on public.meals;
+create trigger sync_updated_at before insert or update on public.meals
+  for each row execute procedure public.sync_set_updated_at();
+drop trigger if exists sync_updated_at on public.workout_templates;
+create trigger sync_updated_at before insert or update on public.workout_templates
+  for each row execute procedure public.sync_set_updated_at();
+drop trigger if exists sync_updated_at on public.goals;
+create trigger sync_updated_at before insert or update on public.goals
+  for each row execute procedure public.sync_set_updated_at();
+
+-- 2. Children touch their parent (once per transaction: updated_at < now() is false after the first touch)
+create or replace function public.sync_touch_workout()
+returns trigger as $$
+declare
+  v_row record;
+  v_workout_id uuid;
+begin
+  if tg_op = 'DELETE' then v_row := old; else v_row := new; end if;
+  if tg_table_name = 'sets' then
+    select workout_id into v_workout_id
+    from public.workout_exercises
+    where id = v_row.workout_exercise_id;
+  else
+    v_workout_id := v_row.workout_id;
+  end if;
+  update public.workouts set updated_at = clock_timestamp()
+  where id = v_workout_id and updated_at < now();
+  return null;
+end;
+$$ language plpgsql;
+
+create or replace function public.sync_touch_meal()
+returns trigger as $$
+declare
+  v_row record;
+begin
+  if tg_op = 'DELETE' then v_row := old; else v_row := new; end if;
+  update public.meals set updated_at = clock_timestamp()
+  where id = v_row.meal_id and updated_at < now();
+  return null;
+end;
+$$ language plpgsql;
+
+create or replace function public.sync_touch_template()
+returns trigger as $$
+declare
+  v_row record;
+begin
+  if tg_op = 'DELETE' then v_row := old; else v_row := new; end if;
+  update public.workout_templates set updated_at = clock_timestamp()
+  where id = v_row.template_id and updated_at < now();
+  return null;
+end;
+$$ language plpgsql;
+
+drop trigger if exists sync_touch_parent on public.workout_exercises;
+create trigger sync_touch_parent after insert or update or delete on public.workout_exercises
+  for each row execute procedure public.sync_touch_workout();
+drop trigger if exists sync_touch_parent on public.sets;
+create trigger sync_touch_parent after insert or update or delete on public.sets
+  for each row execute procedure public.sync_touch_workout();
+drop trigger if exists sync_touch_parent on public.food_items;
+create trigger sync_touch_parent after insert or update or delete on public.food_items
+  for each row execute procedure public.sync_touch_meal();
+drop trigger if exists sync_touch_parent on public.workout_template_exercises;
+create trigger sync_touch_parent after insert or update or delete on public.workout_template_exercises
+  for each row execute procedure public.sync_touch_template();
+
+-- 3. Tombstones
+create table if not exists public.sync_tombstones (
+  id bigserial primary key,
+  user_id uuid not null,
+  resource text not null, -- 'workouts', 'meals', 'templates', 'goals'
+  row_id uuid not null,
+  deleted_at timestamp with time zone default clock_timestamp() not null
+);
+
+alter table public.sync_tombstones enable row level security;
+create policy "Users can view their own tombstones"
+  on public.sync_tombstones for select
+  using (auth.uid() = user_id);
+
+create or replace function public.sync_record_delete()
+returns trigger as $$
+begin
+  insert into public.sync_tombstones (user_id, resource, row_id)
+  values (old.user_id, tg_argv[0], old.id);
+  return null;
+end;
+$$ language plpgsql security definer set search_path = public;
+
+drop trigger if exists sync_tombstone on public.workouts;
+create trigger sync_tombstone after delete on public.workouts
+  for each row execute procedure public.sync_record_delete('workouts');
+drop trigger if exists sync_tombstone on public.meals;
+create trigger sync_tombstone after delete on public.meals
+  for each row execute procedure public.sync_record_delete('meals');
+drop trigger if exists sync_tombstone on public.workout_templates;
+create trigger sync_tombstone after delete on public.workout_templates
+  for each row execute procedure public.sync_record_delete('templates');
+drop trigger if exists sync_tombstone on public.goals;
+create trigger sync_tombstone after delete on public.goals
+  for each row execute procedure public.sync_record_delete('goals');
+
+-- Tombstones older than the API's SYNC_TOMBSTONE_DAYS can be dropped (e.g. nightly with pg_cron)
+create or replace function public.purge_sync_tombstones(p_before timestamp with time zone)
+returns void as $$
+  delete from public.sync_tombstones where deleted_at < p_before;
+$$ language sql;
+
+-- 4. Indexes: an up-to-date client costs one index probe per table
+create index if not exists workouts_user_updated_idx on public.workouts (user_id, updated_at);
+create index if not exists meals_user_updated_idx on public.meals (user_id, updated_at);
+create index if not exists workout_templates_user_updated_idx on public.workout_templates (user_id, updated_at);
+create index if not exists goals_user_updated_idx on public.goals (user_id, updated_at);
+create index if not exists sync_tombstones_user_deleted_idx on public.sync_tombstones (user_id, deleted_at);
+
+-- 5. Watermark: no row with updated_at below it can still become visible.
+-- A write transaction still in flight stamps its rows after its own start, so the
+-- cursor never passes the oldest in-flight writer. The small margin covers the gap
+-- between a row being stamped and its transaction being assigned an xid.
+create or replace function public.sync_watermark()
+returns timestamp with time zone as $$
+  select least(
+    clock_timestamp(),
+    coalesce((
+      select min(xact_start)
+      from pg_stat_activity
+      where backend_xid is not null and pid <> pg_backend_pid()
+    ), clock_timestamp())
+  ) - interval '1 second';
+$$ language sql volatile security definer set search_path = public;
+
+-- 6. Changes since a cursor, shaped like the regular list endpoints.
+-- plpgsql + volatile: the data query takes a fresh snapshot *after* the watermark is read.
+create or replace function public.get_sync_changes(p_user_id uuid, p_since timestamp with time zone)
+returns json as $$
+declare
+  v_cursor timestamp with time zone;
+  v_result json;
+begin
+  v_cursor := public.sync_watermark();
+
+  select json_build_object(
+    'cursor', v_cursor,
+    'workouts', coalesce((
+      select json_agg(json_build_object(
+        'id', w.id, 'user_id', w.user_id, 'name', w.name, 'date', w.date,
+        'duration_minutes', w.duration_minutes, 'notes', w.notes, 'updated_at', w.updated_at,
+        'exercises', coalesce((
+          select json_agg(json_build_object(
+            'id', e.id,
+            'name', e.name,
+            'muscleGroup', e.muscle_group,
+            'workout_exercise_id', we.id,
+            'sets', coalesce((
+              select json_agg(to_json(s) order by s.set_order)
+              from public.sets s
+              where s.workout_exercise_id = we.id
+            ), '[]'::json)
+          ) order by we.order_index)
+          from public.workout_exercises we
+          join public.exercises e on e.id = we.exercise_id
+          where we.workout_id = w.id
+        ), '[]'::json)
+      ) order by w.updated_at)
+      from public.workouts w
+      where w.user_id = p_user_id and (p_since is null or w.updated_at >= p_since)
+    ), '[]'::json),
+    'meals', coalesce((
+      select json_agg(json_build_object(
+        'id', m.id, 'user_id', m.user_id, 'name', m.name, 'date', m.date, 'type', m.type,
+        'total_calories', m.total_calories, 'total_protein', m.total_protein,
+        'total_carbs', m.total_carbs, 'total_fats', m.total_fats, 'updated_at', m.updated_at,
+        'items', coalesce((
+          select json_agg(to_json(f) order by f.created_at)
+          from public.food_items f
+          where f.meal_id = m.id
+        ), '[]'::json)
+      ) order by m.updated_at)
+      from public.meals m
+      where m.user_id = p_user_id and (p_since is null or m.updated_at >= p_since)
+    ), '[]'::json),
+    'templates', coalesce((
+      select json_agg(json_build_object(
+        'id', t.id, 'user_id', t.user_id, 'name', t.name, 'description', t.description,
+        'created_at', t.created_at, 'updated_at', t.updated_at,
+        'workout_template_exercises', coalesce((
+          select json_agg(to_jsonb(te) || jsonb_build_object('exercises', to_jsonb(e)) order by te.order_index)
+          from public.workout_template_exercises te
+          left join public.exercises e on e.id = te.exercise_id
+          where te.template_id = t.id
+        ), '[]'::json)
+      ) order by t.updated_at)
+      from public.workout_templates t
+      where t.user_id = p_user_id and (p_since is null or t.updated_at >= p_since)
+    ), '[]'::json),
+    'goal', (
+      select to_json(g)
+      from public.goals g
+      where g.user_id = p_user_id and (p_since is null or g.updated_at >= p_since)
+      order by g.updated_at desc
+      limit 1
+    ),
+    'deleted', coalesce((
+      select json_agg(json_build_object('resource', d.resource, 'id', d.row_id, 'deleted_at', d.deleted_at) order by d.deleted_at)
+      from public.sync_tombstones d
+      where d.user_id = p_user_id and p_since is not null and d.deleted_at >= p_since
+    ), '[]'::json)
+  ) into v_result;
+
+  return v_result;
+end;
+$$ language plpgsql volatile security definer set search_path = public;
+
+-- 7. Last write per resource, for the API's ETags (app/core/etag.py). Read from the
+-- database so every API worker tags the same data the same way. One index probe per table.
+create or replace function public.get_resource_versions(p_user_id uuid)
+returns json as $$
+  select json_build_object(
+    'workouts', greatest(
+      (select max(updated_at) from public.workouts where user_id = p_user_id),
+      (select max(deleted_at) from public.sync_tombstones where user_id = p_user_id and resource = 'workouts')),
+    'meals', greatest(
+      (select max(updated_at) from public.meals where user_id = p_user_id),
+      (select max(deleted_at) from public.sync_tombstones where user_id = p_user_id and resource = 'meals')),
+    'templates', greatest(
+      (select max(updated_at) from public.workout_templates where user_id = p_user_id),
+      (select max(deleted_at) from public.sync_tombstones where user_id = p_user_id and resource = 'templates')),
+    'goals', greatest(
+      (select max(updated_at) from public.goals where user_id = p_user_id),
+      (select max(deleted_at) from public.sync_tombstones where user_id = p_user_id and resource = 'goals'))
+  );
+$$ language sql stable security definer set search_path = public;
+
+-- The function takes the user id as a parameter: only the API (service role) may call it
+revoke execute on function public.get_sync_changes(uuid, timestamp with time zone) from public, anon, authenticated;
+revoke execute on function public.sync_watermark() from public, anon, authenticated;
+revoke execute on function public.get_resource_versions(uuid) from public, anon, authenticated;
+revoke execute on function public.purge_sync_tombstones(timestamp with time zone) from public, anon, authenticated;
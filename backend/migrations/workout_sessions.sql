@@ -0,0 +1,37 @@
+-- In-session workout logging (POST /workouts/start ... /finish)
+-- template_id: progressive-overload target applied when the session is finished
+-- in_progress: set by /start, cleared by /finish; rows from POST /workouts/ are finished on insert
+alter table public.workouts add column if not exists template_id uuid references public.workout_templates(id) on delete set null;
+alter table public.workouts add column if not exists in_progress boolean default false not null;
+-- finished_at: set by /finish. The API caches session ownership per worker, so the
+-- finished state is enforced here, on the write itself: a worker whose cache still
+-- holds the session cannot add exercises or sets after another worker finished it.
+alter table public.workouts add column if not exists finished_at timestamp with time zone;
+
+create or replace function public.reject_finished_session_writes()
+returns trigger as $$
+declare
+  v_workout_id uuid;
+begin
+  if tg_table_name = 'sets' then
+    select workout_id into v_workout_id
+    from public.workout_exercises
+    where id = new.workout_exercise_id;
+  else
+    v_workout_id := new.workout_id;
+  end if;
+  if exists (select 1 from public.workouts where id = v_workout_id and finished_at is not null) then
+    -- object_not_in_prerequisite_state: app/services/workout_session_service.py answers 404
+    raise exception 'workout % is finished', v_workout_id using errcode = '55000';
+  end if;
+  return new;
+end;
+$$ language plpgsql;
+
+-- Deletes are allowed, so deleting a finished workout still cascades
+drop trigger if exists reject_finished_session_writes on public.workout_exercises;
+create trigger reject_finished_session_writes before insert or update on public.workout_exercises
+  for each row execute procedure public.reject_finished_session_writes();
+drop trigger if exists reject_finished_session_writes on public.sets;
+create trigger reject_finished_session_writes before insert or update on public.sets
+  for each row execute procedure public.reject_finished_session_writes();
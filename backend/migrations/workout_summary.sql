@@ -0,0 +1,33 @@
+-- Denormalized per-workout totals, written by WorkoutService.create_workout.
+-- GET /workouts/?view=compact reads only these columns, without touching sets.
+-- Cardio sets (Cardio exercises, or sets with time but no reps) count towards
+-- cardio_calories; all other sets towards total_volume (reps x weight).
+
+alter table public.workouts
+  add column if not exists exercise_count integer default 0 not null,
+  add column if not exists set_count integer default 0 not null,
+  add column if not exists total_volume numeric default 0 not null,
+  add column if not exists cardio_calories numeric default 0 not null;
+
+-- Backfill existing workouts
+update public.workouts w
+set exercise_count = t.exercise_count,
+    set_count = t.set_count,
+    total_volume = t.total_volume,
+    cardio_calories = t.cardio_calories
+from (
+  select we.workout_id,
+         count(distinct we.id) as exercise_count,
+         count(s.id) as set_count,
+         coalesce(sum(s.reps * s.weight) filter (
+           where not (e.muscle_group = 'Cardio' or (coalesce(s.reps, 0) = 0 and coalesce(s.time_seconds, 0) > 0))
+         ), 0) as total_volume,
+         coalesce(sum(s.calories_burnt) filter (
+           where e.muscle_group = 'Cardio' or (coalesce(s.reps, 0) = 0 and coalesce(s.time_seconds, 0) > 0)
+         ), 0) as cardio_calories
+  from public.workout_exercises we
+  join public.exercises e on e.id = we.exercise_id
+  left join public.sets s on s.workout_exercise_id = we.id
+  group by we.workout_id
+) t
+where t.workout_id = w.id;
@@ -0,0 +1,330 @@
+import re
+import copy
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from postgrest.exceptions import APIError
+
+from app.db import client as db_client
+from app.auth import get_current_user
+from app.core.etag import resource_versions
+
+USER_ID = "00000000-0000-0000-0000-0000000000aa"
+OTHER_USER_ID = "00000000-0000-0000-0000-0000000000bb"
+
+# Tables whose foreign key to the parent does not follow the "<singular>_id" naming
+_FK_NAMES = {"workout_templates": "template_id"}
+_HTTP_METHODS = {"select": "GET", "insert": "POST", "upsert": "POST", "update": "PATCH", "delete": "DELETE"}
+# Tables migrations/sync.sql stamps with updated_at and tombstones on delete, by sync resource
+_SYNCED = {"workouts": "workouts", "meals": "meals", "workout_templates": "templates", "goals": "goals"}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _split(select: str):
+    """Top-level comma split of a PostgREST select ("*, a(b, c(d))" -> ["*", "a(b, c(d))"])."""
+    parts, depth, current = [], 0, ""
+    for char in select:
+        if char == "," and depth == 0:
+            parts.append(current.strip())
+            current = ""
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current += char
+    if current.strip():
+        parts.append(current.strip())
+    return parts
+
+
+def _fk(table: str) -> str:
+    return _FK_NAMES.get(table, table[:-1] + "_id")
+
+
+class FakeQuery:
+    """Just enough of postgrest's request builder for the services: filters, embeds, writes."""
+
+    def __init__(self, db: "FakeSupabase", table: str):
+        self.db = db
+        self.table_name = table
+        self.op = "select"
+        self.columns = "*"
+        self.filters = []
+        self.payload = None
+        self.count = None
+        self.single_row = False
+        self.on_conflict = None
+        self.order_by = []
+        self.limit_to = None
+        self.range_to = None
+        self.params = []
+
+    @property
+    def request(self):
+        # What app/db/client.py TimedQuery records: the HTTP method and PostgREST query string
+        params = ([("select", self.columns)] if self.op == "select" else []) + self.params
+        return SimpleNamespace(http_method=_HTTP_METHODS[self.op], params=httpx.QueryParams(params))
+
+    # Builder
+    def select(self, columns: str = "*", count=None):
+        self.columns, self.count = columns, count
+        return self
+
+    def insert(self, payload, **kwargs):
+        self.op, self.payload = "insert", payload
+        return self
+
+    def upsert(self, payload, on_conflict: str = "id", **kwargs):
+        self.op, self.payload, self.on_conflict = "upsert", payload, on_conflict
+        return self
+
+    def update(self, payload):
+        self.op, self.payload = "update", payload
+        return self
+
+    def delete(self):
+        self.op = "delete"
+        return self
+
+    def _filter(self, column, test, param=None):
+        self.filters.append((column, test))
+        if param is not None:
+            self.params.append((column, param))
+        return self
+
+    def eq(self, column, value):
+        return self._filter(column, lambda v: str(v) == str(value), f"eq.{value}")
+
+    def in_(self, column, values):
+        values = {str(v) for v in values}
+        return self._filter(column, lambda v: str(v) in values, f"in.({','.join(sorted(values))})")
+
+    def gte(self, column, value):
+        return self._filter(column, lambda v: v is not None and str(v) >= str(value), f"gte.{value}")
+
+    def lte(self, column, value):
+        return self._filter(column, lambda v: v is not None and str(v) <= str(value), f"lte.{value}")
+
+    def ilike(self, column, pattern):
+        regex = re.compile("^" + re.escape(pattern).replace("%", ".*") + "$", re.I)
+        return self._filter(column, lambda v: v is not None and bool(regex.match(str(v))), f"ilike.{pattern}")
+
+    def order(self, column, desc: bool = False, **kwargs):
+        self.order_by.append((column, desc))
+        return self
+
+    def limit(self, n):
+        self.limit_to = n
+        return self
+
+    def range(self, start, end):
+        self.range_to = (start, end)
+        return self
+
+    def single(self):
+        self.single_row = True
+        return self
+
+    # Execution
+    def _matches(self, row):
+        for column, test in self.filters:
+            if "." not in column and not test(row.get(column)):
+                return False
+        return True
+
+    def _embed(self, table, row, columns):
+        out = {}
+        parts = _split(columns)
+        if "*" in parts or not parts:
+            out.update(row)
+        for part in parts:
+            if part == "*":
+                continue
+            if "(" not in part:
+                out[part] = row.get(part)
+                continue
+            name, inner = part.split("(", 1)
+            relation = name.split("!")[0].strip()
+            inner = inner[:-1]
+            children = self.db.rows(relation)
+            # Many-to-one when this row holds the key ("exercise_id" -> exercises), else one-to-many
+            if _fk(relation) not in row:
+                related = [c for c in children if str(c.get(_fk(table))) == str(row["id"])]
+                if inner.strip() == "count":
+                    out[relation] = [{"count": len(related)}]
+                else:
+                    out[relation] = [self._embed(relation, c, inner) for c in related]
+            else:
+                parent = next((c for c in children if str(c["id"]) == str(row.get(_fk(relation)))), None)
+                out[relation] = self._embed(relation, parent, inner) if parent else None
+        return out
+
+    def _reject_finished(self, row):
+        # migrations/workout_sessions.sql reject_finished_session_writes()
+        if self.table_name not in ("sets", "workout_exercises"):
+            return
+        workout_id = row.get("workout_id")
+        if self.table_name == "sets":
+            parent = next((we for we in self.db.rows("workout_exercises") if we["id"] == str(row.get("workout_exercise_id"))), {})
+            workout_id = parent.get("workout_id")
+        if any(w["id"] == str(workout_id) and w.get("finished_at") for w in self.db.rows("workouts")):
+            raise APIError({"code": "55000", "message": f"workout {workout_id} is finished"})
+
+    def execute(self):
+        self.db.calls.append((self.table_name, self.op))
+        if self.db.fail_on and (self.table_name, self.op) in self.db.fail_on:
+            raise RuntimeError(f"{self.op} on {self.table_name} failed")
+        rows = self.db.rows(self.table_name)
+
+        if self.op in ("insert", "upsert"):
+            items = self.payload if isinstance(self.payload, list) else [self.payload]
+            out = []
+            for item in items:
+                item = copy.deepcopy(item)
+                self._reject_finished(item)
+                existing = None
+                if self.op == "upsert":
+                    keys = self.on_conflict.split(",")
+                    existing = next((r for r in rows if all(str(r.get(k)) == str(item.get(k)) for k in keys)), None)
+                if existing is not None:
+                    existing.update(item)
+                    out.append(copy.deepcopy(existing))
+                    continue
+                row = {"id": str(uuid.uuid4()), "created_at": _now(), **item}
+                if self.table_name in _SYNCED:
+                    row["updated_at"] = _now()
+                rows.append(row)
+                out.append(copy.deepcopy(row))
+            return SimpleNamespace(data=out, count=None)
+
+        matched = [r for r in rows if self._matches(r)]
+        if self.op == "update":
+            for r in matched:
+                self._reject_finished({**r, **self.payload})
+                r.update(copy.deepcopy(self.payload))
+                if self.table_name in _SYNCED:
+                    r["updated_at"] = _now()
+            return SimpleNamespace(data=copy.deepcopy(matched), count=None)
+        if self.op == "delete":
+            self.db.tables[self.table_name] = [r for r in rows if r not in matched]
+            if self.table_name in _SYNCED:
+                self.db.rows("sync_tombstones").extend(
+                    {"user_id": r.get("user_id"), "resource": _SYNCED[self.table_name], "row_id": r["id"], "deleted_at": _now()}
+                    for r in matched
+                )
+            return SimpleNamespace(data=copy.deepcopy(matched), count=None)
+
+        # Stable sorts from the last key to the first: .order(a).order(b) sorts by a, then b
+        for column, desc in reversed(self.order_by):
+            matched = sorted(matched, key=lambda r: str(r.get(column) or ""), reverse=desc)
+        if self.range_to:
+            matched = matched[self.range_to[0]:self.range_to[1] + 1]
+        if self.limit_to is not None:
+            matched = matched[:self.limit_to]
+        if self.db.max_rows is not None:
+            # PostgREST's max-rows: longer results are cut short without an error
+            matched = matched[:self.db.max_rows]
+        data = [copy.deepcopy(self._embed(self.table_name, r, self.columns)) for r in matched]
+        count = len(data) if self.count else None
+        if self.single_row:
+            data = data[0] if data else None
+        return SimpleNamespace(data=data, count=count)
+
+
+class FakeSupabase:
+    """In-memory stand-in for the Supabase client, installed as the process-wide client."""
+
+    def __init__(self):
+        self.tables = {}
+        self.calls = []
+        self.fail_on = set()
+        self.max_rows = None
+        # Stored functions: name -> callable(params) returning the response data
+        self.functions = {"get_resource_versions": self._resource_versions, "search_food_items": self._search_food_items}
+
+    def rows(self, table):
+        return self.tables.setdefault(table, [])
+
+    def add(self, table, **row):
+        row = {"id": str(uuid.uuid4()), "created_at": _now(), **row}
+        self.rows(table).append(row)
+        return row
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        def execute():
+            self.calls.append((name, "rpc"))
+            return SimpleNamespace(data=self.functions[name](params), count=None)
+        return SimpleNamespace(execute=execute, request=SimpleNamespace(http_method="POST", params=httpx.QueryParams()))
+
+    def _resource_versions(self, params):
+        # migrations/sync.sql get_resource_versions(): last write or delete per resource
+        user_id = params["p_user_id"]
+        versions = {}
+        for table, resource in _SYNCED.items():
+            stamps = [str(r.get("updated_at") or r["created_at"]) for r in self.rows(table) if str(r.get("user_id")) == user_id]
+            stamps += [t["deleted_at"] for t in self.rows("sync_tombstones") if t["user_id"] == user_id and t["resource"] == resource]
+            versions[resource] = max(stamps, default=None)
+        return versions
+
+    def _search_food_items(self, params):
+        # migrations/food_lookup.sql search_food_items(): per pattern, exact names first, then newest
+        out = []
+        for pattern in params["p_patterns"]:
+            rows = [r for r in self.rows("food_items") if pattern in r["name"].lower()]
+            rows.sort(key=lambda r: r["created_at"], reverse=True)
+            rows.sort(key=lambda r: r["name"].lower() != pattern)
+            out += [{"pattern": pattern, **{k: r.get(k) for k in ("name", "calories", "protein", "carbs", "fats", "quantity")}}
+                    for r in rows[:params.get("p_limit", 20)]]
+        return out
+
+    def count(self, table, op="select"):
+        return sum(1 for t, o in self.calls if t == table and o == op)
+
+
+@pytest.fixture(autouse=True)
+def _reset_process_state():
+    """Per-process caches and counters must not leak from one test into the next."""
+    from app.core.idempotency import idempotency_store
+    from app.core.exercise_index import exercise_index
+    from app.services.goal_service import goal_cache
+    from app.services.workout_session_service import session_cache
+
+    resource_versions._versions.clear()
+    for cache in (idempotency_store._done, goal_cache, session_cache):
+        cache.clear()
+    exercise_index.rebuild([])
+    exercise_index.loaded_at = None
+    yield
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """The fake, installed behind the same TimedClient wrapper as the real client."""
+    fake = FakeSupabase()
+    monkeypatch.setattr(db_client, "_client", db_client.TimedClient(fake))
+    return fake
+
+
+@pytest.fixture
+def user():
+    return SimpleNamespace(id=USER_ID)
+
+
+@pytest.fixture
+def client(db, user):
+    from app.main import app
+
+    current = {"user": user}
+    app.dependency_overrides[get_current_user] = lambda: current["user"]
+    with TestClient(app) as test_client:
+        test_client.as_user = lambda u: current.update(user=u)
+        yield test_client
+    app.dependency_overrides.pop(get_current_user, None)
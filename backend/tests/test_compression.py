@@ -0,0 +1,89 @@
+import gzip
+import json
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, parse_accept_encoding
+
+brotli = pytest.importorskip("brotli")
+
+# Repetitive, like a workout list
+ROWS = [{"reps": 10, "weight": 22.5, "speed": None, "incline": None, "time_seconds": None} for _ in range(200)]
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/rows")
+    def rows():
+        return ROWS
+
+    @app.get("/small")
+    def small():
+        return JSONResponse({"ok": True})
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((json.dumps(row) + "\n" for row in ROWS[:3]), media_type="application/x-ndjson")
+
+    @app.get("/events")
+    def events():
+        return StreamingResponse((f"event: delta\ndata: {i}\n\n" for i in range(50)), media_type="text/event-stream")
+
+    return TestClient(app)
+
+
+def _raw(client, path, accept_encoding):
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+@pytest.mark.parametrize("accept_encoding, encoding, decode", [
+    ("br", "br", brotli.decompress),
+    ("gzip", "gzip", gzip.decompress),
+    ("gzip, deflate, br", "br", brotli.decompress),  # ties go to br
+    ("br;q=0.5, gzip", "gzip", gzip.decompress),     # the client's preference wins
+    ("*", "br", brotli.decompress),
+])
+def test_negotiated_encoding_decodes(client, accept_encoding, encoding, decode):
+    response, body = _raw(client, "/rows", accept_encoding)
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) == len(body)
+    assert json.loads(decode(body)) == ROWS
+    assert len(body) * 10 < len(json.dumps(ROWS))
+
+
+@pytest.mark.parametrize("accept_encoding", ["", "identity", "br;q=0, gzip;q=0", "*;q=0"])
+def test_no_acceptable_encoding(client, accept_encoding):
+    response, body = _raw(client, "/rows", accept_encoding)
+    assert "content-encoding" not in response.headers
+    assert json.loads(body) == ROWS
+
+
+def test_small_bodies_are_not_compressed(client):
+    response, body = _raw(client, "/small", "br, gzip")
+    assert "content-encoding" not in response.headers
+    assert body == b'{"ok":true}'
+
+
+@pytest.mark.parametrize("accept_encoding, decode", [("br", brotli.decompress), ("gzip", gzip.decompress)])
+def test_streamed_body_is_compressed_without_length(client, accept_encoding, decode):
+    response, body = _raw(client, "/stream", accept_encoding)
+    assert response.headers["content-encoding"] == accept_encoding
+    assert "content-length" not in response.headers
+    assert decode(body).decode().splitlines() == [json.dumps(row) for row in ROWS[:3]]
+
+
+def test_event_stream_is_never_compressed(client):
+    response, body = _raw(client, "/events", "br, gzip")
+    assert "content-encoding" not in response.headers
+    assert body.decode().count("event: delta") == 50
+
+
+def test_parse_accept_encoding():
+    assert parse_accept_encoding("br;q=1.0, GZIP;q=0.8, *;q=0, x;q=bad") == {"br": 1.0, "gzip": 0.8, "*": 0.0, "x": 0.0}
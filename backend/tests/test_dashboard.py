@@ -0,0 +1,88 @@
+from datetime import date, timedelta
+import pytest
+
+from app.db import client as db_client
+from app.services import dashboard_service
+from tests.conftest import USER_ID, OTHER_USER_ID
+
+TODAY = date(2026, 1, 31)
+
+
+def _workout(db, day: date, volume: float, user_id: str = USER_ID, **row):
+    return db.add("workouts", user_id=user_id, name="Push", date=f"{day}T18:00:00+00:00", updated_at=f"{day}T19:00:00+00:00",
+                  duration_minutes=60, exercise_count=5, set_count=20, total_volume=volume, cardio_calories=50, **row)
+
+
+def _meal(db, day: date, calories: int, user_id: str = USER_ID):
+    return db.add("meals", user_id=user_id, name="Lunch", date=str(day), updated_at=f"{day}T12:00:00+00:00",
+                  total_calories=calories, total_protein=40, total_carbs=50.5, total_fats=20)
+
+
+@pytest.fixture
+def history(db):
+    """Today, the rest of this week and last week, a 3-day streak and another user's data."""
+    for offset in range(3):
+        _meal(db, TODAY - timedelta(days=offset), 700)
+    _workout(db, TODAY, 5000)
+    _workout(db, TODAY - timedelta(days=2), 3000)
+    _workout(db, TODAY - timedelta(days=9), 4000)
+    _meal(db, TODAY - timedelta(days=9), 1400)
+    _workout(db, TODAY, 9999, user_id=OTHER_USER_ID)
+    _meal(db, TODAY, 9999, user_id=OTHER_USER_ID)
+    db.add("goals", user_id=USER_ID, daily_calories=2200, daily_caloric_deficit=500, current_weight=85,
+           goal_weight=78, target_date="2026-06-01", updated_at="2026-01-01T00:00:00+00:00")
+
+
+def test_dashboard_totals(client, history):
+    response = client.get("/dashboard", params={"date": str(TODAY)})
+    assert response.status_code == 200
+    body = response.json()
+
+    assert body["today"] == {"calories": 700, "protein": 40.0, "carbs": 50.5, "fats": 20.0, "meals": 1,
+                             "sessions": 1, "duration_minutes": 60, "volume": 5000.0, "cardio_calories": 50.0}
+    assert body["goal"]["daily_calories"] == 2200
+    assert [w["total_volume"] for w in body["recent_workouts"]] == [5000, 3000, 4000]
+    assert body["week"] == {"sessions": 2, "duration_minutes": 120, "volume": 8000.0, "cardio_calories": 100.0, "avg_calories": 300}
+    assert body["last_week"] == {"sessions": 1, "duration_minutes": 60, "volume": 4000.0, "cardio_calories": 50.0, "avg_calories": 200}
+    assert len(body["weekly_volume"]) == dashboard_service.DASHBOARD_WEEKS
+    assert body["weekly_volume"][-1] == {"week_start": str(TODAY - timedelta(days=6)), "sessions": 2, "volume": 8000.0}
+    assert body["streak"] == {"current": 3, "active_days_this_week": 3}
+    assert body["review"] is None
+
+
+def test_dashboard_reads_no_sets_or_food_items(client, db, history):
+    client.get("/dashboard", params={"date": str(TODAY)})
+    assert db.count("sets") == db.count("food_items") == db.count("workout_exercises") == 0
+
+
+def test_streak_longer_than_the_window_is_recounted(client, db, monkeypatch):
+    monkeypatch.setattr(dashboard_service, "DASHBOARD_WEEKS", 1)
+    for offset in range(10):
+        _meal(db, TODAY - timedelta(days=offset), 500)
+    assert client.get("/dashboard", params={"date": str(TODAY)}).json()["streak"]["current"] == 10
+
+
+def test_long_streak_reads_past_max_rows(client, db, monkeypatch):
+    # PostgREST cuts every response at max-rows; one select would only see the newest 10 days
+    db.max_rows = 20
+    monkeypatch.setattr(db_client, "PAGE_SIZE", 20)
+    monkeypatch.setattr(dashboard_service, "DASHBOARD_WEEKS", 1)
+    for offset in range(40):
+        _meal(db, TODAY - timedelta(days=offset), 500)
+        _meal(db, TODAY - timedelta(days=offset), 700)
+    _meal(db, TODAY - timedelta(days=41), 500)
+
+    reads = db.count("meals")
+    assert client.get("/dashboard", params={"date": str(TODAY)}).json()["streak"]["current"] == 40
+    # The window, then five pages of date-only rows (4 full, 1 short)
+    assert db.count("meals") - reads == 6
+
+
+def test_cached_review_is_shown_only_while_it_covers_today(client, db, history):
+    workout = db.rows("workouts")[0]
+    db.add("daily_reviews", user_id=USER_ID, date=str(TODAY), section="activity", review="Solid push day.",
+           source_marker=f"1:{workout['updated_at']}")
+    assert client.get("/dashboard", params={"date": str(TODAY)}).json()["review"] == {"activity": "Solid push day."}
+
+    _workout(db, TODAY, 1000)
+    assert client.get("/dashboard", params={"date": str(TODAY)}).json()["review"] is None
@@ -0,0 +1,119 @@
+import re
+import json
+import uuid
+import pytest
+
+from app.agents.encoding import encode_workouts, encode_meals
+from tests.conftest import USER_ID
+
+# No model tokenizer ships with the backend; words and punctuation marks are a close,
+# tokenizer-independent proxy (a UUID is ~9 of them, as it is several tokens for the model)
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+
+def _tokens(text: str) -> int:
+    return len(_TOKEN.findall(text))
+
+
+def _set(we_id, order, reps, weight, **cardio):
+    return {
+        "id": str(uuid.uuid4()), "workout_exercise_id": we_id, "reps": reps, "weight": weight,
+        "speed": None, "incline": None, "time_seconds": None, "calories_burnt": 0, "steps": 0,
+        "completed": True, "set_order": order, "created_at": "2026-01-31T18:22:11.123456+00:00", **cardio,
+    }
+
+
+@pytest.fixture
+def push_day():
+    """A 7-exercise push day as get_day_activity returns it: 24 strength sets and a cardio cooldown."""
+    workout_id = str(uuid.uuid4())
+    exercises = []
+    for i, (name, muscle_group) in enumerate([
+        ("Incline DB Press", "Chest"), ("Chest Press Machine", "Chest"), ("Lateral Raises", "Shoulders"),
+        ("Isolateral Decline Chest Press", "Chest"), ("Dumbell Shoulder Press", "Shoulders"), ("Triceps Isolation", "Arms"),
+    ]):
+        we_id = str(uuid.uuid4())
+        exercises.append({
+            "id": we_id, "workout_id": workout_id, "exercise_id": str(uuid.uuid4()), "order_index": i,
+            "exercises": {"id": str(uuid.uuid4()), "name": name, "muscle_group": muscle_group, "created_at": "2025-10-01T10:00:00+00:00"},
+            # Stored out of order, as PostgREST may return them
+            "sets": [_set(we_id, 3, 8, 25)] + [_set(we_id, s, 10, 22.5) for s in range(3)],
+        })
+    we_id = str(uuid.uuid4())
+    exercises.append({
+        "id": we_id, "workout_id": workout_id, "exercise_id": str(uuid.uuid4()), "order_index": 6,
+        "exercises": {"id": str(uuid.uuid4()), "name": "Cooldown Incline Cardio", "muscle_group": "Cardio", "created_at": "2025-10-01T10:00:00+00:00"},
+        "sets": [_set(we_id, 0, 0, 0, speed=5.5, incline=8, time_seconds=600, calories_burnt=90, steps=1100)],
+    })
+    return [{
+        "id": workout_id, "user_id": USER_ID, "name": "Push", "date": "2026-01-31T18:00:00+00:00",
+        "duration_minutes": 70, "notes": None, "created_at": "2026-01-31T19:10:00+00:00", "workout_exercises": exercises,
+    }]
+
+
+@pytest.fixture
+def meal_day():
+    """Four meals with six food items, as get_day_diet returns them."""
+    meals = []
+    for meal_type, items in [
+        ("Breakfast", [("Eggs", 155, 13, 1, 11, 2), ("Toast", 80, 3, 15, 1, 1)]),
+        ("Lunch", [("Chicken rice", 600, 45, 70, 12, 1)]),
+        ("Dinner", [("Salmon", 400, 40, 0, 25, 1), ("Salad", 120, 3, 10, 7, 1)]),
+        ("Snack", [("Whey shake", 120, 24, 3, 1, 1)]),
+    ]:
+        meal_id = str(uuid.uuid4())
+        meals.append({
+            "id": meal_id, "user_id": USER_ID, "name": meal_type, "date": "2026-01-31", "type": meal_type,
+            "total_calories": sum(i[1] * i[5] for i in items), "total_protein": sum(i[2] for i in items),
+            "total_carbs": sum(i[3] for i in items), "total_fats": sum(i[4] for i in items),
+            "created_at": "2026-01-31T08:00:00+00:00",
+            "items": [
+                {"id": str(uuid.uuid4()), "meal_id": meal_id, "name": name, "calories": kcal, "protein": p,
+                 "carbs": c, "fats": f, "quantity": q, "created_at": "2026-01-31T08:00:00+00:00"}
+                for name, kcal, p, c, f, q in items
+            ],
+        })
+    return meals
+
+
+def test_workout_encoding(push_day):
+    assert encode_workouts(push_day) == "\n".join([
+        "Push (70min)",
+        "- Incline DB Press [Chest]: 3x10@22.5, 1x8@25",
+        "- Chest Press Machine [Chest]: 3x10@22.5, 1x8@25",
+        "- Lateral Raises [Shoulders]: 3x10@22.5, 1x8@25",
+        "- Isolateral Decline Chest Press [Chest]: 3x10@22.5, 1x8@25",
+        "- Dumbell Shoulder Press [Shoulders]: 3x10@22.5, 1x8@25",
+        "- Triceps Isolation [Arms]: 3x10@22.5, 1x8@25",
+        "- Cooldown Incline Cardio [Cardio]: 10min 5.5km/h incl 8 1100 steps 90kcal",
+        "Totals: 25 sets, volume 5250kg, cardio 10min 90kcal",
+    ])
+
+
+def test_meal_encoding(meal_day):
+    assert encode_meals(meal_day) == "\n".join([
+        "Breakfast: 390kcal P16 C16 F12",
+        "  Eggs x2: 155kcal P13 C1 F11",
+        "  Toast: 80kcal P3 C15 F1",
+        "Lunch: 600kcal P45 C70 F12",
+        "  Chicken rice: 600kcal P45 C70 F12",
+        "Dinner: 520kcal P43 C10 F32",
+        "  Salmon: 400kcal P40 C0 F25",
+        "  Salad: 120kcal P3 C10 F7",
+        "Snack: 120kcal P24 C3 F1",
+        "  Whey shake: 120kcal P24 C3 F1",
+        "Total: 1630kcal P128 C99 F57",
+    ])
+
+
+@pytest.mark.parametrize("fixture, encode, budget", [
+    ("push_day", encode_workouts, 150),
+    ("meal_day", encode_meals, 80),
+])
+def test_encoded_prompt_token_budget(request, fixture, encode, budget):
+    rows = request.getfixturevalue(fixture)
+    encoded = _tokens(encode(rows))
+    raw = _tokens(json.dumps(rows, indent=2))
+    assert encoded <= budget
+    # The indented JSON this replaced was more than 10x bigger
+    assert encoded * 10 < raw
@@ -0,0 +1,102 @@
+from types import SimpleNamespace
+import pytest
+
+from app.core import etag
+from app.services import diet_service
+from tests.conftest import OTHER_USER_ID
+
+MEALS_URL = "/meals/?date=2026-01-31"
+MEAL = {"name": "Oats", "date": "2026-01-31T08:00:00", "type": "Breakfast", "items": [
+    {"name": "Oats", "calories": 300, "protein": 10, "carbs": 50, "fats": 5}
+]}
+WORKOUT = {"name": "Push", "date": "2026-01-31T18:00:00", "durationMinutes": 60, "exercises": []}
+
+
+def test_get_is_tagged(client):
+    response = client.get(MEALS_URL)
+    assert response.status_code == 200
+    assert response.headers["etag"].startswith('W/"')
+    assert response.headers["cache-control"] == "private, no-cache"
+    assert response.headers["last-modified"].endswith("GMT")
+
+
+@pytest.mark.parametrize("if_none_match", [
+    "{tag}",
+    "{bare}",          # W/ stripped by a proxy
+    '"other", {tag}',  # one of several
+    "*",
+])
+def test_matching_tag_is_304_without_a_query(client, db, if_none_match):
+    tag = client.get(MEALS_URL).headers["etag"]
+    reads = db.count("meals")
+
+    header = if_none_match.format(tag=tag, bare=tag.removeprefix("W/"))
+    response = client.get(MEALS_URL, headers={"If-None-Match": header})
+    assert response.status_code == 304
+    assert response.headers["etag"] == tag
+    assert response.content == b""
+    assert db.count("meals") == reads
+
+
+def test_write_changes_the_tag(client):
+    tag = client.get(MEALS_URL).headers["etag"]
+    assert client.post("/meals/", json=MEAL).status_code == 200
+
+    response = client.get(MEALS_URL, headers={"If-None-Match": tag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != tag
+
+
+def test_tag_is_per_query_user_and_resource(client, user):
+    tag = client.get(MEALS_URL).headers["etag"]
+    assert client.get("/meals/?date=2026-02-01", headers={"If-None-Match": tag}).status_code == 200
+
+    # Another user's writes and this user's workout writes leave the meals tag alone
+    client.as_user(SimpleNamespace(id=OTHER_USER_ID))
+    assert client.post("/meals/", json=MEAL).status_code == 200
+    client.as_user(user)
+    assert client.post("/workouts/", json=WORKOUT).status_code == 200
+    assert client.get(MEALS_URL, headers={"If-None-Match": tag}).status_code == 304
+
+    client.as_user(SimpleNamespace(id=OTHER_USER_ID))
+    assert client.get(MEALS_URL, headers={"If-None-Match": tag}).status_code == 200
+
+
+def test_disabled(client, monkeypatch):
+    monkeypatch.setattr(etag, "ETAG_ENABLED", False)
+    response = client.get(MEALS_URL, headers={"If-None-Match": "*"})
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+
+@pytest.mark.parametrize("source, status", [
+    ("database", 200),
+    # The per-process counters miss it: why ETAG_SOURCE=memory is for a single worker only
+    ("memory", 304),
+])
+def test_write_on_another_worker(client, monkeypatch, source, status):
+    monkeypatch.setattr(etag, "ETAG_SOURCE", source)
+    tag = client.get(MEALS_URL).headers["etag"]
+
+    # The other worker's writes bump its own counters, not this process's
+    monkeypatch.setattr(diet_service, "resource_versions", etag.ResourceVersions())
+    assert client.post("/meals/", json=MEAL).status_code == 200
+
+    assert client.get(MEALS_URL, headers={"If-None-Match": tag}).status_code == status
+
+
+def test_deleting_an_older_row_changes_the_tag(client):
+    # The newest write is unchanged: the tombstone is what changes the tag
+    first = client.post("/templates/", json={"name": "Push", "exercises": []}).json()
+    client.post("/templates/", json={"name": "Pull", "exercises": []})
+    tag = client.get("/templates/").headers["etag"]
+
+    assert client.delete(f"/templates/{first['id']}").status_code == 200
+    assert client.get("/templates/", headers={"If-None-Match": tag}).status_code == 200
+
+
+def test_versions_unavailable_serves_untagged(client, db):
+    del db.functions["get_resource_versions"]
+    response = client.get(MEALS_URL, headers={"If-None-Match": "*"})
+    assert response.status_code == 200
+    assert "etag" not in response.headers
@@ -0,0 +1,84 @@
+import uuid
+import pytest
+
+from app.core.exercise_index import ExerciseIndex
+from app.services.exercise_service import ExerciseService
+
+CATALOG = [
+    ("Incline DB Press", "Chest"),
+    ("Incline Bench Press", "Chest"),
+    ("Bench Press", "Chest"),
+    ("Chest Press Machine", "Chest"),
+    ("Decline Crunch", "Abs"),
+    ("Back Squat", "Legs"),
+    ("Incline Walk", "Cardio"),
+]
+
+
+def _rows():
+    return [{"id": str(uuid.uuid4()), "name": name, "muscle_group": group} for name, group in CATALOG]
+
+
+@pytest.fixture
+def index():
+    index = ExerciseIndex()
+    index.rebuild(_rows())
+    return index
+
+
+def _names(results):
+    return [r["name"] for r in results]
+
+
+def test_every_token_is_a_prefix(index):
+    assert _names(index.search("inc db")) == ["Incline DB Press"]
+    assert _names(index.search("PRESS ben")) == ["Bench Press", "Incline Bench Press"]
+
+
+def test_ranking_prefers_names_starting_with_the_query_then_shorter(index):
+    assert _names(index.search("incl")) == ["Incline Walk", "Incline DB Press", "Incline Bench Press"]
+
+
+def test_muscle_groups_match_after_names(index):
+    # "Chest Press Machine" matches by name; the other chest exercises by group
+    assert _names(index.search("chest"))[0] == "Chest Press Machine"
+    assert len(index.search("chest")) == 4
+    assert _names(index.search("incline", muscle_group="Cardio")) == ["Incline Walk"]
+
+
+def test_typos_fall_back_to_the_closest_token(index):
+    assert _names(index.search("benhc"))[0] == "Bench Press"
+    assert index.search("zzzz") == []
+    assert index.search("  ") == []
+
+
+def test_limit(index):
+    assert len(index.search("press", limit=2)) == 2
+
+
+def test_add_is_searchable_and_idempotent(index):
+    row = {"id": str(uuid.uuid4()), "name": "Cable Fly", "muscle_group": "Chest"}
+    index.add(row)
+    index.add(row)
+    assert _names(index.search("cab")) == ["Cable Fly"]
+    assert index.get_id("Cable Fly") == row["id"]
+    assert len(index) == len(CATALOG) + 1
+
+
+async def test_service_loads_the_catalog_once_and_skips_lookups_for_known_names(db):
+    for row in _rows():
+        db.add("exercises", **row)
+
+    assert _names(await ExerciseService.search("back"))[0] == "Back Squat"
+    await ExerciseService.search("bench")
+    assert db.count("exercises") == 1
+
+    bench = next(r for r in db.rows("exercises") if r["name"] == "Bench Press")
+    assert await ExerciseService.get_or_create("Bench Press", "Chest") == bench["id"]
+    assert db.count("exercises") == 1
+
+    # A new name is created once, then known to the index
+    created = await ExerciseService.get_or_create("Cable Fly", "Chest")
+    assert await ExerciseService.get_or_create("Cable Fly", "Chest") == created
+    assert db.count("exercises", "insert") == 1
+    assert _names(await ExerciseService.search("cable")) == ["Cable Fly"]
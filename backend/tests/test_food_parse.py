@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+import pytest
+
+from app.agents import diet_agent
+from app.agents.diet_agent import split_food_text
+
+
+def test_split_reads_quantities():
+    assert split_food_text("2 eggs, half avocado; 1/2 cup oats\n1.5x protein shake") == [
+        ("eggs", 2.0), ("avocado", 0.5), ("cup oats", 0.5), ("protein shake", 1.5)
+    ]
+
+
+def test_split_skips_empty_parts():
+    assert split_food_text(" , ;\n") == []
+    assert split_food_text("coffee.") == [("coffee", 1.0)]
+
+
+def test_zero_denominator_is_not_a_quantity():
+    assert split_food_text("1/0 cup rice") == [("1/0 cup rice", 1.0)]
+
+
+def test_and_with_inside_a_food_name_do_not_split():
+    assert split_food_text("mac and cheese, toast with butter") == [("mac and cheese", 1.0), ("toast with butter", 1.0)]
+    assert split_food_text("2 slices toast with butter") == [("slices toast with butter", 2.0)]
+
+
+def test_and_with_split_items_that_both_have_a_quantity():
+    assert split_food_text("2 eggs and 1 toast with a banana") == [("eggs", 2.0), ("toast", 1.0), ("banana", 1.0)]
+    assert split_food_text("2 eggs AND bacon and 3 pancakes") == [("eggs AND bacon", 2.0), ("pancakes", 3.0)]
+
+
+@pytest.fixture
+def model_reply(monkeypatch):
+    """Stubs the model call of the food agents with a fixed reply."""
+    reply = {"text": ""}
+
+    async def run(agent, prompt, *args, **kwargs):
+        return reply["text"]
+
+    monkeypatch.setattr(diet_agent, "Agent", lambda **kwargs: SimpleNamespace(**kwargs))
+    monkeypatch.setattr(diet_agent, "get_model", lambda: "test-model")
+    monkeypatch.setattr(diet_agent, "run_adk_agent", run)
+    diet_agent.food_cache.clear()
+    yield reply
+    diet_agent.food_cache.clear()
+
+
+async def test_invalid_model_json_is_not_cached(db, model_reply):
+    model_reply["text"] = '{"food": "eggs", "kcal": 140}'
+    result = await diet_agent.search_and_retrieve_food("eggs")
+    assert "error" in result
+    assert diet_agent.food_cache.get("eggs") is None
+
+    # The parser then estimates the food instead of failing on the bad entry
+    model_reply["text"] = '{"items": [{"query": "eggs", "name": "Egg", "calories": 70, "protein": 6, "carbs": 0.5, "fats": 5}]}'
+    parsed = await diet_agent.parse_food_text("2 eggs")
+    assert parsed["items"][0]["calories"] == 140
+    assert parsed["items"][0]["source"] == "ai_retrieval"
+
+
+async def test_valid_model_json_is_cached_for_the_parser(db, model_reply):
+    model_reply["text"] = '```json\n{"name": "Banana", "calories": 105, "protein": 1.3, "carbs": 27, "fats": 0.4, "note": "medium"}\n```'
+    result = await diet_agent.search_and_retrieve_food("banana")
+    assert result == {"name": "Banana", "calories": 105, "protein": 1.3, "carbs": 27.0, "fats": 0.4, "source": "ai_retrieval"}
+
+    model_reply["text"] = "not json"
+    parsed = await diet_agent.parse_food_text("2 banana")
+    assert parsed["items"][0]["source"] == "cache"
+    assert parsed["calories"] == 210
+
+
+async def test_frequent_food_does_not_hide_the_others(db, model_reply):
+    # Many newer rows for one food: each pattern still gets its own rows
+    meal = db.add("meals", name="Breakfast")
+    db.add("food_items", meal_id=meal["id"], name="Banana", calories=105, protein=1.3, carbs=27, fats=0.4, quantity=1,
+           created_at="2026-01-01T08:00:00+00:00")
+    for i in range(50):
+        db.add("food_items", meal_id=meal["id"], name="Scrambled eggs", calories=150, protein=12, carbs=1, fats=11, quantity=1,
+               created_at=f"2026-02-01T08:{i:02d}:00+00:00")
+    db.add("food_items", meal_id=meal["id"], name="Egg", calories=70, protein=6, carbs=0.5, fats=5, quantity=1,
+           created_at="2026-01-02T08:00:00+00:00")
+
+    parsed = await diet_agent.parse_food_text("2 eggs, banana")
+    assert [(i["name"], i["source"]) for i in parsed["items"]] == [("Egg", "database"), ("Banana", "database")]
+    assert parsed["calories"] == 245
+    assert db.count("search_food_items", "rpc") == 1
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+import pytest
+
+from app.agents import goal_agent
+from app.schemas.goal import GoalCreate
+
+GOAL = GoalCreate(current_height=180, current_weight=85, age=30, gender="Male", lifestyle="Active", goal_weight=78)
+
+
+@pytest.fixture
+def model(monkeypatch):
+    """Stubs the goal agent's model: `release` lets the pending call answer `reply` (or raise it)."""
+    state = SimpleNamespace(calls=0, reply="### Plan\nEat less.", release=asyncio.Event())
+
+    async def run(agent, prompt, *args, **kwargs):
+        state.calls += 1
+        await state.release.wait()
+        if isinstance(state.reply, Exception):
+            raise state.reply
+        return state.reply
+
+    async def stream(agent, prompt, *args, **kwargs):
+        state.calls += 1
+        for chunk in state.reply:
+            yield chunk
+
+    monkeypatch.setattr(goal_agent, "Agent", lambda **kwargs: SimpleNamespace(**kwargs))
+    monkeypatch.setattr(goal_agent, "get_model", lambda: "test-model")
+    monkeypatch.setattr(goal_agent, "run_adk_agent", run)
+    monkeypatch.setattr(goal_agent, "stream_adk_agent", stream)
+    monkeypatch.setattr(goal_agent, "GOAL_PROSE_TIMEOUT", 0.05)
+    goal_agent._analysis_cache.clear()
+    goal_agent._pending.clear()
+    yield state
+    goal_agent._analysis_cache.clear()
+    goal_agent._pending.clear()
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_analyze_waits_for_the_prose(model):
+    model.release.set()
+    result = await goal_agent.analyze_goal(GOAL)
+    assert result["analysis_status"] == "generated"
+    assert result["analysis"] == model.reply
+    assert result["daily_calories"] == result["metrics"]["daily_calories"]
+
+    assert (await goal_agent.analyze_goal(GOAL))["analysis_status"] == "cached"
+    assert model.calls == 1
+
+
+async def test_slow_prose_falls_back_and_keeps_generating(model):
+    result = await asyncio.wait_for(goal_agent.analyze_goal(GOAL), timeout=1)
+    assert result["analysis_status"] == "pending"
+    assert f"**{result['daily_calories']} kcal/day**" in result["analysis"]
+
+    # A retry while the prose is being written shares the same model call
+    assert (await goal_agent.analyze_goal(GOAL))["analysis_status"] == "pending"
+    model.release.set()
+    await _settle()
+
+    result = await goal_agent.analyze_goal(GOAL)
+    assert result["analysis_status"] == "cached"
+    assert result["analysis"] == model.reply
+    assert model.calls == 1
+
+
+async def test_failed_prose_is_logged_and_retried(model, caplog):
+    model.reply = RuntimeError("quota exceeded")
+    model.release.set()
+    with caplog.at_level(logging.ERROR, logger=goal_agent.__name__):
+        assert (await goal_agent.analyze_goal(GOAL))["analysis_status"] == "failed"
+        await _settle()
+    assert "quota exceeded" in caplog.text
+    assert not goal_agent._pending
+
+    model.reply = "### Plan"
+    assert (await goal_agent.analyze_goal(GOAL))["analysis"] == "### Plan"
+
+
+async def test_failure_after_the_timeout_is_consumed(model, caplog):
+    with caplog.at_level(logging.ERROR, logger=goal_agent.__name__):
+        assert (await goal_agent.analyze_goal(GOAL))["analysis_status"] == "pending"
+        model.reply = RuntimeError("quota exceeded")
+        model.release.set()
+        await _settle()
+    assert "quota exceeded" in caplog.text
+    assert not goal_agent._pending
+
+
+async def test_stream_waits_for_the_background_prose(model):
+    assert (await goal_agent.analyze_goal(GOAL))["analysis_status"] == "pending"
+    model.release.set()
+    chunks = [c async for c in goal_agent.stream_goal_analysis(GOAL)]
+    assert chunks[1:] == [{"text": model.reply}]
+    assert model.calls == 1
+
+
+async def test_stream_caches_only_non_empty_prose(model):
+    model.reply = ["  ", "\n"]
+    chunks = [c async for c in goal_agent.stream_goal_analysis(GOAL)]
+    assert "plan" in chunks[0]
+    assert not goal_agent._analysis_cache
+
+    model.reply = ["### Plan", "\nEat less."]
+    [c async for c in goal_agent.stream_goal_analysis(GOAL)]
+    [c async for c in goal_agent.stream_goal_analysis(GOAL)]
+    assert list(goal_agent._analysis_cache.values()) == ["### Plan\nEat less."]
+    assert model.calls == 2
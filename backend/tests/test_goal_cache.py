@@ -0,0 +1,77 @@
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import TTLCache
+from app.core.etag import resource_versions, GOALS
+from app.schemas.goal import GoalCreate
+from app.services.goal_service import GoalService, goal_cache
+from tests.conftest import USER_ID
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_ttl_cache_expires_entries(clock):
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=60)
+    clock[0] += 10
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert len(cache) == 2
+
+
+def test_ttl_cache_keeps_none_apart_from_a_miss():
+    cache = TTLCache()
+    cache.set("no goal", None)
+    assert cache.get_entry("no goal") == (True, None)
+    assert cache.get_entry("unknown") == (False, None)
+
+
+async def test_goal_reads_are_cached_including_no_goal(db):
+    assert await GoalService.get_goal(USER_ID) is None
+    assert await GoalService.get_goal(USER_ID) is None
+    assert db.count("goals") == 1
+
+    saved = await GoalService.create_goal(USER_ID, GoalCreate(current_weight=85, goal_weight=78))
+    # Written through: no read after the save
+    assert await GoalService.get_goal(USER_ID) == saved
+    assert db.count("goals") == 1
+
+
+async def test_goal_upsert_keeps_unsent_columns(db):
+    await GoalService.create_goal(USER_ID, GoalCreate(current_weight=85, goal_weight=78))
+    await GoalService.create_goal(USER_ID, GoalCreate(current_weight=84))
+
+    assert len(db.rows("goals")) == 1
+    goal = await GoalService.get_goal(USER_ID)
+    assert (goal["current_weight"], goal["goal_weight"]) == (84, 78)
+
+
+async def test_read_racing_a_write_is_not_cached(db, monkeypatch):
+    db.add("goals", user_id=USER_ID, current_weight=85)
+    table = db.table
+
+    def write_during_read(name):
+        # A save bumps the version while this read is in flight
+        resource_versions.bump(USER_ID, GOALS)
+        return table(name)
+
+    monkeypatch.setattr(db, "table", write_during_read)
+    await GoalService.get_goal(USER_ID)
+    assert goal_cache.get_entry(USER_ID) == (False, None)
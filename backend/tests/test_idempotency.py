@@ -0,0 +1,125 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+
+from app.core import idempotency
+from app.core.idempotency import IdempotencyStore, REPLAYED_HEADER
+from tests.conftest import OTHER_USER_ID, USER_ID
+
+MEAL = {"name": "Oats", "date": "2026-01-31T08:00:00", "type": "Breakfast", "items": [
+    {"name": "Oats", "calories": 300, "protein": 10, "carbs": 50, "fats": 5}
+]}
+
+
+def _post(client, body=MEAL, key="retry-1"):
+    return client.post("/meals/", json=body, headers={"Idempotency-Key": key})
+
+
+def test_retry_replays_the_first_result(client, db):
+    first = _post(client)
+    second = _post(client)
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers[REPLAYED_HEADER] == "true"
+    assert REPLAYED_HEADER not in first.headers
+    assert db.count("meals", "insert") == 1
+
+
+def test_same_key_with_a_different_body_is_422(client, db):
+    _post(client)
+    response = _post(client, {**MEAL, "name": "Porridge"})
+    assert response.status_code == 422
+    assert db.count("meals", "insert") == 1
+
+
+def test_keys_are_per_user_and_optional(client, db):
+    _post(client)
+    client.as_user(SimpleNamespace(id=OTHER_USER_ID))
+    assert REPLAYED_HEADER not in _post(client).headers
+    client.post("/meals/", json=MEAL)
+    client.post("/meals/", json=MEAL)
+    assert db.count("meals", "insert") == 4
+
+
+def test_key_length_is_checked(client):
+    assert _post(client, key="k" * 256).status_code == 400
+
+
+def test_failed_attempt_is_not_stored(client, db):
+    db.fail_on.add(("meals", "insert"))
+    with pytest.raises(RuntimeError):
+        _post(client)
+
+    db.fail_on.clear()
+    response = _post(client)
+    assert response.status_code == 200
+    assert REPLAYED_HEADER not in response.headers
+    assert len(db.rows("meals")) == 1
+
+
+class Body(BaseModel):
+    value: int
+
+
+async def test_concurrent_duplicates_share_one_call():
+    store = IdempotencyStore(maxsize=10, ttl=60)
+    release = asyncio.Event()
+    calls = []
+
+    async def call():
+        calls.append(1)
+        await release.wait()
+        return {"id": len(calls)}
+
+    responses = [Response() for _ in range(3)]
+    runs = [asyncio.create_task(store.run(r, USER_ID, "meals.create", "k", Body(value=1), call)) for r in responses]
+    await asyncio.sleep(0.01)
+    release.set()
+
+    assert await asyncio.gather(*runs) == [{"id": 1}] * 3
+    assert len(calls) == 1
+    assert [REPLAYED_HEADER in r.headers for r in responses] == [False, True, True]
+
+
+async def test_duplicate_gives_up_with_409_while_the_first_is_running(monkeypatch):
+    monkeypatch.setattr(idempotency, "IDEMPOTENCY_WAIT_SECONDS", 0.01)
+    store = IdempotencyStore(maxsize=10, ttl=60)
+    release = asyncio.Event()
+
+    async def call():
+        await release.wait()
+        return {}
+
+    first = asyncio.create_task(store.run(Response(), USER_ID, "meals.create", "k", Body(value=1), call))
+    await asyncio.sleep(0)
+    with pytest.raises(HTTPException) as error:
+        await store.run(Response(), USER_ID, "meals.create", "k", Body(value=1), call)
+    assert error.value.status_code == 409
+    release.set()
+    await first
+
+
+async def test_duplicate_of_a_failed_attempt_runs_it_again():
+    store = IdempotencyStore(maxsize=10, ttl=60)
+    release = asyncio.Event()
+    attempts = []
+
+    async def call():
+        attempts.append(1)
+        if len(attempts) == 1:
+            await release.wait()
+            raise RuntimeError("insert failed")
+        return {"id": 2}
+
+    first = asyncio.create_task(store.run(Response(), USER_ID, "meals.create", "k", Body(value=1), call))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(store.run(Response(), USER_ID, "meals.create", "k", Body(value=1), call))
+    await asyncio.sleep(0)
+    release.set()
+
+    with pytest.raises(RuntimeError):
+        await first
+    assert await second == {"id": 2}
+    assert len(attempts) == 2
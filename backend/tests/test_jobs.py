@@ -0,0 +1,106 @@
+import time
+import asyncio
+import pytest
+
+from app.core.jobs import JobQueue, MemoryJobStore, SqliteJobStore, QUEUED, DONE, FAILED
+
+
+async def _wait_for(queue: JobQueue, job_id: str, *statuses: str) -> dict:
+    for _ in range(200):
+        job = await queue.get(job_id)
+        if job["status"] in statuses:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {statuses}: {job}")
+
+
+@pytest.fixture
+async def queue():
+    queue = JobQueue(MemoryJobStore(), workers=2)
+    await queue.start()
+    yield queue
+    await queue.stop()
+
+
+async def test_jobs_run_to_done_or_failed(queue):
+    async def review(payload):
+        if payload["date"] == "bad":
+            raise RuntimeError("model unavailable")
+        return {"review": f"Reviewed {payload['date']}"}
+
+    queue.register("review", review)
+    ok = await queue.submit("review", {"date": "2026-01-31"}, user_id="u1")
+    bad = await queue.submit("review", {"date": "bad"}, user_id="u1")
+    assert ok["status"] == QUEUED
+
+    ok = await _wait_for(queue, ok["id"], DONE)
+    assert ok["result"] == {"review": "Reviewed 2026-01-31"}
+    bad = await _wait_for(queue, bad["id"], FAILED)
+    assert bad["error"] == "model unavailable"
+
+
+async def test_submit_checks_the_kind_and_the_queue(queue):
+    with pytest.raises(ValueError):
+        await queue.submit("unknown", {})
+
+    stopped = JobQueue(MemoryJobStore())
+    stopped.register("review", lambda payload: None)
+    with pytest.raises(RuntimeError):
+        await stopped.submit("review", {})
+
+
+async def test_sqlite_jobs_survive_a_restart(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    started = asyncio.Event()
+
+    async def slow(payload):
+        started.set()
+        await asyncio.sleep(60)
+
+    first = JobQueue(SqliteJobStore(path), workers=1)
+    first.register("review", slow)
+    await first.start()
+    running = await first.submit("review", {"n": 1})
+    queued = await first.submit("review", {"n": 2})
+    await started.wait()
+    await first.stop()
+    # The interrupted job is handed back; the waiting one never left the queue
+    assert (await first.get(running["id"]))["status"] == QUEUED
+    assert (await first.get(queued["id"]))["status"] == QUEUED
+
+    async def fast(payload):
+        return payload["n"]
+
+    second = JobQueue(SqliteJobStore(path), workers=1)
+    second.register("review", fast)
+    await second.start()
+    try:
+        assert (await _wait_for(second, running["id"], DONE))["result"] == 1
+        assert (await _wait_for(second, queued["id"], DONE))["result"] == 2
+    finally:
+        await second.stop()
+
+
+def test_sqlite_store_claims_once_and_recovers_stale_jobs(tmp_path):
+    store = SqliteJobStore(str(tmp_path / "jobs.db"))
+    now = time.time()
+    job = {"id": "j1", "kind": "review", "user_id": None, "payload": {}, "status": QUEUED,
+           "result": None, "error": None, "created_at": now, "updated_at": now}
+    store.save(job)
+
+    assert store.claim("j1")
+    assert not store.claim("j1")
+    # Still running and recent: not handed out again
+    assert store.pending(stale_before=now - 600) == []
+    # Its process died long ago
+    assert [j["id"] for j in store.pending(stale_before=time.time() + 1)] == ["j1"]
+
+
+def test_finished_jobs_are_purged(tmp_path):
+    for store in (MemoryJobStore(), SqliteJobStore(str(tmp_path / "jobs.db"))):
+        for job_id, status, age in [("old", DONE, 100), ("new", DONE, 0), ("waiting", QUEUED, 100)]:
+            store.save({"id": job_id, "kind": "review", "user_id": None, "payload": {}, "status": status,
+                        "result": None, "error": None, "created_at": 0, "updated_at": time.time() - age})
+        store.purge(finished_before=time.time() - 50)
+        assert store.get("old") is None
+        assert store.get("new") and store.get("waiting")
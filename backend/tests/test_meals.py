@@ -0,0 +1,77 @@
+from datetime import date, timedelta
+import pytest
+from app.services.diet_service import MEALS_MAX_RANGE_DAYS
+from tests.conftest import USER_ID, OTHER_USER_ID
+
+RANGE_URL = "/meals/?from=2026-03-01&to=2026-03-07"
+
+
+def _meal(db, day, created_at, calories, protein=10, user_id=USER_ID, items=("Oats",)):
+    meal = db.add("meals", user_id=user_id, name=items[0], date=day, type="Breakfast", created_at=created_at,
+                  total_calories=calories, total_protein=protein, total_carbs=20, total_fats=5)
+    for name in items:
+        db.add("food_items", meal_id=meal["id"], name=name, calories=calories // len(items),
+               protein=protein / len(items), carbs=20 / len(items), fats=5 / len(items), quantity=1)
+    return meal
+
+
+@pytest.fixture
+def meals(db):
+    # Inserted out of order; one on each edge of the range, one outside it and one of another user
+    return [
+        _meal(db, "2026-03-07", "2026-03-07T19:00:00+00:00", 700, items=("Rice", "Chicken")),
+        _meal(db, "2026-03-03", "2026-03-03T13:00:00+00:00", 600, protein=30),
+        _meal(db, "2026-03-01", "2026-03-01T08:00:00+00:00", 400),
+        _meal(db, "2026-03-03", "2026-03-03T08:00:00+00:00", 300, protein=15),
+        _meal(db, "2026-03-08", "2026-03-08T08:00:00+00:00", 999),
+        _meal(db, "2026-03-03", "2026-03-03T09:00:00+00:00", 500, user_id=OTHER_USER_ID),
+    ]
+
+
+def test_range_groups_meals_by_day(client, meals):
+    response = client.get(RANGE_URL)
+    assert response.status_code == 200
+    days = response.json()
+
+    # Oldest first, days without meals left out
+    assert [d["date"] for d in days] == ["2026-03-01", "2026-03-03", "2026-03-07"]
+    tuesday = days[1]
+    assert (tuesday["calories"], tuesday["protein"], tuesday["carbs"], tuesday["fats"]) == (900, 45, 40, 10)
+    # Meals of a day in the order they were logged
+    assert [m["calories"] for m in tuesday["meals"]] == [300, 600]
+    assert [i["name"] for i in days[2]["meals"][0]["items"]] == ["Rice", "Chicken"]
+
+
+def test_range_without_items(client, db, meals, monkeypatch):
+    selects = []
+    query = type(db.table("meals"))
+    select = query.select
+    monkeypatch.setattr(query, "select", lambda self, columns="*", **kwargs: selects.append(columns) or select(self, columns, **kwargs))
+
+    days = client.get(f"{RANGE_URL}&items=false").json()
+    assert [d["calories"] for d in days] == [400, 900, 700]
+    assert all(m["items"] == [] for d in days for m in d["meals"])
+    # Food items are not embedded at all
+    assert selects == ["*"]
+
+
+def test_range_is_capped(client, db):
+    start = date(2026, 1, 1)
+    longest = start + timedelta(days=MEALS_MAX_RANGE_DAYS - 1)
+    assert client.get(f"/meals/?from={start}&to={longest}").status_code == 200
+
+    response = client.get(f"/meals/?from={start}&to={longest + timedelta(days=1)}")
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"Date range is limited to {MEALS_MAX_RANGE_DAYS} days"
+    assert db.count("meals") == 1
+
+
+@pytest.mark.parametrize("query, detail", [
+    ("from=2026-03-01", "Pass either 'date' or both 'from' and 'to'"),
+    ("", "Pass either 'date' or both 'from' and 'to'"),
+    ("from=2026-03-02&to=2026-03-01", "'from' must not be after 'to'"),
+])
+def test_invalid_range(client, query, detail):
+    response = client.get(f"/meals/?{query}")
+    assert response.status_code == 400
+    assert response.json()["detail"] == detail
@@ -0,0 +1,142 @@
+import re
+import time
+import asyncio
+from types import SimpleNamespace
+from typing import Optional
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.auth import get_current_user
+from app.agents import adk_utils, goal_agent
+from app.core.metrics import Histogram, TimingMiddleware, TimedRoute
+from tests.conftest import USER_ID
+
+MEALS_URL = "/meals/?date=2026-01-31"
+
+
+def _server_timing(response) -> dict:
+    return {
+        name: float(duration)
+        for name, duration in re.findall(r"(\w+);dur=([\d.]+)", response.headers["server-timing"])
+    }
+
+
+def _sample(text: str, series: str) -> float:
+    match = re.search(rf"^{re.escape(series)} (\S+)$", text, re.M)
+    return float(match.group(1)) if match else 0.0
+
+
+@pytest.fixture
+def slow_db(db, monkeypatch):
+    """Every fake query takes 5ms, as a PostgREST round trip would."""
+    query = type(db.table("meals"))
+    execute = query.execute
+
+    def slow(self):
+        time.sleep(0.005)
+        return execute(self)
+
+    monkeypatch.setattr(query, "execute", slow)
+
+
+def test_server_timing_splits_auth_and_db(client, db, slow_db):
+    from app.main import app
+
+    def get_user(token):
+        time.sleep(0.01)
+        return SimpleNamespace(user=SimpleNamespace(id=USER_ID))
+
+    # The real auth dependency, against a slow fake Supabase Auth
+    db.auth = SimpleNamespace(get_user=get_user)
+    app.dependency_overrides.pop(get_current_user)
+
+    response = client.get(MEALS_URL, headers={"Authorization": "Bearer token"})
+    assert response.status_code == 200
+    timing = _server_timing(response)
+    assert list(timing) == ["auth", "db", "model", "serialization", "total"]
+    assert timing["auth"] >= 10
+    assert timing["db"] >= 5
+    assert timing["model"] == 0
+    assert timing["total"] >= timing["auth"] + timing["db"]
+
+
+def test_server_timing_has_model_time(client, monkeypatch):
+    async def create_session(agent, user_id, session_id):
+        async def run_async(**kwargs):
+            await asyncio.sleep(0.02)
+            yield SimpleNamespace(content=SimpleNamespace(parts=[SimpleNamespace(text="### Plan")]))
+        return SimpleNamespace(run_async=run_async), None
+
+    monkeypatch.setattr(adk_utils, "create_session", create_session)
+    goal_agent._analysis_cache.clear()
+    response = client.post("/goals/analyze", json={
+        "current_height": 180, "current_weight": 85, "age": 30, "gender": "Male", "lifestyle": "Active", "goal_weight": 78,
+    })
+    goal_agent._analysis_cache.clear()
+
+    assert response.json()["analysis"] == "### Plan"
+    assert _server_timing(response)["model"] >= 20
+
+
+def test_metrics_histograms(client):
+    series = 'http_request_duration_seconds_count{method="GET",route="/meals/",status="200"}'
+    before = _sample(client.get("/metrics").text, series)
+    client.get(MEALS_URL)
+    client.get(MEALS_URL)
+    text = client.get("/metrics").text
+
+    assert _sample(text, series) == before + 2
+    assert _sample(text, 'http_request_duration_seconds_bucket{method="GET",route="/meals/",status="200",le="+Inf"}') == before + 2
+    assert 'http_request_phase_duration_seconds_count{method="GET",route="/meals/",phase="db"}' in text
+    # /metrics itself is not timed
+    assert 'route="/metrics"' not in text
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Test latency.", ("route",), buckets=(0.01, 0.1, 1.0))
+    for value in (0.005, 0.05, 0.05, 5.0):
+        histogram.observe(("/a",), value)
+
+    assert histogram.render() == [
+        "# HELP latency_seconds Test latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.01"} 1',
+        'latency_seconds_bucket{route="/a",le="0.1"} 3',
+        'latency_seconds_bucket{route="/a",le="1.0"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 5.105',
+        'latency_seconds_count{route="/a"} 4',
+    ]
+
+
+class Item(BaseModel):
+    name: str
+    muscle_group: Optional[str] = Field(None, alias="muscleGroup")
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+@pytest.mark.parametrize("asynchronous", [True, False])
+def test_timed_route_keeps_response_model_serialization(asynchronous):
+    router = APIRouter(route_class=TimedRoute)
+    row = {"name": "Squat", "muscle_group": "Legs", "user_id": USER_ID}
+
+    if asynchronous:
+        @router.get("/item", response_model=Item)
+        async def item():
+            return row
+    else:
+        @router.get("/item", response_model=Item)
+        def item():
+            return row
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(TimingMiddleware)
+
+    response = TestClient(app).get("/item")
+    # Filtered and aliased by the response model, as with a plain APIRoute
+    assert response.json() == {"name": "Squat", "muscleGroup": "Legs"}
+    assert "serialization" in _server_timing(response)
@@ -0,0 +1,154 @@
+from datetime import date, timedelta
+import pytest
+from fastapi import HTTPException
+
+from app.agents import period_review
+from app.agents.period_review import bucket_days, summarize_days, encode_period, PERIOD_REVIEW_MAX_LINES
+from app.routers.agents import _period_range
+from app.services.review_service import ReviewService, REVIEW_PERIOD_MAX_DAYS
+
+START = date(2026, 3, 2)  # a Monday
+
+
+def _workout(day: date, **fields) -> dict:
+    return {"date": f"{day.isoformat()}T18:00:00", "name": "Push", "set_count": 10, "total_volume": 2000,
+            "cardio_calories": 0, "created_at": f"{day.isoformat()}T19:00:00+00:00", **fields}
+
+
+def _meal(day: date, **fields) -> dict:
+    return {"date": day.isoformat(), "total_calories": 600, "total_protein": 40, "total_carbs": 60, "total_fats": 20,
+            "created_at": f"{day.isoformat()}T12:00:00+00:00", **fields}
+
+
+def _year() -> dict:
+    days = [START + timedelta(days=i) for i in range(365)]
+    return {
+        "workouts": [_workout(d) for d in days if d.weekday() in (0, 2, 4)],
+        "meals": [_meal(d) for d in days for _ in range(3)],
+        "reviews": [],
+    }
+
+
+@pytest.mark.parametrize("n_days, per_line", [
+    (1, 1),
+    (7, 1),
+    (PERIOD_REVIEW_MAX_LINES, 1),
+    (PERIOD_REVIEW_MAX_LINES + 1, 7),
+    (7 * PERIOD_REVIEW_MAX_LINES, 7),
+    (7 * PERIOD_REVIEW_MAX_LINES + 1, 30),
+    (366, 30),
+    (30 * PERIOD_REVIEW_MAX_LINES + 1, 60),
+])
+def test_bucket_days(n_days, per_line):
+    assert bucket_days(n_days) == per_line
+
+
+def test_summarize_days_totals_every_day_of_the_range():
+    end = START + timedelta(days=2)
+    data = {
+        "workouts": [_workout(START), _workout(START, name="Run", set_count=1, total_volume=0, cardio_calories=300),
+                     _workout(end + timedelta(days=1))],
+        "meals": [_meal(START), _meal(end)],
+        "reviews": [],
+    }
+    days = summarize_days(data, START, end)
+
+    assert list(days) == ["2026-03-02", "2026-03-03", "2026-03-04"]
+    monday = days["2026-03-02"]
+    assert monday["workouts"] == ["Push", "Run"]
+    assert (monday["sets"], monday["volume"], monday["cardio_kcal"]) == (11, 2000, 300)
+    assert (monday["meals"], monday["calories"], monday["protein"]) == (1, 600, 40)
+    assert days["2026-03-03"] == period_review._empty_day()
+    # Rows outside the range are ignored
+    assert days["2026-03-04"]["workouts"] == [] and days["2026-03-04"]["meals"] == 1
+
+
+def test_cached_review_is_reused_only_while_current():
+    workout = _workout(START)
+    marker = ReviewService._marker([workout])
+    data = {
+        "workouts": [workout],
+        "meals": [_meal(START)],
+        "reviews": [
+            {"date": START.isoformat(), "section": "activity", "review": "Strong   push\nsession.", "source_marker": marker},
+            # Written before the last meal was logged
+            {"date": START.isoformat(), "section": "diet", "review": "Low protein.", "source_marker": "0:old"},
+        ],
+    }
+    notes = summarize_days(data, START, START)[START.isoformat()]["notes"]
+    assert notes == {"activity": "Strong push session."}
+
+    lines = encode_period(summarize_days(data, START, START), 1)
+    assert lines == ["Mon 03-02: Push (10 sets, 2000kg) | 600kcal P40 C60 F20 (1 meals)", "  coach: Strong push session."]
+
+
+def test_encode_period_groups_days():
+    data = _year()
+    end = START + timedelta(days=13)
+    days = summarize_days(data, START, end)
+
+    daily = encode_period(days, 1)
+    assert len(daily) == 14
+    assert daily[1] == "Tue 03-03: rest | 1800kcal P120 C180 F60 (3 meals)"
+
+    weekly = encode_period(days, 7)
+    assert weekly == [
+        "03-02..03-08: 3 training days (30 sets, 6000kg) | avg 1800kcal P120 C180 F60 on 7 logged days",
+        "03-09..03-15: 3 training days (30 sets, 6000kg) | avg 1800kcal P120 C180 F60 on 7 logged days",
+    ]
+
+
+def test_a_year_stays_within_the_line_budget():
+    end = START + timedelta(days=364)
+    per_line = bucket_days(365)
+    lines = encode_period(summarize_days(_year(), START, end), per_line)
+    assert len(lines) <= PERIOD_REVIEW_MAX_LINES
+    assert len(lines) == 13
+
+
+@pytest.mark.parametrize("day, expected", [
+    (date(2026, 3, 4), (date(2026, 3, 2), date(2026, 3, 8))),
+    (date(2026, 3, 2), (date(2026, 3, 2), date(2026, 3, 8))),
+    (date(2026, 3, 8), (date(2026, 3, 2), date(2026, 3, 8))),
+    (date(2025, 12, 31), (date(2025, 12, 29), date(2026, 1, 4))),
+])
+def test_week_runs_monday_to_sunday(day, expected):
+    assert _period_range("week", day, None, None) == expected
+
+
+@pytest.mark.parametrize("day, expected", [
+    (date(2026, 2, 14), (date(2026, 2, 1), date(2026, 2, 28))),
+    (date(2028, 2, 29), (date(2028, 2, 1), date(2028, 2, 29))),
+    (date(2026, 1, 31), (date(2026, 1, 1), date(2026, 1, 31))),
+    (date(2026, 12, 1), (date(2026, 12, 1), date(2026, 12, 31))),
+])
+def test_month_is_the_calendar_month(day, expected):
+    assert _period_range("month", day, None, None) == expected
+
+
+def test_custom_range_overrides_the_period():
+    start, end = date(2026, 1, 10), date(2026, 2, 20)
+    assert _period_range("week", date(2026, 6, 1), start, end) == (start, end)
+    assert _period_range("month", None, start, start) == (start, start)
+    longest = start + timedelta(days=REVIEW_PERIOD_MAX_DAYS - 1)
+    assert _period_range("week", None, start, longest) == (start, longest)
+
+
+@pytest.mark.parametrize("start, end, detail", [
+    (date(2026, 1, 10), None, "Pass both 'from' and 'to'"),
+    (None, date(2026, 1, 10), "Pass both 'from' and 'to'"),
+    (date(2026, 1, 10), date(2026, 1, 9), "'from' must not be after 'to'"),
+    (date(2026, 1, 10), date(2026, 1, 10) + timedelta(days=REVIEW_PERIOD_MAX_DAYS),
+     f"Date range is limited to {REVIEW_PERIOD_MAX_DAYS} days"),
+])
+def test_invalid_custom_range(start, end, detail):
+    with pytest.raises(HTTPException) as e:
+        _period_range("week", None, start, end)
+    assert e.value.status_code == 400
+    assert e.value.detail == detail
+
+
+def test_invalid_range_is_rejected_before_any_read(client, db):
+    response = client.post("/agents/review/period?from=2026-01-10&to=2026-01-09")
+    assert response.status_code == 400
+    assert db.calls == []
@@ -0,0 +1,300 @@
+"""
+DB_BACKEND=postgres against a real Postgres: the json_agg queries in app/db/postgres.py
+must give the same API responses as the Supabase path, which is fed the same rows as
+PostgREST returns them (to_json of each row).
+
+Skipped unless TEST_DATABASE_URL points at a Postgres this test may CREATE DATABASE on.
+"""
+import os
+import json
+import uuid
+import asyncio
+from datetime import date, datetime, timedelta
+from urllib.parse import urlencode
+import pytest
+
+from app.db import postgres
+from tests.conftest import USER_ID, OTHER_USER_ID
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set")
+
+DAY = date.today() - timedelta(days=1)
+
+# Two users, so every query has rows it must leave out
+SEED_SQL = f"""
+insert into auth.users (id, email) values ('{USER_ID}', 'a@test.local'), ('{OTHER_USER_ID}', 'b@test.local');
+
+insert into public.exercises (id, name, muscle_group) values
+  ('00000000-0000-0000-0000-0000000000e1', 'Bench Press', 'Chest'),
+  ('00000000-0000-0000-0000-0000000000e2', 'Treadmill', 'Cardio'),
+  ('00000000-0000-0000-0000-0000000000e3', 'Squat', 'Legs');
+
+insert into public.workouts (id, user_id, name, date, duration_minutes, notes) values
+  ('00000000-0000-0000-0000-00000000a001', '{USER_ID}', 'Push', '{DAY} 18:30:00+00', 55, 'felt strong'),
+  ('00000000-0000-0000-0000-00000000a002', '{USER_ID}', 'Empty', '{DAY - timedelta(days=3)} 07:00:00+00', 5, null),
+  ('00000000-0000-0000-0000-00000000a003', '{USER_ID}', 'Old push', '{DAY - timedelta(days=7)} 18:00:00+00', 50, null),
+  ('00000000-0000-0000-0000-00000000b001', '{OTHER_USER_ID}', 'Other', '{DAY} 10:00:00+00', 30, null);
+
+insert into public.workout_exercises (id, workout_id, exercise_id, order_index) values
+  ('00000000-0000-0000-0000-00000000c001', '00000000-0000-0000-0000-00000000a001', '00000000-0000-0000-0000-0000000000e1', 0),
+  ('00000000-0000-0000-0000-00000000c002', '00000000-0000-0000-0000-00000000a001', '00000000-0000-0000-0000-0000000000e2', 1),
+  ('00000000-0000-0000-0000-00000000c003', '00000000-0000-0000-0000-00000000a003', '00000000-0000-0000-0000-0000000000e1', 0),
+  ('00000000-0000-0000-0000-00000000c004', '00000000-0000-0000-0000-00000000b001', '00000000-0000-0000-0000-0000000000e3', 0);
+
+insert into public.sets (workout_exercise_id, reps, weight, speed, incline, time_seconds, calories_burnt, steps, completed, set_order, created_at) values
+  ('00000000-0000-0000-0000-00000000c001', 5, 100, null, null, null, 0, 0, true, 0, '{DAY} 18:31:00+00'),
+  ('00000000-0000-0000-0000-00000000c001', 5, 102.5, null, null, null, 0, 0, true, 1, '{DAY} 18:35:00+00'),
+  ('00000000-0000-0000-0000-00000000c002', 0, 0, 10.5, 2, 1200, 250.5, 3000, true, 0, '{DAY} 18:50:00+00'),
+  ('00000000-0000-0000-0000-00000000c003', 8, 90, null, null, null, 0, 0, true, 0, '{DAY - timedelta(days=7)} 18:05:00+00'),
+  ('00000000-0000-0000-0000-00000000c004', 5, 140, null, null, null, 0, 0, true, 0, '{DAY} 10:05:00+00');
+
+insert into public.meals (id, user_id, name, date, type, total_calories, total_protein, total_carbs, total_fats, created_at) values
+  ('00000000-0000-0000-0000-00000000d001', '{USER_ID}', 'Breakfast', '{DAY}', 'Breakfast', 420, 30.5, 40, 12.25, '{DAY} 08:00:00+00'),
+  ('00000000-0000-0000-0000-00000000d002', '{USER_ID}', 'Dinner', '{DAY}', 'Dinner', 700, 45, 60, 20, '{DAY} 19:00:00+00'),
+  ('00000000-0000-0000-0000-00000000d003', '{USER_ID}', 'Lunch', '{DAY - timedelta(days=2)}', 'Lunch', 550, 35, 50, 18, '{DAY - timedelta(days=2)} 12:00:00+00'),
+  ('00000000-0000-0000-0000-00000000d004', '{OTHER_USER_ID}', 'Lunch', '{DAY}', 'Lunch', 900, 50, 90, 30, '{DAY} 12:00:00+00');
+
+insert into public.food_items (meal_id, name, calories, protein, carbs, fats, quantity, created_at) values
+  ('00000000-0000-0000-0000-00000000d001', 'Eggs', 140, 12, 1, 10, 2, '{DAY} 08:00:01+00'),
+  ('00000000-0000-0000-0000-00000000d001', 'Oats', 280, 18.5, 39, 2.25, 1, '{DAY} 08:00:02+00'),
+  ('00000000-0000-0000-0000-00000000d002', 'Salmon and rice', 700, 45, 60, 20, 1.5, '{DAY} 19:00:01+00'),
+  ('00000000-0000-0000-0000-00000000d004', 'Burger', 900, 50, 90, 30, 1, '{DAY} 12:00:01+00');
+"""
+
+# What the Supabase path reads, dumped the way PostgREST serializes rows
+TABLES = {
+    "exercises": "name",
+    "workouts": "date desc",
+    "workout_exercises": "order_index",
+    "sets": "set_order",
+    "meals": "created_at",
+    "food_items": "created_at",
+}
+
+
+def _database_url(database: str) -> str:
+    from benchmarks.query_plans import _with_database
+    return _with_database(TEST_DATABASE_URL, database)
+
+
+async def _create(database: str) -> dict:
+    import asyncpg
+    from benchmarks.query_plans import AUTH_BOOTSTRAP, SCHEMA_FILES, INDEX_FILES, _apply
+
+    admin = await asyncpg.connect(TEST_DATABASE_URL)
+    try:
+        await admin.execute(f'create database "{database}"')
+    finally:
+        await admin.close()
+
+    conn = await asyncpg.connect(_database_url(database))
+    try:
+        await conn.execute(AUTH_BOOTSTRAP)
+        for filename in SCHEMA_FILES + INDEX_FILES:
+            await _apply(conn, filename)
+        await conn.execute(SEED_SQL)
+        return {
+            table: json.loads(await conn.fetchval(
+                f"select coalesce(json_agg(to_json(t) order by {order}), '[]') from public.{table} t"
+            ))
+            for table, order in TABLES.items()
+        }
+    finally:
+        await conn.close()
+
+
+async def _drop(database: str):
+    import asyncpg
+
+    admin = await asyncpg.connect(TEST_DATABASE_URL)
+    try:
+        await admin.execute(f'drop database if exists "{database}" with (force)')
+    finally:
+        await admin.close()
+
+
+@pytest.fixture(scope="module")
+def pg_database():
+    """A scratch database with the migrations and seed applied; yields (url, PostgREST rows per table)."""
+    pytest.importorskip("asyncpg")
+    database = f"cutroute_test_{uuid.uuid4().hex[:8]}"
+    try:
+        tables = asyncio.run(_create(database))
+        yield _database_url(database), tables
+    finally:
+        asyncio.run(_drop(database))
+
+
+@pytest.fixture
+def backends(pg_database, db, client, monkeypatch):
+    """Fetches a URL through both read paths: returns (supabase response, postgres response)."""
+    url, tables = pg_database
+    db.tables.update(tables)
+    monkeypatch.setattr(postgres, "DATABASE_URL", url)
+
+    def get(path):
+        monkeypatch.setattr(postgres, "DB_BACKEND", "supabase")
+        expected = client.get(path)
+        monkeypatch.setattr(postgres, "DB_BACKEND", "postgres")
+        actual = client.get(path)
+        return expected, actual
+
+    return get
+
+
+@pytest.mark.parametrize("path", [
+    "/workouts/",
+    "/workouts/?view=compact",
+    "/workouts/00000000-0000-0000-0000-00000000a001",
+    "/workouts/00000000-0000-0000-0000-00000000a002",
+    f"/meals/?date={DAY}",
+    f"/meals/?{urlencode({'from': DAY - timedelta(days=6), 'to': DAY})}",
+    f"/meals/?{urlencode({'from': DAY - timedelta(days=6), 'to': DAY, 'items': 'false'})}",
+])
+def test_postgres_reads_match_supabase_path(backends, path):
+    expected, actual = backends(path)
+    assert expected.status_code == actual.status_code == 200
+    assert actual.json() == expected.json()
+    assert actual.json()
+
+
+def test_last_performance_uses_latest_workout_with_the_exercise(backends):
+    # The fake client does not apply PostgREST's !inner embed filters, so this checks
+    # the postgres response against the seed directly
+    _, actual = backends("/workouts/last-performance?exercise_names=Bench%20Press&exercise_names=Treadmill&exercise_names=Squat")
+    assert actual.status_code == 200
+    bench, treadmill, squat = actual.json()
+
+    assert bench["exerciseName"] == "Bench Press"
+    assert bench["lastWeight"] == 102.5
+    assert bench["lastReps"] == 5
+    assert bench["lastDate"].startswith(str(DAY))
+
+    assert treadmill["lastSpeed"] == 10.5
+    assert treadmill["lastCaloriesBurnt"] == 250.5
+    assert treadmill["lastSteps"] == 3000
+
+    # Only the other user has done squats
+    assert squat["lastDate"] is None
+    assert squat["lastWeight"] == 0
+
+
+def test_sync_changes_since_a_cursor():
+    """get_sync_changes (migrations/sync.sql): a child write re-sends its parent, a delete leaves a tombstone."""
+    asyncpg = pytest.importorskip("asyncpg")
+
+    async def run():
+        database = f"cutroute_test_{uuid.uuid4().hex[:8]}"
+        try:
+            await _create(database)
+            conn = await asyncpg.connect(_database_url(database))
+            try:
+                since = await conn.fetchval("select clock_timestamp()")
+                await conn.execute("""
+                    insert into public.sets (workout_exercise_id, reps, weight, completed, set_order)
+                    values ('00000000-0000-0000-0000-00000000c001', 5, 105, true, 2);
+                    delete from public.meals where id = '00000000-0000-0000-0000-00000000d003';
+                    update public.meals set name = 'Late lunch' where id = '00000000-0000-0000-0000-00000000d004';
+                """)
+                delta = json.loads(await conn.fetchval("select public.get_sync_changes($1, $2)", uuid.UUID(USER_ID), since))
+                full = json.loads(await conn.fetchval("select public.get_sync_changes($1, null)", uuid.UUID(USER_ID)))
+                versions = json.loads(await conn.fetchval("select public.get_resource_versions($1)", uuid.UUID(USER_ID)))
+                return since, delta, full, versions
+            finally:
+                await conn.close()
+        finally:
+            await _drop(database)
+
+    since, delta, full, versions = asyncio.run(run())
+
+    [workout] = delta["workouts"]
+    assert workout["id"] == "00000000-0000-0000-0000-00000000a001"
+    assert [s["weight"] for s in workout["exercises"][0]["sets"]] == [100, 102.5, 105]
+    # The other user's edit is not in this user's delta
+    assert delta["meals"] == []
+    assert [(d["resource"], d["id"]) for d in delta["deleted"]] == [("meals", "00000000-0000-0000-0000-00000000d003")]
+
+    # A full sync has every live row and no tombstones
+    assert {w["id"] for w in full["workouts"]} == {
+        "00000000-0000-0000-0000-00000000a001", "00000000-0000-0000-0000-00000000a002", "00000000-0000-0000-0000-00000000a003",
+    }
+    assert {m["id"] for m in full["meals"]} == {"00000000-0000-0000-0000-00000000d001", "00000000-0000-0000-0000-00000000d002"}
+    assert full["deleted"] == []
+
+    # ETag versions (app/core/etag.py) move with the new set and the deleted meal's tombstone
+    assert datetime.fromisoformat(versions["workouts"]) > since
+    assert datetime.fromisoformat(versions["meals"]) > since
+    assert versions["templates"] is versions["goals"] is None
+
+
+def test_finished_session_rejects_new_sets():
+    """reject_finished_session_writes (migrations/workout_sessions.sql) guards workouts finished through another worker."""
+    asyncpg = pytest.importorskip("asyncpg")
+
+    async def run():
+        database = f"cutroute_test_{uuid.uuid4().hex[:8]}"
+        try:
+            await _create(database)
+            conn = await asyncpg.connect(_database_url(database))
+            try:
+                insert_set = """
+                    insert into public.sets (workout_exercise_id, reps, weight, completed, set_order)
+                    values ('00000000-0000-0000-0000-00000000c001', 5, 105, true, 9)
+                """
+                # Saved by POST /workouts/ (never a session): still writable
+                await conn.execute(insert_set)
+
+                await conn.execute("""
+                    update public.workouts set in_progress = false, finished_at = now()
+                    where id = '00000000-0000-0000-0000-00000000a001'
+                """)
+                with pytest.raises(asyncpg.ObjectNotInPrerequisiteStateError):
+                    await conn.execute(insert_set)
+                with pytest.raises(asyncpg.ObjectNotInPrerequisiteStateError):
+                    await conn.execute("update public.sets set reps = 1 where workout_exercise_id = '00000000-0000-0000-0000-00000000c001'")
+                with pytest.raises(asyncpg.ObjectNotInPrerequisiteStateError):
+                    await conn.execute("""
+                        insert into public.workout_exercises (workout_id, exercise_id, order_index)
+                        values ('00000000-0000-0000-0000-00000000a001', '00000000-0000-0000-0000-0000000000e3', 2)
+                    """)
+                # Deleting a finished workout still cascades to its sets
+                await conn.execute("delete from public.workouts where id = '00000000-0000-0000-0000-00000000a001'")
+                return await conn.fetchval("select count(*) from public.sets")
+            finally:
+                await conn.close()
+        finally:
+            await _drop(database)
+
+    # c003 (a003) and c004 (b001) keep theirs
+    assert asyncio.run(run()) == 2
+
+
+def test_food_search_limits_each_pattern():
+    """search_food_items (migrations/food_lookup.sql): a frequent food does not crowd out the others."""
+    asyncpg = pytest.importorskip("asyncpg")
+
+    async def run():
+        database = f"cutroute_test_{uuid.uuid4().hex[:8]}"
+        try:
+            await _create(database)
+            conn = await asyncpg.connect(_database_url(database))
+            try:
+                await conn.execute("""
+                    insert into public.food_items (meal_id, name, calories, protein, carbs, fats, created_at)
+                    select '00000000-0000-0000-0000-00000000d002', 'Scrambled egg', 150, 12, 1, 11, now() + i * interval '1 second'
+                    from generate_series(1, 30) i
+                """)
+                rows = await conn.fetch("select * from public.search_food_items($1, 5)", ["egg", "oat", "kale"])
+                return [(r["pattern"], r["name"]) for r in rows]
+            finally:
+                await conn.close()
+        finally:
+            await _drop(database)
+
+    rows = asyncio.run(run())
+    # Exact names first ("Eggs" is not exact for "egg"), then newest; kale has no rows
+    assert [p for p, _ in rows] == ["egg"] * 5 + ["oat"]
+    assert {n for _, n in rows[:5]} == {"Scrambled egg"}
+    assert rows[5] == ("oat", "Oats")
@@ -0,0 +1,100 @@
+from datetime import date, datetime, timedelta
+import pytest
+
+from app.core.metabolism import KCAL_PER_KG, compute_energy_plan
+from app.core.progress import project_progress
+from app.schemas.goal import GoalCreate
+from app.routers import goals
+from tests.conftest import USER_ID
+
+START = date(2026, 1, 1)
+END = date(2026, 1, 10)
+GOAL = GoalCreate(current_height=180, current_weight=85, age=30, gender="Male", lifestyle="Active",
+                  goal_weight=84, target_date=datetime(2026, 3, 1))
+TDEE = compute_energy_plan(GOAL, today=END)["tdee"]
+
+
+def _day(offset: int, calories_in: float, calories_burnt: float = 0) -> dict:
+    return {"day": (START + timedelta(days=offset)).isoformat(), "calories_in": calories_in, "calories_burnt": calories_burnt}
+
+
+def test_unlogged_days_are_missing_not_zero_intake():
+    rows = [_day(0, TDEE - 500), _day(2, TDEE - 300, calories_burnt=200), _day(5, 0, calories_burnt=300)]
+    result = project_progress(GOAL, rows, START, END)
+
+    assert result["logged_days"] == 2
+    assert result["total_balance"] == -1000
+    assert result["estimated_weight"] == round(85 - 1000 / KCAL_PER_KG, 2)
+    # Burn without a logged meal is shown, but has no balance
+    assert [(d["date"], d["balance"]) for d in result["series"]] == [
+        ("2026-01-01", -500), ("2026-01-03", -500), ("2026-01-06", None),
+    ]
+
+
+def test_projected_date_from_the_recent_balance():
+    # -385 kcal/day is -0.05 kg/day: 0.5 kg lost in 10 days, 0.5 kg (10 more days) to go
+    rows = [_day(i, TDEE - 385) for i in range(10)]
+    result = project_progress(GOAL, rows, START, END)
+    assert result["estimated_weight"] == 84.5
+    assert result["remaining_kg"] == -0.5
+    assert result["avg_daily_balance"] == -385
+    assert result["projected_date"] == (END + timedelta(days=10)).isoformat()
+    assert result["on_track"] is True
+    assert result["projected_weight_at_target"] == round(84.5 - 0.05 * (date(2026, 3, 1) - END).days, 2)
+
+
+def test_goal_already_reached():
+    rows = [_day(i, TDEE - 770) for i in range(10)]
+    result = project_progress(GOAL, rows, START, END)
+    assert result["estimated_weight"] == 84
+    assert result["projected_date"] == END.isoformat()
+    assert result["on_track"] is True
+
+
+def test_never_reached_while_gaining():
+    rows = [_day(i, TDEE + 300) for i in range(10)]
+    result = project_progress(GOAL, rows, START, END)
+    assert result["avg_daily_balance"] == 300
+    assert result["projected_date"] is None
+    assert result["on_track"] is False
+
+
+def test_nothing_logged_assumes_the_plan():
+    result = project_progress(GOAL, [], START, END)
+    assert result["logged_days"] == 0
+    assert result["avg_daily_balance"] == -compute_energy_plan(GOAL, today=END)["daily_caloric_deficit"]
+    assert result["series"] == []
+
+
+@pytest.fixture
+def goal(db):
+    db.add("goals", user_id=USER_ID, created_at="2020-01-01T00:00:00+00:00",
+           **GOAL.model_dump(mode="json", exclude_none=True))
+    calls = []
+
+    def get_daily_energy(params):
+        calls.append((params["p_from"], params["p_to"]))
+        return [{"day": params["p_to"], "calories_in": TDEE - 500, "calories_burnt": 0}]
+
+    db.functions["get_daily_energy"] = get_daily_energy
+    return calls
+
+
+def test_progress_range_is_capped(client, goal, monkeypatch):
+    monkeypatch.setattr(goals, "PROGRESS_MAX_RANGE_DAYS", 30)
+
+    response = client.get("/goals/progress", params={"from": "2026-01-01", "to": "2026-01-31"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Date range is limited to 30 days"
+    assert client.get("/goals/progress", params={"from": "2026-01-02", "to": "2026-01-31"}).status_code == 200
+
+    # Without `from`, a goal set years ago is read back to the cap only
+    response = client.get("/goals/progress", params={"to": "2026-01-31"})
+    assert response.status_code == 200
+    assert response.json()["start"] == "2026-01-02"
+    assert goal[-1] == ("2026-01-02", "2026-01-31")
+
+
+def test_progress_range_order(client, goal):
+    response = client.get("/goals/progress", params={"from": "2026-02-01", "to": "2026-01-31"})
+    assert response.status_code == 400
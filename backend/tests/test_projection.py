@@ -0,0 +1,46 @@
+import pytest
+from tests.conftest import USER_ID
+
+
+@pytest.fixture
+def workout(db):
+    bench = db.add("exercises", name="Bench Press", muscle_group="Chest")
+    workout = db.add("workouts", user_id=USER_ID, name="Push", date="2026-03-02T08:00:00", duration_minutes=45,
+                     notes="felt strong", exercise_count=1, set_count=2, total_volume=1000, cardio_calories=0)
+    we = db.add("workout_exercises", workout_id=workout["id"], exercise_id=bench["id"], order_index=0)
+    for i in range(2):
+        db.add("sets", workout_exercise_id=we["id"], reps=5, weight=100, set_order=i)
+    return workout
+
+
+def test_fields_returns_only_the_requested_columns(client, workout):
+    response = client.get("/workouts/?fields=name,date")
+    assert response.status_code == 200
+    assert response.json() == [{"id": workout["id"], "name": "Push", "date": "2026-03-02T08:00:00"}]
+
+
+def test_summary_view_counts_sets(client, workout):
+    [row] = client.get("/workouts/?view=summary").json()
+    assert row["exercises"][0]["setCount"] == 2
+    assert "sets" not in row["exercises"][0]
+
+
+def test_unknown_field_is_rejected(client, workout):
+    assert client.get("/workouts/?fields=name,password").status_code == 400
+
+
+@pytest.mark.parametrize("url", [
+    "/workouts/?fields=id,name",
+    "/workouts/?view=summary",
+    "/workouts/?view=compact",
+    "/templates/?view=summary",
+    "/templates/?fields=name",
+])
+def test_projected_responses_keep_conditional_headers(client, workout, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.headers["etag"]
+    assert response.headers["cache-control"] == "private, no-cache"
+
+    again = client.get(url, headers={"If-None-Match": response.headers["etag"]})
+    assert again.status_code == 304
@@ -0,0 +1,75 @@
+import logging
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.db import query_log
+from app.db.client import get_supabase
+from app.db.query_log import NPlusOneError, QueryLogMiddleware, track_queries
+
+
+def test_loop_over_one_query_shape_is_flagged(db, caplog):
+    supabase = get_supabase()
+    with caplog.at_level(logging.WARNING, logger=query_log.__name__):
+        with track_queries("loop") as log:
+            for name in ("Squat", "Bench Press", "Deadlift"):
+                supabase.table("exercises").select("id").eq("name", name).execute()
+
+    assert log.problems() == ["GET exercises by (name) repeated 3x"]
+    assert "[loop] possible N+1: GET exercises by (name) repeated 3x" in caplog.text
+
+
+def test_strict_mode_raises(db):
+    supabase = get_supabase()
+    with pytest.raises(NPlusOneError, match="repeated 3x"):
+        with track_queries("loop", strict=True):
+            for name in ("Squat", "Bench Press", "Deadlift"):
+                supabase.table("exercises").select("id").eq("name", name).execute()
+
+
+def test_distinct_queries_are_not_flagged(db):
+    supabase = get_supabase()
+    with track_queries("distinct", strict=True) as log:
+        supabase.table("exercises").select("id").eq("name", "Squat").execute()
+        supabase.table("exercises").select("id").eq("id", "1").execute()
+        supabase.table("exercises").select("id, name").eq("name", "Squat").execute()
+        supabase.table("meals").select("id").eq("name", "Squat").execute()
+        supabase.table("exercises").insert({"name": "Squat"}).execute()
+
+    assert len(log.records) == 5
+    assert log.problems() == []
+
+
+def test_query_count_threshold(db):
+    supabase = get_supabase()
+    with pytest.raises(NPlusOneError, match="4 queries \\(threshold 3\\)"):
+        with track_queries("many", strict=True, max_queries=3):
+            for table in ("exercises", "meals", "workouts", "goals"):
+                supabase.table(table).select("id").execute()
+
+
+def test_middleware_tracks_each_request(caplog):
+    logs = []
+    app = FastAPI()
+    app.add_middleware(QueryLogMiddleware)
+
+    @app.get("/loop")
+    def loop(n: int):
+        logs.append(query_log._current_log.get())
+        for i in range(n):
+            query_log.record_query("sets", "GET", httpx.QueryParams({"select": "*", "workout_exercise_id": f"eq.{i}"}), 0.001)
+
+    client = TestClient(app)
+    with caplog.at_level(logging.WARNING, logger=query_log.__name__):
+        client.get("/loop", params={"n": 1})
+        assert not caplog.records
+        client.get("/loop", params={"n": 3})
+
+    # One log per request, labelled with it, and none left behind
+    first, second = logs
+    assert first is not second
+    assert (first.label, len(first.records)) == ("GET /loop", 1)
+    assert len(second.records) == 3
+    assert "[GET /loop] possible N+1: GET sets by (workout_exercise_id) repeated 3x" in caplog.text
+    assert query_log._current_log.get() is None
@@ -0,0 +1,55 @@
+import asyncio
+import pytest
+
+from app import review_scheduler
+from app.agents import daily_review
+from app.core.cost import cost_controller
+from app.services.review_service import ReviewService
+
+
+@pytest.fixture
+def batch(db, monkeypatch):
+    """Six stale reviews, a fresh budget of 3 requests and stubbed reviewers that count their runs."""
+    stale = [(f"user-{i}", "activity", f"2026-01-31T0{i}:00:00+00:00") for i in range(6)]
+    runs = []
+
+    async def find_stale(day):
+        return list(stale)
+
+    async def reviewer(user_id, date):
+        runs.append(user_id)
+        await asyncio.sleep(0.01)
+        return f"Review for {user_id}"
+
+    monkeypatch.setattr(review_scheduler, "load_agents", lambda: None)
+    monkeypatch.setattr(ReviewService, "find_stale", staticmethod(find_stale))
+    monkeypatch.setattr(daily_review, "_REVIEWERS", {"activity": reviewer})
+    monkeypatch.setattr(cost_controller, "DAILY_REQUEST_LIMIT", 3)
+    monkeypatch.setattr(cost_controller, "dev_mode", False)
+    monkeypatch.setattr(cost_controller, "_request_count", 0)
+    monkeypatch.setattr(cost_controller, "_token_usage", 0)
+    return runs
+
+
+async def test_concurrent_runs_stay_within_the_budget(db, batch):
+    stats = await review_scheduler.run_batch("2026-01-31", concurrency=6)
+    assert stats == {"pending": 6, "generated": 3, "failed": 0, "skipped": 3}
+    assert len(batch) == 3
+    assert cost_controller.get_status()["requests"] == 3
+    assert len(db.rows("daily_reviews")) == 3
+
+
+async def test_error_text_counts_as_a_failure(db, batch, monkeypatch):
+    async def reviewer(user_id, date):
+        batch.append(user_id)
+        if user_id == "user-0":
+            raise RuntimeError("timeout")
+        return "Error running agent: 429 RESOURCE_EXHAUSTED" if user_id in ("user-1", "user-2") else "Solid session."
+
+    monkeypatch.setattr(daily_review, "_REVIEWERS", {"activity": reviewer})
+    stats = await review_scheduler.run_batch("2026-01-31", concurrency=1)
+
+    # Failures give their reservation back, so the budget still covers three good reviews
+    assert stats == {"pending": 6, "generated": 3, "failed": 3, "skipped": 0}
+    assert cost_controller.get_status()["requests"] == 3
+    assert {r["review"] for r in db.rows("daily_reviews")} == {"Solid session."}
@@ -0,0 +1,66 @@
+import pytest
+from app.db import client as db_client
+from app.agents import daily_review
+from app.services.review_service import ReviewService
+from tests.conftest import USER_ID
+
+DAY = "2026-03-02"
+
+
+@pytest.fixture
+def reviewers(monkeypatch):
+    calls = []
+
+    def reviewer(section):
+        async def review(user_id, date):
+            calls.append(section)
+            return f"{section} review #{len(calls)}"
+        return review
+
+    monkeypatch.setattr(daily_review, "_REVIEWERS", {s: reviewer(s) for s in ("activity", "diet")})
+    return calls
+
+
+def test_marker_follows_updated_at():
+    rows = [{"created_at": "2026-03-02T08:00:00+00:00", "updated_at": "2026-03-02T08:00:00+00:00"}]
+    before = ReviewService._marker(rows)
+    rows[0]["updated_at"] = "2026-03-02T08:20:00+00:00"
+    assert ReviewService._marker(rows) != before
+    # Rows read before migrations/sync.sql fall back to created_at
+    assert ReviewService._marker([{"created_at": "2026-03-02T08:00:00+00:00"}]) == "1:2026-03-02T08:00:00+00:00"
+    assert ReviewService._marker([]) is None
+
+
+async def test_review_is_cached_until_the_workout_changes(db, reviewers):
+    workout = db.add("workouts", user_id=USER_ID, name="Push", date=f"{DAY}T08:00:00",
+                     updated_at="2026-03-02T08:00:00+00:00")
+
+    first = await daily_review.get_day_review(USER_ID, DAY, ["activity"])
+    again = await daily_review.get_day_review(USER_ID, DAY, ["activity"])
+    assert again == first
+    assert reviewers == ["activity"]
+
+    # A set appended mid-session: the sets trigger touches workouts.updated_at
+    workout["updated_at"] = "2026-03-02T08:25:00+00:00"
+    fresh = await daily_review.get_day_review(USER_ID, DAY, ["activity"])
+    assert fresh != first
+    assert reviewers == ["activity", "activity"]
+
+
+async def test_find_stale_reads_past_max_rows(db, monkeypatch):
+    # PostgREST returns at most max-rows per request; a single select would miss users
+    db.max_rows = 3
+    monkeypatch.setattr(db_client, "PAGE_SIZE", 3)
+    users = [f"00000000-0000-0000-0000-{i:012d}" for i in range(7)]
+    for user_id in users:
+        db.add("workouts", user_id=user_id, name="Push", date=f"{DAY}T08:00:00")
+        db.add("meals", user_id=user_id, name="Oats", date=DAY)
+    for user_id in users[:4]:
+        marker = ReviewService._marker([r for r in db.rows("meals") if r["user_id"] == user_id])
+        db.add("daily_reviews", user_id=user_id, date=DAY, section="diet", review="Fine.", source_marker=marker)
+
+    stale = await ReviewService.find_stale(DAY)
+    assert sorted(u for u, section, _ in stale if section == "activity") == users
+    assert sorted(u for u, section, _ in stale if section == "diet") == users[4:]
+    # Three pages of workouts and meals (3 + 3 + 1), two of reviews (3 + 1)
+    assert (db.count("workouts"), db.count("meals"), db.count("daily_reviews")) == (3, 3, 2)
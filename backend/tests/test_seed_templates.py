@@ -0,0 +1,45 @@
+from app import seed_templates
+from tests.conftest import USER_ID, OTHER_USER_ID
+
+TEMPLATE_EXERCISES = sum(len(t["exercises"]) for t in seed_templates.TEMPLATES)
+
+
+def _template_exercises(db, user_id):
+    templates = {t["id"]: t["name"] for t in db.rows("workout_templates") if t["user_id"] == user_id}
+    return sorted(
+        (templates[r["template_id"]], r["order_index"], tuple(sorted((k, v) for k, v in r.items() if k.startswith("default_") or k == "exercise_id")))
+        for r in db.rows("workout_template_exercises")
+        if r["template_id"] in templates
+    )
+
+
+async def test_bulk_seed_matches_single_user_seed(db):
+    await seed_templates.seed_user_templates(USER_ID)
+    stats = await seed_templates.seed_many([OTHER_USER_ID])
+
+    assert stats["users"] == 1
+    assert stats["exercises"] == TEMPLATE_EXERCISES
+    assert _template_exercises(db, OTHER_USER_ID) == _template_exercises(db, USER_ID)
+    cardio = next(r for r in db.rows("workout_template_exercises") if r.get("default_time_seconds") == 600)
+    assert cardio["default_reps"] == 10 and cardio["default_calories_burnt"] == 60.0
+
+
+async def test_bulk_seed_batches_inserts_and_skips_seeded_users(db):
+    users = [f"00000000-0000-0000-0000-{i:012d}" for i in range(1, 26)]
+    stats = await seed_templates.seed_many(users[:20], concurrency=2, chunk_size=10)
+    assert stats["users"] == 20
+    assert len(db.rows("workout_templates")) == 20 * len(seed_templates.TEMPLATES)
+    # Catalog once, then 1 template insert and 1 exercise insert per chunk
+    assert db.count("exercises") == 1
+    assert db.count("workout_templates", "insert") == 2
+    assert db.count("workout_template_exercises", "insert") == 2
+
+    stats = await seed_templates.seed_many(users, chunk_size=10)
+    assert (stats["users"], stats["skipped"]) == (5, 20)
+
+
+async def test_failed_chunk_leaves_no_empty_templates(db):
+    db.fail_on.add(("workout_template_exercises", "insert"))
+    stats = await seed_templates.seed_many([USER_ID])
+    assert stats["failed"] == 1
+    assert db.rows("workout_templates") == []
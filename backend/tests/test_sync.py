@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+
+from app.services.sync_service import SyncService
+from tests.conftest import USER_ID
+
+
+@pytest.fixture
+def changes(db):
+    """Stubs get_sync_changes (migrations/sync.sql); the calls' p_since values are recorded."""
+    since = []
+    watermark = (datetime.now(timezone.utc) - timedelta(hours=1)).replace(microsecond=123456)
+
+    def get_sync_changes(params):
+        since.append(params["p_since"])
+        return {
+            "cursor": watermark.isoformat(),
+            "workouts": [],
+            "meals": [],
+            "templates": [{"id": "00000000-0000-0000-0000-0000000000f1", "user_id": USER_ID, "name": "Push", "description": None,
+                           "created_at": watermark.isoformat(), "workout_template_exercises": []}],
+            "goal": None,
+            "deleted": [{"resource": "meals", "id": "00000000-0000-0000-0000-0000000000d1", "deleted_at": watermark.isoformat()}],
+        }
+
+    db.functions["get_sync_changes"] = get_sync_changes
+    return since
+
+
+def test_cursor_round_trips_to_the_microsecond():
+    value = datetime(2026, 1, 31, 12, 0, 0, 123456, tzinfo=timezone.utc)
+    assert SyncService.decode_cursor(SyncService.encode_cursor(value)) == value
+
+
+def test_full_sync_then_delta(client, changes):
+    full = client.get("/sync")
+    assert full.status_code == 200
+    body = full.json()
+    assert body["reset"] is True
+    assert body["templates"][0]["name"] == "Push"
+    assert body["deleted"][0]["resource"] == "meals"
+
+    delta = client.get("/sync", params={"since": body["cursor"]}).json()
+    assert delta["reset"] is False
+    assert changes[0] is None
+    assert SyncService.decode_cursor(body["cursor"]).isoformat() == changes[1]
+
+
+def test_cursor_older_than_the_tombstones_gets_a_full_resync(client, changes):
+    old = SyncService.encode_cursor(datetime.now(timezone.utc) - timedelta(days=365))
+    assert client.get("/sync", params={"since": old}).json()["reset"] is True
+    assert changes == [None]
+
+
+@pytest.mark.parametrize("cursor", ["abc", "9" * 40])
+def test_invalid_cursor_is_400(client, changes, cursor):
+    assert client.get("/sync", params={"since": cursor}).status_code == 400
+    assert changes == []
+
+
+def test_unchanged_account_is_304(client, db, changes):
+    tag = client.get("/sync").headers["etag"]
+    assert client.get("/sync", headers={"If-None-Match": tag}).status_code == 304
+    assert changes == [None]
@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+from app.services.workout_session_service import session_cache
+from tests.conftest import USER_ID, OTHER_USER_ID
+
+
+def _start(client, db):
+    bench = db.add("exercises", name="Bench Press", muscle_group="Chest")
+    template = db.add("workout_templates", user_id=USER_ID, name="Push Day")
+    db.add("workout_template_exercises", template_id=template["id"], exercise_id=bench["id"], order_index=0, default_reps=5)
+    response = client.post("/workouts/start", json={"template_id": template["id"]})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_session_flow_stores_totals_and_updates_template(client, db):
+    workout = _start(client, db)
+    we_id = workout["exercises"][0]["workout_exercise_id"]
+
+    for weight in (100, 102.5):
+        response = client.post(f"/workouts/{workout['id']}/exercises/{we_id}/sets", json={"reps": 5, "weight": weight})
+        assert response.status_code == 200
+
+    finished = client.post(f"/workouts/{workout['id']}/finish", json={"durationMinutes": 40}).json()
+    assert finished["setCount"] == 2
+    assert finished["totalVolume"] == 1012.5
+    assert db.rows("workout_template_exercises")[0]["default_weight"] == 100
+
+    # Finished workouts no longer accept sets
+    response = client.post(f"/workouts/{workout['id']}/exercises/{we_id}/sets", json={"reps": 1, "weight": 1})
+    assert response.status_code == 404
+
+
+def test_exercise_added_through_another_worker_is_found(client, db):
+    workout = _start(client, db)
+    # Inserted behind this process' back, as another uvicorn worker would
+    squat = db.add("exercises", name="Squat", muscle_group="Legs")
+    we = db.add("workout_exercises", workout_id=workout["id"], exercise_id=squat["id"], order_index=1)
+
+    response = client.post(f"/workouts/{workout['id']}/exercises/{we['id']}/sets", json={"reps": 5, "weight": 140})
+    assert response.status_code == 200
+    response = client.patch(f"/workouts/{workout['id']}/exercises/{we['id']}", json={"orderIndex": 3})
+    assert response.status_code == 200
+
+
+def test_other_users_cannot_log_into_the_workout(client, db):
+    workout = _start(client, db)
+    we_id = workout["exercises"][0]["workout_exercise_id"]
+
+    client.as_user(SimpleNamespace(id=OTHER_USER_ID))
+    response = client.post(f"/workouts/{workout['id']}/exercises/{we_id}/sets", json={"reps": 5, "weight": 100})
+    assert response.status_code == 404
+
+
+def test_unknown_exercise_is_404(client, db):
+    workout = _start(client, db)
+    response = client.post(f"/workouts/{workout['id']}/exercises/00000000-0000-0000-0000-000000000001/sets", json={"reps": 5, "weight": 100})
+    assert response.status_code == 404
+
+
+def test_workout_finished_through_another_worker_rejects_sets(client, db):
+    workout = _start(client, db)
+    we_id = workout["exercises"][0]["workout_exercise_id"]
+    sets_url = f"/workouts/{workout['id']}/exercises/{we_id}/sets"
+    logged = client.post(sets_url, json={"reps": 5, "weight": 100}).json()
+    cached = session_cache.get((USER_ID, workout["id"]))
+
+    assert client.post(f"/workouts/{workout['id']}/finish", json={"durationMinutes": 40}).status_code == 200
+
+    for method, url, body in [
+        ("post", sets_url, {"reps": 1, "weight": 1}),
+        ("patch", f"{sets_url}/{logged['id']}", {"reps": 8}),
+        ("patch", f"/workouts/{workout['id']}/exercises/{we_id}", {"orderIndex": 3}),
+    ]:
+        # This worker never saw the finish: its cache still holds the session
+        session_cache.set((USER_ID, workout["id"]), cached)
+        assert client.request(method, url, json=body).status_code == 404
+        assert session_cache.get((USER_ID, workout["id"])) is None
+
+    assert [(s["reps"], s["weight"]) for s in db.rows("sets")] == [(5, 100)]
+    assert db.rows("workout_exercises")[0]["order_index"] == 0
@@ -0,0 +1,39 @@
+from app.services.workout_service import WorkoutService
+
+WORKOUT = {
+    "name": "Hybrid",
+    "date": "2026-03-02T18:00:00",
+    "durationMinutes": 75,
+    "exercises": [
+        {"name": "Bench Press", "muscleGroup": "Chest", "sets": [
+            {"reps": 5, "weight": 100},
+            {"reps": 8, "weight": 80.5},
+        ]},
+        # Timed with no reps: cardio whatever the muscle group
+        {"name": "Plank", "muscleGroup": "Abs", "sets": [{"timeSeconds": 60, "caloriesBurnt": 10}]},
+        # Cardio exercises never add volume, even with reps and weight
+        {"name": "Rowing", "muscleGroup": "Cardio", "sets": [
+            {"timeSeconds": 1200, "speed": 10, "caloriesBurnt": 250.25},
+            {"reps": 10, "weight": 20, "caloriesBurnt": 40.3},
+        ]},
+        {"name": "Stretching", "muscleGroup": "Other", "sets": []},
+    ],
+}
+
+
+def test_mixed_workout_stores_its_totals(client, db):
+    response = client.post("/workouts/", json=WORKOUT)
+    assert response.status_code == 200
+
+    stored = db.rows("workouts")[0]
+    totals = {k: stored[k] for k in ("total_volume", "cardio_calories", "set_count", "exercise_count")}
+    assert totals == {"total_volume": 1144.0, "cardio_calories": 300.55, "set_count": 5, "exercise_count": 4}
+    # Written with the workout row itself, not by a later update
+    assert db.count("workouts", "update") == 0
+
+    body = response.json()
+    assert (body["totalVolume"], body["cardioCalories"], body["setCount"], body["exerciseCount"]) == (1144.0, 300.55, 5, 4)
+
+
+def test_empty_workout_totals():
+    assert WorkoutService._summarize([]) == {"exercise_count": 0, "set_count": 0, "total_volume": 0.0, "cardio_calories": 0.0}